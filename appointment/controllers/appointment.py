@@ -9,6 +9,7 @@ from pytz.exceptions import UnknownTimeZoneError
 from babel.dates import format_datetime, format_date, format_time
 from datetime import datetime, date
 from dateutil.relativedelta import relativedelta
+from functools import partial
 from markupsafe import Markup
 from urllib.parse import quote, unquote_plus
 from werkzeug.exceptions import Forbidden, NotFound
@@ -112,7 +113,8 @@ class AppointmentController(http.Controller):
                 filter_countries=True,
             )
         )
-        appointment_types = appointment_types.sorted('is_published', reverse=True)
+        # staff users are often shared, check their meetings once for all types
+        appointment_types = appointment_types.sorted('is_published', reverse=True)._with_busy_meetings_prefetch()
         return {
             'appointment_types': appointment_types,
             'invite_token': kwargs.get('invite_token'),
@@ -223,7 +225,7 @@ class AppointmentController(http.Controller):
             - slots: the available slots
             - month_first_available: the first month that has available slots or False if there is none
         """
-        slots = appointment_type._get_appointment_slots(
+        slots = appointment_type._get_appointment_slots_cached(
             request.session['timezone'],
             filter_users=filter_records if appointment_type.schedule_based_on == "users" else None,
             filter_resources=filter_records if appointment_type.schedule_based_on == "resources" else None,
@@ -899,6 +901,65 @@ class AppointmentController(http.Controller):
         """
             Route called when the selected user or resource or asked_capacity or the timezone is modified to adapt the possible slots accordingly
         """
+        appointment_type, available_appointments = self._get_available_appointment_type(appointment_type_id, **kwargs)
+        request.session['timezone'] = timezone or appointment_type.appointment_tz
+        filter_users, filter_resources = self._get_slots_filter_records(appointment_type, staff_user_id, resource_selected_id, **kwargs)
+        asked_capacity = int(asked_capacity)
+        slots = appointment_type._get_appointment_slots_cached(request.session['timezone'], filter_users, filter_resources, asked_capacity=asked_capacity)
+        month_first_available = next((month['id'] for month in slots if month['has_availabilities']), False)
+        month_before_update = kwargs.get('month_before_update')
+        month_kept_from_update = next((month['id'] for month in slots if month['month'] == month_before_update), False) if month_before_update else False
+        formated_days = _formated_weekdays(get_lang(request.env).code)
+
+        return request.env['ir.qweb']._render('appointment.appointment_calendar', {
+            'appointment_type': appointment_type,
+            'available_appointments': available_appointments,
+            'asked_capacity': asked_capacity,
+            'timezone': request.session['timezone'],
+            'formated_days': formated_days,
+            'slots': slots,
+            'month_kept_from_update': month_kept_from_update,
+            'month_first_available': month_first_available,
+        })
+
+    @http.route(['/appointment/<int:appointment_type_id>/slots_window'],
+                type="json", auth="public", website=True)
+    def appointment_get_slots_window(self, appointment_type_id, window_date=None, period='month', prefetch=False,
+                                     staff_user_id=None, resource_selected_id=None, asked_capacity=1, timezone=None, **kwargs):
+        """ Available slots of the month or week including window_date, computed
+        on demand as the visitor browses the calendar (see ``_get_appointment_slots_window``).
+
+        :param str window_date: a day of the window, e.g. '2022-02-14'. If not given,
+          the window where slots start to be bookable is returned;
+        :param str period: 'month' or 'week'
+        :param bool prefetch: also compute the next window, returned as 'next_window'
+        """
+        appointment_type, _available_appointments = self._get_available_appointment_type(appointment_type_id, **kwargs)
+        if period not in ('month', 'week'):
+            raise ValueError()
+        window_date = fields.Date.to_date(window_date) if window_date else None
+
+        request.session['timezone'] = timezone or appointment_type.appointment_tz
+        filter_users, filter_resources = self._get_slots_filter_records(appointment_type, staff_user_id, resource_selected_id, **kwargs)
+        get_slots_window = partial(
+            appointment_type._get_appointment_slots_window_cached,
+            request.session['timezone'],
+            period=period,
+            filter_users=filter_users,
+            filter_resources=filter_resources,
+            asked_capacity=int(asked_capacity),
+        )
+        window = get_slots_window(window_date)
+        if prefetch and window['next_window_date']:
+            window['next_window'] = get_slots_window(fields.Date.to_date(window['next_window_date']))
+        return window
+
+    def _get_available_appointment_type(self, appointment_type_id, **kwargs):
+        """ Appointment type the visitor can access, with the other ones available
+        given the same filters, for routes updating its slots.
+
+        :return: (appointment type, available appointment types)
+        """
         domain = self._appointments_base_domain(
             filter_appointment_type_ids=kwargs.get('filter_appointment_type_ids'),
             search=kwargs.get('search'),
@@ -916,8 +977,13 @@ class AppointmentController(http.Controller):
 
         if not appointment_type:
             raise ValueError()
+        return appointment_type, available_appointments
 
-        request.session['timezone'] = timezone or appointment_type.appointment_tz
+    def _get_slots_filter_records(self, appointment_type, staff_user_id=None, resource_selected_id=None, **kwargs):
+        """ Staff users and resources to compute the slots of appointment_type for.
+
+        :return: (res.users or False, appointment.resource or False)
+        """
         filter_staff_user_ids = json.loads(kwargs.get('filter_staff_user_ids') or '[]')
         filter_resource_ids = json.loads(kwargs.get('filter_resource_ids') or '[]')
         filter_users = filter_resources = False
@@ -929,20 +995,4 @@ class AppointmentController(http.Controller):
         else:
             filter_users = self._get_possible_staff_users(appointment_type, filter_staff_user_ids)
             filter_resources = self._get_possible_resources(appointment_type, filter_resource_ids)
-        asked_capacity = int(asked_capacity)
-        slots = appointment_type._get_appointment_slots(request.session['timezone'], filter_users, filter_resources, asked_capacity=asked_capacity)
-        month_first_available = next((month['id'] for month in slots if month['has_availabilities']), False)
-        month_before_update = kwargs.get('month_before_update')
-        month_kept_from_update = next((month['id'] for month in slots if month['month'] == month_before_update), False) if month_before_update else False
-        formated_days = _formated_weekdays(get_lang(request.env).code)
-
-        return request.env['ir.qweb']._render('appointment.appointment_calendar', {
-            'appointment_type': appointment_type,
-            'available_appointments': available_appointments,
-            'asked_capacity': asked_capacity,
-            'timezone': request.session['timezone'],
-            'formated_days': formated_days,
-            'slots': slots,
-            'month_kept_from_update': month_kept_from_update,
-            'month_first_available': month_first_available,
-        })
+        return filter_users, filter_resources
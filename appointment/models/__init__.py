@@ -7,6 +7,7 @@ from . import appointment_invite
 from . import appointment_question
 from . import appointment_resource
 from . import appointment_slot
+from . import appointment_slots_cache_stamp
 from . import appointment_type
 from . import calendar_alarm
 from . import calendar_attendee
@@ -14,4 +15,7 @@ from . import calendar_event
 from . import ir_binary
 from . import ir_http
 from . import res_partner
+from . import resource_calendar
+from . import resource_calendar_attendance
+from . import resource_calendar_leaves
 from . import templates
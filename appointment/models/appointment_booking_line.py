@@ -39,6 +39,34 @@ class AppointmentBookingLine(models.Model):
                                         appointment_type_name=appointment_type.name,
                                         resource_name_list=', '.join(non_compatible_resources.mapped('name'))))
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        lines._slots_cache_invalidate()
+        return lines
+
+    def write(self, vals):
+        # booked resources before and after the write
+        slots_cache_tags = self._get_slots_cache_tags()
+        res = super().write(vals)
+        if 'appointment_resource_id' in vals:
+            slots_cache_tags |= self._get_slots_cache_tags()
+        self.env['appointment.type']._slots_cache_invalidate(slots_cache_tags)
+        return res
+
+    def unlink(self):
+        self._slots_cache_invalidate()
+        return super().unlink()
+
+    def _get_slots_cache_tags(self):
+        """ Resources booked by those lines, as ``(model name, id)`` tags of
+        the cached availabilities computed from them. """
+        return {('appointment.resource', resource_id) for resource_id in self.appointment_resource_id.ids}
+
+    def _slots_cache_invalidate(self):
+        """ Drop cached availabilities computed from the resources booked by those lines. """
+        self.env['appointment.type']._slots_cache_invalidate(self._get_slots_cache_tags())
+
     @api.depends('appointment_resource_id.capacity', 'appointment_resource_id.shareable',
                  'appointment_type_id.resource_manage_capacity', 'capacity_reserved')
     def _compute_capacity_used(self):
@@ -84,10 +84,25 @@ class AppointmentResource(models.Model):
             display_name = resource_name_capacity if resource.capacity > 1 else resource.name
             resource.display_name = display_name
 
+    def write(self, vals):
+        res = super().write(vals)
+        self._slots_cache_invalidate()
+        return res
+
+    def unlink(self):
+        self._slots_cache_invalidate()
+        return super().unlink()
+
     def copy_data(self, default=None):
         vals_list = super().copy_data(default=default)
         return [dict(vals, name=self.env._("%s (copy)", resource.name)) for resource, vals in zip(self, vals_list)]
 
+    def _slots_cache_invalidate(self):
+        """ Drop cached availabilities computed from those resources. """
+        self.env['appointment.type']._slots_cache_invalidate({
+            (self._name, resource_id) for resource_id in self.ids
+        })
+
     def _get_filtered_possible_capacity_combinations(self, asked_capacity, capacity_info):
         """ Get combinations of resources with total capacity based on the capacity needed and the resources we want.
         :param int asked_capacity: asked capacity for the appointment
@@ -112,6 +127,76 @@ class AppointmentResource(models.Model):
         # possible_capacity[0] = resource_ids and possible_capacity[1] = capacity
         return sorted(possible_capacities.items(), key=lambda possible_capacity: (possible_capacity[1], len(possible_capacity[0])))
 
+    def _get_best_capacity_combination(self, asked_capacity, capacity_info, required_resource_ids=None, memo=None):
+        """ Get the combination of resources that ``_get_filtered_possible_capacity_combinations``
+        would sort first, without enumerating all combinations: the smallest capacity fitting the
+        asked one, then the fewest resources, then the first one generated.
+
+        Combinations of each resource with its linked resources are explored depth first. A branch
+        is cut as soon as it fits the asked capacity (adding resources can only make it worse), when
+        it cannot do better than the best combination found so far, or when its linked resources left
+        cannot reach the asked capacity anyway.
+
+        :param int asked_capacity: asked capacity for the appointment
+        :param dict capacity_info: remaining capacity of available resources, see
+          ``appointment.type._slots_fill_resources_availability``
+        :param list required_resource_ids: if given, combinations must include at least one of them
+        :param dict memo: results of previous calls, shared e.g. by all slots of a computation
+        :return tuple: (tuple of resource ids, remaining capacity) or False if none fits
+        """
+        remaining_capacities = {
+            resource.id: capacity_info.get(resource, {}).get('remaining_capacity', resource.capacity)
+            for resource in self
+        }
+        required_resource_ids = frozenset(required_resource_ids or ())
+        if memo is not None:
+            memo_key = (asked_capacity, tuple(remaining_capacities.items()), required_resource_ids)
+            if memo_key in memo:
+                return memo[memo_key]
+
+        # bounds only hold when capacities can only grow with resources added
+        prune = all(capacity >= 0 for capacity in remaining_capacities.values())
+        best = None  # (capacity, number of resources, generation order, resource ids)
+        for root_index, resource in enumerate(self):
+            linked = [
+                (linked_resource.id, remaining_capacities[linked_resource.id])
+                for linked_resource in resource.linked_resource_ids.sorted('sequence')
+                if linked_resource.id in remaining_capacities
+            ]
+            # capacity still available from linked resources from a given index
+            linked_left = [0] * (len(linked) + 1)
+            for index in range(len(linked) - 1, -1, -1):
+                linked_left[index] = linked_left[index + 1] + max(linked[index][1], 0)
+
+            # depth first, resources being added in the order combinations are generated by
+            # _get_possible_capacity_combinations: the mask of linked resources gives that order
+            stack = [(0, remaining_capacities[resource.id], (resource.id,), 0)]
+            while stack:
+                index, capacity, resource_ids, mask = stack.pop()
+                key = (capacity, len(resource_ids), (root_index, mask))
+                fits = capacity >= asked_capacity and (
+                    not required_resource_ids or not required_resource_ids.isdisjoint(resource_ids))
+                if fits and (best is None or key < best[:3]):
+                    best = key + (resource_ids,)
+                if prune:
+                    if fits or capacity + linked_left[index] < asked_capacity:
+                        continue
+                    if best is not None and (capacity, len(resource_ids)) >= best[:2]:
+                        continue
+                for next_index in range(len(linked) - 1, index - 1, -1):
+                    linked_id, linked_capacity = linked[next_index]
+                    stack.append((
+                        next_index + 1,
+                        capacity + linked_capacity,
+                        resource_ids + (linked_id,),
+                        mask | 1 << next_index,
+                    ))
+
+        result = (best[3], best[0]) if best else False
+        if memo is not None:
+            memo[memo_key] = result
+        return result
+
     def _get_possible_capacity_combinations(self, capacity_info):
         """ Return the possible capacity combination for the resource with all possible linked resources.
         :param dict main_resources_remaining_capacity: main resources available with the according total remaining capacity
@@ -94,6 +94,34 @@ class AppointmentSlot(models.Model):
         if any(self.filtered(lambda slot: slot.slot_type == "unique" and not (slot.start_datetime and slot.end_datetime))):
             raise ValidationError(_("An unique type slot should have a start and end datetime"))
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        slots = super().create(vals_list)
+        slots._slots_cache_invalidate()
+        return slots
+
+    def write(self, vals):
+        # appointment types before and after the write
+        slots_cache_tags = self._get_slots_cache_tags()
+        res = super().write(vals)
+        if 'appointment_type_id' in vals:
+            slots_cache_tags |= self._get_slots_cache_tags()
+        self.env['appointment.type']._slots_cache_invalidate(slots_cache_tags)
+        return res
+
+    def unlink(self):
+        self._slots_cache_invalidate()
+        return super().unlink()
+
+    def _get_slots_cache_tags(self):
+        """ Appointment types of those slots, as ``(model name, id)`` tags of
+        their cached availabilities. """
+        return {('appointment.type', appointment_type_id) for appointment_type_id in self.appointment_type_id.ids}
+
+    def _slots_cache_invalidate(self):
+        """ Drop cached availabilities of the appointment types of those slots. """
+        self.env['appointment.type']._slots_cache_invalidate(self._get_slots_cache_tags())
+
     def _convert_end_hour_24_format(self):
         """Convert end_hour from [0, 24[ to ]0, 24] by replacing 0 by 24 if necessary.
 
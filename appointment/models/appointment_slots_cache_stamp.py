@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from datetime import timedelta
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+
+# tag recorded when all cached values are invalidated, part of every version
+ALL_TAG = ('*', 0)
+
+
+class AppointmentSlotsCacheStamp(models.Model):
+    """ Changes to the records cached slots and unavailabilities are computed
+    from, one row per invalidated record, so that every worker notices them
+    (see ``appointment.type._slots_cache_invalidate``).
+
+    Cached values keep the number and the latest id of the stamps of their
+    records when computed, and are stale as soon as either differs. Ids only
+    grow, so stamps removed by the autovacuum can't make an outdated value
+    look current, and the number catches stamps committed after a later one,
+    their ids being taken before commit. Stamps are only seen once the
+    transaction inserting them is committed, like the changes they stand for,
+    and are discarded with it on rollback.
+    """
+    _name = 'appointment.slots.cache.stamp'
+    _description = 'Appointment Slots Cache Stamp'
+    _log_access = False
+
+    model = fields.Char('Model', required=True)
+    res_id = fields.Integer('Record ID', required=True)
+    stamp_date = fields.Datetime('Stamp Date', required=True)
+
+    def init(self):
+        create_index(self.env.cr, 'appointment_slots_cache_stamp_model_res_id_index', self._table, ['model', 'res_id'])
+
+    @api.model
+    def _stamp(self, tags=None):
+        """ Record a change to the given ``(model name, id)`` tags, or to all
+        records if not given. """
+        tags = list(tags) if tags is not None else [ALL_TAG]
+        if not tags:
+            return
+        self.env.cr.execute(SQL(
+            """ INSERT INTO appointment_slots_cache_stamp (model, res_id, stamp_date)
+                SELECT model, res_id, %s FROM unnest(%s::varchar[], %s::int[]) AS tag(model, res_id) """,
+            fields.Datetime.now(), [model for model, _res_id in tags], [res_id for _model, res_id in tags],
+        ))
+
+    @api.model
+    def _get_version(self, tags):
+        """ Number and id of the latest of the changes recorded for the given
+        ``(model name, id)`` tags. """
+        tags = {ALL_TAG, *tags}
+        self.env.cr.execute(SQL(
+            "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM appointment_slots_cache_stamp WHERE (model, res_id) IN %s",
+            tuple(tags),
+        ))
+        return self.env.cr.fetchone()
+
+    @api.autovacuum
+    def _gc_appointment_slots_cache_stamp(self):
+        """ Cached values live a few minutes at most: older stamps are useless,
+        removing them only makes the cached values relying on them recomputed. """
+        self.env.cr.execute(SQL(
+            "DELETE FROM appointment_slots_cache_stamp WHERE stamp_date < %s",
+            fields.Datetime.now() - timedelta(days=1),
+        ))
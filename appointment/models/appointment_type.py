@@ -3,20 +3,30 @@
 
 import ast
 import calendar as cal
+import copy
 import random
 import pytz
+from collections import defaultdict
 from datetime import datetime, timedelta, time
+from functools import partial
 from dateutil import rrule
 from dateutil.relativedelta import relativedelta
-from babel.dates import format_datetime, format_time
+from babel.dates import format_date, format_datetime, format_time
 from werkzeug.urls import url_encode, url_join
 
 from odoo import api, fields, models, _, Command
 from odoo.exceptions import ValidationError
 from odoo.osv import expression
-from odoo.tools import float_compare, frozendict
+from odoo.tools import float_compare, frozendict, ormcache
 from odoo.tools.misc import babel_locale_parse, get_lang
 from odoo.addons.base.models.res_partner import _tz_get
+from odoo.addons.resource.models.utils import timezone_datetime
+from odoo.addons.appointment.utils import SortedIntervals, TaggedTTLCache, TimezoneSegments, WeightedIntervals
+
+# computed availabilities of public pages, see ``_get_appointment_slots_cached``
+_SLOTS_CACHE = TaggedTTLCache(max_size=512)
+# weekly unavailabilities of working schedules, see ``_get_resources_unavailable_intervals_cached``
+_UNAVAILABILITIES_CACHE = TaggedTTLCache(max_size=4096)
 
 
 class AppointmentType(models.Model):
@@ -358,6 +368,14 @@ class AppointmentType(models.Model):
         """ We don't want the current user to be follower of all created types """
         return super(AppointmentType, self.with_context(mail_create_nosubscribe=True)).create(vals_list)
 
+    def write(self, vals):
+        self._slots_cache_invalidate({(self._name, appointment_type_id) for appointment_type_id in self.ids})
+        return super().write(vals)
+
+    def unlink(self):
+        self._slots_cache_invalidate({(self._name, appointment_type_id) for appointment_type_id in self.ids})
+        return super().unlink()
+
     def copy_data(self, default=None):
         vals_list = super().copy_data(default=default)
         return [dict(
@@ -595,6 +613,30 @@ class AppointmentType(models.Model):
             default_state = 'request'
         return default_state
 
+    @api.model
+    @ormcache('appointment_type_id', 'version')
+    def _get_slots_weekly_template(self, appointment_type_id, version):
+        """ Weekly pattern of the slots of an appointment type, as used by
+        ``_slots_generate`` to generate recurring slots of any day. It is
+        computed once per version of the appointment type: slot changes record
+        a new one (see ``_slots_cache_invalidate``), so templates are never
+        cleared and outdated ones are evicted like any ormcache entry.
+
+        :param int appointment_type_id: id of an <appointment.type>;
+        :param tuple version: version of the appointment type, see
+          ``appointment.slots.cache.stamp._get_version``;
+        :return: frozendict of ISO weekday: tuple of (slot id, start time,
+          end as a timedelta since midnight), ordered like slots
+        """
+        weekly_template = defaultdict(list)
+        for slot in self.sudo().browse(appointment_type_id).slot_ids:
+            weekly_template[int(slot.weekday)].append((
+                slot.id,
+                time(hour=int(slot.start_hour), minute=int(round((slot.start_hour % 1) * 60))),
+                timedelta(hours=slot._convert_end_hour_24_format()),
+            ))
+        return frozendict({weekday: tuple(values) for weekday, values in weekly_template.items()})
+
     def _slots_generate(self, first_day, last_day, timezone, reference_date=None):
         """ Generate all appointment slots (in naive UTC, appointment timezone, and given (visitors) timezone)
             between first_day and last_day
@@ -631,7 +673,7 @@ class AppointmentType(models.Model):
         if ref_start <= (now_tz_apt_type + relativedelta(hours=self.min_schedule_hours)):
             ref_start += relativedelta(hours=self.min_schedule_hours)
 
-        def append_slot(day, slot):
+        def append_slot(day, slot, start_time, end_delta):
             """ Appends and generates all recurring slots. In case day is the
             reference date we adapt local_start to not append slots in the past.
             e.g. With a slot duration of 1 hour if we have slots from 8:00 to
@@ -640,27 +682,23 @@ class AppointmentType(models.Model):
             always check based on working hours that were ignoring these past
             slots.
 
+            All slots of a day keep the UTC offset of the first one, so that
+            their UTC and requested timezone boundaries are simply shifted by
+            the appointment duration instead of being converted one by one.
+
             :param date day: day for which we generate slots;
             :param record slot: a <appointment.slot> record
+            :param time start_time: start of the slot, see ``_get_slots_weekly_template``;
+            :param timedelta end_delta: end of the slot since midnight, see ``_get_slots_weekly_template``;
             """
-            local_start = appt_tz.localize(
-                datetime.combine(day,
-                                 time(hour=int(slot.start_hour),
-                                      minute=int(round((slot.start_hour % 1) * 60))
-                                     )
-                                )
-            )
+            local_start = appt_tz.localize(datetime.combine(day, start_time))
             # Adapt local start to not append slot in the past from ref
             # Using ref_start to consider or not the min schedule hours at the beginning of first slot
-            while local_start < ref_start:
-                local_start += relativedelta(hours=self.appointment_duration)
+            if local_start < ref_start:
+                local_start += duration * -((local_start - ref_start) // duration)
 
-            local_end = local_start + relativedelta(hours=self.appointment_duration)
             # localized end time for the entire slot on that day
-            local_slot_end = appt_tz.localize(
-                day.replace(hour=0, minute=0, second=0) +
-                timedelta(hours=slot._convert_end_hour_24_format())
-            )
+            local_slot_end = appt_tz.localize(day.replace(hour=0, minute=0, second=0) + end_delta)
             # Adapt local_slot_end to not append slot if local_slot_end is in the future of the appointment end_datetime
             if end_tz_apt_type and local_start.date() == end_tz_apt_type.date() and local_slot_end > end_tz_apt_type:
                 local_slot_end = end_tz_apt_type
@@ -668,24 +706,25 @@ class AppointmentType(models.Model):
             # if local_start >= local_slot_end, no slot will be appended
             end_start_delta = ((local_slot_end - local_start).total_seconds() / 3600)
             n_slot = int(end_start_delta / self.appointment_duration)
-            for _index in range(n_slot):
+            utc_start = local_start.replace(tzinfo=None) - local_start.utcoffset()
+            for index in range(n_slot):
+                slot_local_start = local_start + index * duration
+                slot_utc_start = utc_start + index * duration
                 slots.append({
                     self.appointment_tz: (
-                        local_start,
-                        local_end,
+                        slot_local_start,
+                        slot_local_start + duration,
                     ),
                     timezone: (
-                        local_start.astimezone(requested_tz),
-                        local_end.astimezone(requested_tz),
+                        requested_tz_segments.fromutc(slot_utc_start),
+                        requested_tz_segments.fromutc(slot_utc_start + duration),
                     ),
                     'UTC': (
-                        local_start.astimezone(pytz.UTC).replace(tzinfo=None),
-                        local_end.astimezone(pytz.UTC).replace(tzinfo=None),
+                        slot_utc_start,
+                        slot_utc_start + duration,
                     ),
                     'slot': slot,
                 })
-                local_start = local_end
-                local_end += relativedelta(hours=self.appointment_duration)
 
         # We use only the recurring slot if it's not a custom appointment type.
         if self.category != 'custom':
@@ -695,13 +734,24 @@ class AppointmentType(models.Model):
                 return slots
 
             # Regular recurring slots (not a custom appointment), generate necessary slots using configuration rules
-            slot_weekday = [int(weekday) - 1 for weekday in self.slot_ids.mapped('weekday')]
+            duration = timedelta(hours=self.appointment_duration)
+            weekly_template = self._get_slots_weekly_template(
+                self.id, self.env['appointment.slots.cache.stamp']._get_version({(self._name, self.id)}))
+            slots_by_id = {slot.id: slot for slot in self.slot_ids}
+            # slots of the last day may end on the next one, in any timezone
+            requested_tz_segments = TimezoneSegments(
+                requested_tz,
+                first_day.astimezone(pytz.UTC).replace(tzinfo=None) - timedelta(days=1),
+                last_day.astimezone(pytz.UTC).replace(tzinfo=None) + timedelta(days=2),
+            )
             for day in rrule.rrule(rrule.DAILY,
                                 dtstart=first_day.astimezone(appt_tz).date(),
                                 until=last_day.astimezone(appt_tz).date(),
-                                byweekday=slot_weekday):
-                for slot in self.slot_ids.filtered(lambda x: int(x.weekday) == day.isoweekday()):
-                    append_slot(day, slot)
+                                byweekday=[weekday - 1 for weekday in weekly_template]):
+                for slot_id, start_time, end_delta in weekly_template.get(day.isoweekday(), ()):
+                    # template is shared by all users, skip slots not readable by the current one
+                    if slot_id in slots_by_id:
+                        append_slot(day, slots_by_id[slot_id], start_time, end_delta)
         else:
             # Custom appointment type, we use "unique" slots here that have a defined start/end datetime
             unique_slots = self.slot_ids.filtered(lambda slot: slot.slot_type == 'unique' and slot.end_datetime > reference_date)
@@ -728,6 +778,35 @@ class AppointmentType(models.Model):
                 })
         return slots
 
+    def _get_appointment_slots_boundaries(self, requested_tz, reference_date):
+        """ Boundaries of the slots bookable from reference_date, see ``_get_appointment_slots``.
+
+        :param requested_tz: pytz timezone of the visitor
+        :param datetime reference_date: starting datetime to fetch slots (in naive UTC)
+        :return: (first_day, last_day) datetimes in requested_tz
+        """
+        self.ensure_one()
+        now = datetime.utcnow()
+        appointment_duration_days = self.max_schedule_days
+        unique_slots = self.slot_ids.filtered(lambda slot: slot.slot_type == 'unique')
+
+        if self.category == 'custom' and unique_slots:
+            # Custom appointment type, the first day should depend on the first slot datetime
+            start_first_slot = unique_slots[0].start_datetime
+            first_day_utc = start_first_slot if reference_date > start_first_slot else reference_date
+            first_day = requested_tz.fromutc(first_day_utc + relativedelta(hours=self.min_schedule_hours))
+            appointment_duration_days = (unique_slots[-1].end_datetime.date() - reference_date.date()).days
+            last_day = requested_tz.fromutc(reference_date + relativedelta(days=appointment_duration_days))
+        elif self.category == 'punctual':
+            # Punctual appointment type, the first day is the start_datetime if it is in the future, else the first day is now
+            first_day = requested_tz.fromutc(self.start_datetime if self.start_datetime > now else now)
+            last_day = requested_tz.fromutc(self.end_datetime)
+        else:
+            # Recurring appointment type
+            first_day = requested_tz.fromutc(reference_date + relativedelta(hours=self.min_schedule_hours))
+            last_day = requested_tz.fromutc(reference_date + relativedelta(days=appointment_duration_days))
+        return first_day, last_day
+
     def _get_appointment_slots(self, timezone, filter_users=None, filter_resources=None, asked_capacity=1, reference_date=None):
         """ Fetch available slots to book an appointment.
 
@@ -774,24 +853,7 @@ class AppointmentType(models.Model):
         except pytz.UnknownTimeZoneError:
             requested_tz = self.appointment_tz
 
-        appointment_duration_days = self.max_schedule_days
-        unique_slots = self.slot_ids.filtered(lambda slot: slot.slot_type == 'unique')
-
-        if self.category == 'custom' and unique_slots:
-            # Custom appointment type, the first day should depend on the first slot datetime
-            start_first_slot = unique_slots[0].start_datetime
-            first_day_utc = start_first_slot if reference_date > start_first_slot else reference_date
-            first_day = requested_tz.fromutc(first_day_utc + relativedelta(hours=self.min_schedule_hours))
-            appointment_duration_days = (unique_slots[-1].end_datetime.date() - reference_date.date()).days
-            last_day = requested_tz.fromutc(reference_date + relativedelta(days=appointment_duration_days))
-        elif self.category == 'punctual':
-            # Punctual appointment type, the first day is the start_datetime if it is in the future, else the first day is now
-            first_day = requested_tz.fromutc(self.start_datetime if self.start_datetime > now else now)
-            last_day = requested_tz.fromutc(self.end_datetime)
-        else:
-            # Recurring appointment type
-            first_day = requested_tz.fromutc(reference_date + relativedelta(hours=self.min_schedule_hours))
-            last_day = requested_tz.fromutc(reference_date + relativedelta(days=appointment_duration_days))
+        first_day, last_day = self._get_appointment_slots_boundaries(requested_tz, reference_date)
 
         # Compute available slots (ordered)
         slots = self._slots_generate(
@@ -804,35 +866,10 @@ class AppointmentType(models.Model):
         # No slots -> skip useless computation
         if not slots:
             return slots
-        valid_users = filter_users.filtered(lambda user: user in self.staff_user_ids) if filter_users else None
-        valid_resources = filter_resources.filtered(lambda resource: resource in self.resource_ids) if filter_resources else None
+        slot_field_label = self._slots_fill_availability(slots, first_day, last_day, filter_users, filter_resources, asked_capacity)
         # Not found staff user : incorrect configuration -> skip useless computation
-        if filter_users and not valid_users:
+        if not slot_field_label:
             return []
-        if filter_resources and not valid_resources:
-            return []
-        # Used to check availabilities for the whole last day as _slot_generate will return all slots on that date.
-        last_day_end_of_day = datetime.combine(
-            last_day.astimezone(pytz.timezone(self.appointment_tz)),
-            time.max
-        )
-        if self.schedule_based_on == 'users':
-            self._slots_fill_users_availability(
-                slots,
-                first_day.astimezone(pytz.UTC),
-                last_day_end_of_day.astimezone(pytz.UTC),
-                valid_users,
-            )
-            slot_field_label = 'available_staff_users' if self.assign_method == 'time_resource' else 'staff_user_id'
-        else:
-            self._slots_fill_resources_availability(
-                slots,
-                first_day.astimezone(pytz.UTC),
-                last_day_end_of_day.astimezone(pytz.UTC),
-                valid_resources,
-                asked_capacity,
-            )
-            slot_field_label = 'available_resource_ids'
 
         total_nb_slots = sum(slot_field_label in slot for slot in slots)
         # If there is no slot for the minimum capacity then we return an empty list.
@@ -867,46 +904,7 @@ class AppointmentType(models.Model):
                         # slots are ordered, so check all unprocessed slots from until > day
                         while slots and (slots[0][timezone][0].date() <= day):
                             if (slots[0][timezone][0].date() == day) and (slot_field_label in slots[0]):
-                                slot_start_dt_tz = slots[0][timezone][0].strftime('%Y-%m-%d %H:%M:%S')
-                                slot = {
-                                    'datetime': slot_start_dt_tz,
-                                    'available_resources': [{
-                                        'id': resource.id,
-                                        'name': resource.name,
-                                        'capacity': resource.capacity,
-                                    } for resource in slots[0]['available_resource_ids']] if self.schedule_based_on == 'resources' else False,
-                                }
-                                if self.schedule_based_on == 'users' and self.assign_method == 'time_resource':
-                                    slot.update({'available_staff_users': [{
-                                        'id': staff.id,
-                                        'name': staff.name,
-                                    } for staff in slots[0]['available_staff_users']]})
-                                elif self.schedule_based_on == 'users':
-                                    slot.update({'staff_user_id': slots[0]['staff_user_id'].id})
-                                if slots[0]['slot'].allday:
-                                    slot_duration = 24
-                                    slot.update({
-                                        'hours': _("All day"),
-                                        'slot_duration': slot_duration,
-                                    })
-                                else:
-                                    start_hour = format_time(slots[0][timezone][0].time(), format='short', locale=locale)
-                                    end_hour = format_time(slots[0][timezone][1].time(), format='short', locale=locale) if self.category == 'custom' else False
-                                    slot_duration = str((slots[0][timezone][1] - slots[0][timezone][0]).total_seconds() / 3600)
-                                    slot.update({
-                                        'start_hour': start_hour,
-                                        'end_hour': end_hour,
-                                        'slot_duration': slot_duration,
-                                    })
-                                url_parameters = {
-                                    'date_time': slot_start_dt_tz,
-                                    'duration': slot_duration,
-                                }
-                                if self.schedule_based_on == 'users' and self.assign_method != 'time_resource':
-                                    url_parameters.update(staff_user_id=str(slots[0]['staff_user_id'].id))
-                                elif self.schedule_based_on == 'resources':
-                                    url_parameters.update(available_resource_ids=str(slots[0]['available_resource_ids'].ids))
-                                slot['url_parameters'] = url_encode(url_parameters)
+                                slot = self._get_appointment_slot_values(slots[0], timezone, locale)
                                 today_slots.append(slot)
                                 nb_slots_next_months -= 1
                             slots.pop(0)
@@ -933,6 +931,403 @@ class AppointmentType(models.Model):
             start = start + relativedelta(months=1)
         return months
 
+    def _slots_fill_availability(self, slots, first_day, last_day, filter_users=None, filter_resources=None, asked_capacity=1):
+        """ Fill slots generated between first_day and last_day with their available
+        staff users or resources, see ``_slots_fill_users_availability`` and
+        ``_slots_fill_resources_availability``.
+
+        :return str: key of available slots holding their availability, False if
+          none of the given staff users or resources belongs to this appointment type
+        """
+        valid_users = filter_users.filtered(lambda user: user in self.staff_user_ids) if filter_users else None
+        valid_resources = filter_resources.filtered(lambda resource: resource in self.resource_ids) if filter_resources else None
+        if filter_users and not valid_users:
+            return False
+        if filter_resources and not valid_resources:
+            return False
+        # Used to check availabilities for the whole last day as _slot_generate will return all slots on that date.
+        last_day_end_of_day = datetime.combine(
+            last_day.astimezone(pytz.timezone(self.appointment_tz)),
+            time.max
+        )
+        if self.schedule_based_on == 'users':
+            self._slots_fill_users_availability(
+                slots,
+                first_day.astimezone(pytz.UTC),
+                last_day_end_of_day.astimezone(pytz.UTC),
+                valid_users,
+            )
+            slot_field_label = 'available_staff_users' if self.assign_method == 'time_resource' else 'staff_user_id'
+        else:
+            self._slots_fill_resources_availability(
+                slots,
+                first_day.astimezone(pytz.UTC),
+                last_day_end_of_day.astimezone(pytz.UTC),
+                valid_resources,
+                asked_capacity,
+            )
+            slot_field_label = 'available_resource_ids'
+        return slot_field_label
+
+    def _get_appointment_slots_window(self, timezone, window_date=None, period='month', filter_users=None, filter_resources=None, asked_capacity=1, reference_date=None):
+        """ Fetch available slots of the month or week including window_date. Unlike
+        ``_get_appointment_slots``, only the slots of that window are generated and
+        checked, so that the booking widget can load availabilities as the visitor
+        browses the calendar instead of computing the whole horizon upfront.
+
+        :param str timezone: visitor's timezone
+        :param date window_date: a day of the window, in the visitor's timezone. If not
+          given, the first day slots can be booked is used instead;
+        :param str period: 'month' or 'week' (starting on the first week day of the language)
+        :param <res.users> filter_users: see ``_get_appointment_slots``
+        :param <appointment.resource> filter_resources: see ``_get_appointment_slots``
+        :param int asked_capacity: the capacity the user want to book.
+        :param datetime reference_date: see ``_get_appointment_slots``
+
+        :return: dict like
+          {'window_start': '2022-02-01',
+           'window_stop': '2022-03-01' (excluded),
+           'label': 'February 2022',
+           'days': [{'day': '2022-02-14', 'slots': [...] (see ``_get_appointment_slot_values``)}, ...],
+           'nb_slots': 12,
+           'previous_window_date': '2022-01-31' or False if slots cannot be booked before this window,
+           'next_window_date': '2022-03-01' or False if slots cannot be booked after this window,
+          }
+          where only days having available slots are listed.
+        """
+        self.ensure_one()
+        if period not in ('month', 'week'):
+            raise ValueError(f"Invalid slots window period {period!r}")
+        if not reference_date:
+            reference_date = datetime.utcnow()
+        try:
+            requested_tz = pytz.timezone(timezone)
+        except pytz.UnknownTimeZoneError:
+            timezone = self.appointment_tz
+            requested_tz = pytz.timezone(timezone)
+
+        first_day, last_day = self._get_appointment_slots_boundaries(requested_tz, reference_date)
+        lang_code = get_lang(self.env).code
+        locale = babel_locale_parse(lang_code)
+        window_date = window_date or first_day.date()
+        if period == 'month':
+            window_start = window_date.replace(day=1)
+            window_stop = window_start + relativedelta(months=1)
+            label = format_datetime(window_start, 'MMMM Y', locale=lang_code)
+        else:
+            window_start = window_date - timedelta(days=(window_date.weekday() - locale.first_week_day) % 7)
+            window_stop = window_start + timedelta(days=7)
+            label = '%s - %s' % (
+                format_date(window_start, format='medium', locale=locale),
+                format_date(window_stop - timedelta(days=1), format='medium', locale=locale),
+            )
+        window = {
+            'window_start': str(window_start),
+            'window_stop': str(window_stop),
+            'label': label,
+            'days': [],
+            'nb_slots': 0,
+            'previous_window_date': str(window_start - timedelta(days=1)) if window_start > first_day.date() else False,
+            'next_window_date': str(window_stop) if window_stop <= last_day.date() else False,
+        }
+        if not self.active or window_stop <= first_day.date() or window_start > last_day.date():
+            return window
+
+        # Generate the days of the window only, with a margin as slots are
+        # generated per day of the appointment timezone
+        generate_first_day = max(first_day, requested_tz.localize(datetime.combine(window_start - timedelta(days=2), time.min)))
+        generate_last_day = min(last_day, requested_tz.localize(datetime.combine(window_stop + timedelta(days=1), time.min)))
+        slots = [
+            slot for slot in self._slots_generate(
+                generate_first_day.astimezone(pytz.utc),
+                generate_last_day.astimezone(pytz.utc),
+                timezone,
+                reference_date=reference_date,
+            )
+            if window_start <= slot[timezone][0].date() < window_stop
+        ]
+        if not slots:
+            return window
+        slot_field_label = self._slots_fill_availability(
+            slots, generate_first_day, generate_last_day, filter_users, filter_resources, asked_capacity)
+        if not slot_field_label:
+            return window
+
+        days = defaultdict(list)
+        for slot in slots:
+            if slot_field_label in slot:
+                days[slot[timezone][0].date()].append(self._get_appointment_slot_values(slot, timezone, locale))
+        window['days'] = [{
+            'day': str(day),
+            'slots': sorted(day_slots, key=lambda d: d['datetime']),
+        } for day, day_slots in sorted(days.items())]
+        window['nb_slots'] = sum(len(day_slots) for day_slots in days.values())
+        return window
+
+    def _get_appointment_slot_values(self, slot_info, timezone, locale):
+        """ Values of an available slot displayed to the visitor, as found in
+        the days of ``_get_appointment_slots``.
+
+        :param dict slot_info: available slot, see ``_slots_generate``
+        :param str timezone: visitor's timezone
+        :param locale: babel locale used to format hours
+        """
+        slot_start_dt_tz = slot_info[timezone][0].strftime('%Y-%m-%d %H:%M:%S')
+        slot = {
+            'datetime': slot_start_dt_tz,
+            'available_resources': [{
+                'id': resource.id,
+                'name': resource.name,
+                'capacity': resource.capacity,
+            } for resource in slot_info['available_resource_ids']] if self.schedule_based_on == 'resources' else False,
+        }
+        if self.schedule_based_on == 'users' and self.assign_method == 'time_resource':
+            slot.update({'available_staff_users': [{
+                'id': staff.id,
+                'name': staff.name,
+            } for staff in slot_info['available_staff_users']]})
+        elif self.schedule_based_on == 'users':
+            slot.update({'staff_user_id': slot_info['staff_user_id'].id})
+        if slot_info['slot'].allday:
+            slot_duration = 24
+            slot.update({
+                'hours': _("All day"),
+                'slot_duration': slot_duration,
+            })
+        else:
+            start_hour = format_time(slot_info[timezone][0].time(), format='short', locale=locale)
+            end_hour = format_time(slot_info[timezone][1].time(), format='short', locale=locale) if self.category == 'custom' else False
+            slot_duration = str((slot_info[timezone][1] - slot_info[timezone][0]).total_seconds() / 3600)
+            slot.update({
+                'start_hour': start_hour,
+                'end_hour': end_hour,
+                'slot_duration': slot_duration,
+            })
+        url_parameters = {
+            'date_time': slot_start_dt_tz,
+            'duration': slot_duration,
+        }
+        if self.schedule_based_on == 'users' and self.assign_method != 'time_resource':
+            url_parameters.update(staff_user_id=str(slot_info['staff_user_id'].id))
+        elif self.schedule_based_on == 'resources':
+            url_parameters.update(available_resource_ids=str(slot_info['available_resource_ids'].ids))
+        slot['url_parameters'] = url_encode(url_parameters)
+        return slot
+
+    def _get_appointment_slots_cached(self, timezone, filter_users=None, filter_resources=None, asked_capacity=1):
+        """ Same as ``_get_appointment_slots`` starting now, but reusing slots
+        computed by a previous call with the same parameters shortly before.
+
+        Used by the public pages, where the same availabilities are computed
+        over and over. Cached slots are kept at most ``appointment.slots_cache_ttl``
+        seconds (system parameter, 0 disabling the cache) and dropped as soon as
+        the covered staff users or resources get a meeting, booking, working
+        schedule or leave change, or when the appointment type or its slots are
+        updated (see ``_slots_cache_invalidate``). Booking a slot always checks
+        it again (see ``_check_appointment_is_valid_slot``).
+
+        :return: a copy of the months, as returned by ``_get_appointment_slots``
+        """
+        self.ensure_one()
+        return self._get_slots_cached(
+            partial(self._get_appointment_slots, timezone, filter_users, filter_resources, asked_capacity=asked_capacity),
+            ('months', timezone, asked_capacity),
+            filter_users,
+            filter_resources,
+        )
+
+    def _get_appointment_slots_window_cached(self, timezone, window_date=None, period='month', filter_users=None, filter_resources=None, asked_capacity=1):
+        """ Same as ``_get_appointment_slots_window`` starting now, reusing slots
+        computed shortly before like ``_get_appointment_slots_cached``. """
+        self.ensure_one()
+        return self._get_slots_cached(
+            partial(self._get_appointment_slots_window, timezone, window_date, period,
+                    filter_users, filter_resources, asked_capacity=asked_capacity),
+            ('window', timezone, asked_capacity, window_date, period),
+            filter_users,
+            filter_resources,
+        )
+
+    def _get_slots_cached(self, compute, key, filter_users=None, filter_resources=None):
+        """ Return a copy of ``compute()``, reused from the cache if computed for the
+        same key, staff users and resources of this appointment type within the last
+        ``appointment.slots_cache_ttl`` seconds. """
+        ttl = self._get_slots_cache_ttl()
+        if ttl <= 0:
+            return compute()
+
+        key = (
+            self.env.cr.dbname,
+            self.id,
+            tuple(filter_users.ids) if filter_users else None,
+            tuple(filter_resources.ids) if filter_resources else None,
+            get_lang(self.env).code,
+            int(datetime.utcnow().timestamp() // ttl),
+        ) + key
+        result = _SLOTS_CACHE.get(key, validate=self._slots_cache_validate)
+        if result is None:
+            tags = self._get_slots_cache_tags(filter_users, filter_resources)
+            version = self.env['appointment.slots.cache.stamp']._get_version(tags)
+            result = compute()
+            _SLOTS_CACHE.set(key, result, tags, ttl, version=version)
+        return copy.deepcopy(result)
+
+    def _get_slots_cache_tags(self, filter_users=None, filter_resources=None):
+        """ Records the slots of this appointment type are computed from, as
+        ``(model name, id)`` tags matched by ``_slots_cache_invalidate``. """
+        self.ensure_one()
+        tags = {(self._name, self.id)}
+        if self.schedule_based_on == 'users':
+            staff_users = filter_users or self.staff_user_ids
+            tags.update(('res.partner', partner_id) for partner_id in staff_users.partner_id.ids)
+        else:
+            resources = filter_resources or self.resource_ids
+            resources |= resources.linked_resource_ids
+            tags.update(('appointment.resource', resource_id) for resource_id in resources.ids)
+            tags.update(('resource.resource', resource_id) for resource_id in resources.resource_id.ids)
+            tags.update(('resource.calendar', calendar_id) for calendar_id in resources.resource_calendar_id.ids)
+        return tags
+
+    @api.model
+    def _get_slots_cache_ttl(self):
+        return int(self.env['ir.config_parameter'].sudo().get_param('appointment.slots_cache_ttl', 60))
+
+    @api.model
+    def _get_slots_cache_stats(self):
+        """ Hits, misses, expirations, stale entries, evictions and
+        invalidations of cached slots in this process, with its current size. """
+        return dict(_SLOTS_CACHE.stats, size=len(_SLOTS_CACHE))
+
+    @api.model
+    def _get_resources_unavailable_intervals_cached(self, resources, start, stop):
+        """ Same as ``resource.resource._get_unavailable_intervals``, computed per
+        week (in UTC) and cached per working schedule like the slots of public
+        pages (see ``_get_appointment_slots_cached``).
+
+        Scrolling the gantt view then only computes the weeks not displayed yet,
+        in one batch per working schedule, and the rows of resources sharing a
+        working schedule reuse the same entries.
+
+        :param <resource.resource> resources: resources to get unavailabilities of
+        :param datetime start: beginning of the period, naive datetimes being UTC
+        :param datetime stop: end of the period, naive datetimes being UTC
+        :return dict: {resource id: [(start, stop), ...]} as aware UTC datetimes
+        """
+        ttl = self._get_slots_cache_ttl()
+        if ttl <= 0:
+            return resources._get_unavailable_intervals(start, stop)
+
+        start, stop = timezone_datetime(start), timezone_datetime(stop)
+        week = (start - timedelta(days=start.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+        weeks = []
+        while week < stop:
+            weeks.append(week)
+            week += timedelta(days=7)
+
+        calendar_to_resources = defaultdict(lambda: self.env['resource.resource'])
+        for resource in resources:
+            calendar_to_resources[resource.calendar_id or resource.company_id.resource_calendar_id] |= resource
+
+        resource_to_intervals = {}
+        for calendar, calendar_resources in calendar_to_resources.items():
+            if not calendar:
+                continue
+            keys = [(self.env.cr.dbname, calendar.id, calendar.tz, week) for week in weeks]
+            # {resource id: intervals of the week, None if it has no unavailabilities}
+            week_entries = [_UNAVAILABILITIES_CACHE.get(key, validate=self._slots_cache_validate) or {} for key in keys]
+            missing_resources = calendar_resources.filtered(
+                lambda resource: any(resource.id not in entry for entry in week_entries))
+            missing_indexes = [index for index, entry in enumerate(week_entries) if not entry.keys() >= set(missing_resources.ids)]
+            # compute consecutive missing weeks at once
+            while missing_indexes:
+                first_index = last_index = missing_indexes.pop(0)
+                while missing_indexes and missing_indexes[0] == last_index + 1:
+                    last_index = missing_indexes.pop(0)
+                computed = missing_resources._get_unavailable_intervals(
+                    weeks[first_index], weeks[last_index] + timedelta(days=7))
+                for index in range(first_index, last_index + 1):
+                    week_start, week_stop = weeks[index], weeks[index] + timedelta(days=7)
+                    entry = dict(week_entries[index])
+                    for resource_id in missing_resources.ids:
+                        if resource_id not in computed:
+                            entry[resource_id] = None
+                            continue
+                        entry[resource_id] = tuple(
+                            (max(interval_start, week_start), min(interval_stop, week_stop))
+                            for interval_start, interval_stop in computed[resource_id]
+                            if interval_start < week_stop and interval_stop > week_start
+                        )
+                    week_entries[index] = entry
+                    # same snapshot as the computation, the transaction being repeatable read
+                    tags = {('resource.calendar', calendar.id)} | {('resource.resource', resource_id) for resource_id in entry}
+                    _UNAVAILABILITIES_CACHE.set(
+                        keys[index], entry, tags, ttl,
+                        version=self.env['appointment.slots.cache.stamp']._get_version(tags),
+                    )
+
+            for resource in calendar_resources:
+                if all(entry[resource.id] is None for entry in week_entries):
+                    continue
+                resource_to_intervals[resource.id] = [
+                    (max(interval_start, start), min(interval_stop, stop))
+                    for entry in week_entries
+                    for interval_start, interval_stop in entry[resource.id] or ()
+                    if interval_start < stop and interval_stop > start
+                ]
+        return resource_to_intervals
+
+    @api.model
+    def _slots_cache_invalidate(self, tags=None):
+        """ Drop cached slots and unavailabilities computed from any of the
+        given records.
+
+        They are dropped right away in this worker, and a stamp is recorded in
+        the database for each record (see ``appointment.slots.cache.stamp``):
+        other workers notice it once the transaction is committed, when the
+        cached values are checked by ``_slots_cache_validate``. Values cached
+        meanwhile from outdated data, or from changes discarded by a rollback,
+        are detected the same way.
+
+        Partners and resources not used by any appointment type are skipped:
+        most meetings and leaves have no impact on cached values.
+
+        :param set tags: ``(model name, id)`` tuples; all cached slots are
+          dropped if not given
+        """
+        if tags is not None:
+            tags = self._slots_cache_filter_tags(tags)
+            if not tags:
+                return
+        for cache in (_SLOTS_CACHE, _UNAVAILABILITIES_CACHE):
+            cache.invalidate(tags)
+        self.env['appointment.slots.cache.stamp']._stamp(tags)
+
+    @api.model
+    def _slots_cache_filter_tags(self, tags):
+        """ Tags among the given ones that cached values may be computed from,
+        see ``_get_slots_cache_tags`` and ``_get_resources_unavailable_intervals_cached``:
+        partners of staff users, resources of appointment resources, and all
+        other records. """
+        tags = set(tags)
+        partner_ids = [res_id for model, res_id in tags if model == 'res.partner']
+        resource_ids = [res_id for model, res_id in tags if model == 'resource.resource']
+        if partner_ids:
+            staff_partners = self.sudo().with_context(active_test=False).search(
+                [('staff_user_ids.partner_id', 'in', partner_ids)]).staff_user_ids.partner_id
+            tags.difference_update(('res.partner', partner_id) for partner_id in set(partner_ids) - set(staff_partners.ids))
+        if resource_ids:
+            appointment_resources = self.env['appointment.resource'].sudo().with_context(active_test=False).search(
+                [('resource_id', 'in', resource_ids)])
+            tags.difference_update(
+                ('resource.resource', resource_id) for resource_id in set(resource_ids) - set(appointment_resources.resource_id.ids))
+        return frozenset(tags)
+
+    @api.model
+    def _slots_cache_validate(self, tags, version):
+        """ Whether a value cached from the given records is still valid, i.e.
+        no change to them was recorded since it was computed. """
+        return self.env['appointment.slots.cache.stamp']._get_version(tags) == version
+
     def _check_appointment_is_valid_slot(self, staff_user, resources, asked_capacity, timezone, start_dt, duration):
         """
         Given slot parameters check if it is still valid, based on employee
@@ -1102,26 +1497,20 @@ class AppointmentType(models.Model):
         slot_start_dt_utc, slot_end_dt_utc = slot['UTC'][0], slot['UTC'][1]
         staff_user_tz = pytz.timezone(staff_user.tz) if staff_user.tz else pytz.utc
         slot_start_dt_user_timezone = slot_start_dt_utc.astimezone(staff_user_tz)
-        slot_end_dt_user_timezone = slot_end_dt_utc.astimezone(staff_user_tz)
 
         if slot['slot'].restrict_to_user_ids and staff_user not in slot['slot'].restrict_to_user_ids:
             return False
 
-        partner_to_events = availability_values.get('partner_to_events') or {}
-        if partner_to_events.get(staff_user.partner_id):
-            for day_dt in rrule.rrule(freq=rrule.DAILY,
-                                      dtstart=slot_start_dt_utc,
-                                      until=slot_end_dt_utc,
-                                      interval=1):
-                day_events = partner_to_events[staff_user.partner_id].get(day_dt.date()) or []
-                if any(not event.allday and (event.start < slot_end_dt_utc and event.stop > slot_start_dt_utc) for event in day_events):
-                    return False
-            for day_dt in rrule.rrule(freq=rrule.DAILY,
-                                      dtstart=slot_start_dt_user_timezone,
-                                      until=slot_end_dt_user_timezone,
-                                      interval=1):
-                day_events = partner_to_events[staff_user.partner_id].get(day_dt.date()) or []
-                if any(event.allday for event in day_events):
+        partner = staff_user.partner_id
+        busy_intervals = (availability_values.get('partner_to_busy_intervals') or {}).get(partner)
+        if busy_intervals and busy_intervals.overlaps(slot_start_dt_utc, slot_end_dt_utc):
+            return False
+        allday_dates = (availability_values.get('partner_to_allday_dates') or {}).get(partner)
+        if allday_dates:
+            # all day events block every day the slot spans in the user's timezone
+            slot_start_date_user_timezone = slot_start_dt_user_timezone.date()
+            for day_offset in range((slot_end_dt_utc - slot_start_dt_utc) // timedelta(days=1) + 1):
+                if slot_start_date_user_timezone + timedelta(days=day_offset) in allday_dates:
                     return False
         return True
 
@@ -1143,6 +1532,8 @@ class AppointmentType(models.Model):
           {
             'partner_to_events': meetings (not declined), based on user_partner_id
               (see ``_slot_availability_prepare_users_values_meetings()``);
+            'partner_to_busy_intervals': merged time ranges of those meetings;
+            'partner_to_allday_dates': days blocked by all day meetings;
           }
         """
         return self._slot_availability_prepare_users_values_meetings(staff_users, start_dt, end_dt)
@@ -1167,7 +1558,12 @@ class AppointmentType(models.Model):
                   ...
               },
               { ... }
-            }
+            },
+            'partner_to_busy_intervals': non all day meetings (not declined) merged
+              into a ``SortedIntervals`` of UTC time ranges, per user partner;
+            'partner_to_allday_dates': set of dates covered by all day meetings
+              (not declined), per user partner;
+          }
         """
         related_partners = staff_users.partner_id
 
@@ -1176,6 +1572,8 @@ class AppointmentType(models.Model):
         # on start_date and allday
         all_events = self.env['calendar.event']
         if related_partners:
+            all_events = self._get_prefetched_busy_meetings(related_partners, start_dt, end_dt)
+        if related_partners and all_events is None:
             all_events = self.env['calendar.event'].search(
                 ['&',
                  ('partner_ids', 'in', related_partners.ids),
@@ -1186,24 +1584,106 @@ class AppointmentType(models.Model):
                 ],
                 order='start asc',
             )
-        partner_to_events = {}
-        for event in all_events:
-            for attendee in event.attendee_ids.filtered_domain([
-                ('state', '!=', 'declined'),
-                ('partner_id', 'in', related_partners.ids)
-            ]):
-                for day_dt in rrule.rrule(freq=rrule.DAILY,
-                                          dtstart=event.start.date(),
-                                          until=event.stop.date(),
-                                          interval=1):
-                    partner_events = partner_to_events.setdefault(attendee.partner_id, {})
-                    date_date = day_dt.date()  # map per day, not per hour
-                    if partner_events.get(date_date):
-                        partner_events[date_date] += event
-                    else:
-                        partner_events[date_date] = event
+        # single pass on attendees, each partner's meetings are then merged into
+        # sorted time ranges so that slots are checked by binary search
+        partner_to_event_ids = {}
+        partner_to_ranges = {}
+        partner_to_allday_dates = {}
+        related_partner_ids = set(related_partners.ids)
+        for attendee in all_events.attendee_ids:
+            if attendee.state == 'declined' or attendee.partner_id.id not in related_partner_ids:
+                continue
+            event = attendee.event_id
+            partner = attendee.partner_id
+            event_dates = [
+                event.start.date() + timedelta(days=day_offset)
+                for day_offset in range((event.stop.date() - event.start.date()).days + 1)
+            ]
+            partner_events = partner_to_event_ids.setdefault(partner, {})
+            for date_date in event_dates:  # map per day, not per hour
+                partner_events.setdefault(date_date, []).append(event.id)
+            if event.allday:
+                partner_to_allday_dates.setdefault(partner, set()).update(event_dates)
+            else:
+                partner_to_ranges.setdefault(partner, []).append((event.start, event.stop))
+
+        Event = self.env['calendar.event'].with_prefetch(all_events._prefetch_ids)
+        partner_to_events = {
+            partner: {date_date: Event.browse(event_ids) for date_date, event_ids in partner_events.items()}
+            for partner, partner_events in partner_to_event_ids.items()
+        }
+        return {
+            'partner_to_events': partner_to_events,
+            'partner_to_busy_intervals': {
+                partner: SortedIntervals(ranges)
+                for partner, ranges in partner_to_ranges.items()
+            },
+            'partner_to_allday_dates': partner_to_allday_dates,
+        }
 
-        return {'partner_to_events': partner_to_events}
+    def _with_busy_meetings_prefetch(self):
+        """ Return these appointment types in an environment where busy meetings
+        of their staff users are searched once, over the time ranges where slots
+        of any of them can be booked, the first time availabilities are checked.
+        They are then shared by all appointment types computing slots in that
+        environment, e.g. when listing several ones with the same staff (see
+        ``_get_busy_meetings_prefetch``).
+        """
+        return self.with_context(appointment_busy_meetings_prefetch=tuple(self.ids))
+
+    def _get_prefetched_busy_meetings(self, partners, start_dt, end_dt):
+        """ Busy meetings of partners between start_dt and end_dt, taken from those
+        searched once for all appointment types of ``_with_busy_meetings_prefetch``.
+
+        :return: <calendar.event> ordered by start, or None if not prefetched
+        """
+        appointment_type_ids = self.env.context.get('appointment_busy_meetings_prefetch')
+        if appointment_type_ids is None:
+            return None
+        start = datetime.combine(start_dt, time.min)
+        stop = datetime.combine(end_dt, time.max)
+        appointment_types = (self.browse(appointment_type_ids) | self).filtered(
+            lambda appointment_type: appointment_type.active and appointment_type.schedule_based_on == 'users')
+        prefetch_partners = appointment_types.staff_user_ids.partner_id | partners
+        prefetch_start, prefetch_stop = start, stop
+        for appointment_type in appointment_types:
+            first_day, last_day = appointment_type._get_appointment_slots_boundaries(pytz.utc, datetime.utcnow())
+            # slots of the last day are checked up to its end in the appointment timezone
+            prefetch_start = min(prefetch_start, datetime.combine(first_day, time.min))
+            prefetch_stop = max(prefetch_stop, datetime.combine(last_day + timedelta(days=1), time.max))
+        partner_ids = tuple(sorted(prefetch_partners.ids))
+        event_ids = self._get_busy_meetings_prefetch(
+            partner_ids, prefetch_start, prefetch_stop,
+            self.env['appointment.slots.cache.stamp']._get_version({('res.partner', partner_id) for partner_id in partner_ids}),
+        )
+        events = self.env['calendar.event'].browse(event_ids)
+        return events.filtered(lambda event: event.stop >= start and event.start <= stop)
+
+    @api.model
+    @ormcache('self.env.uid', 'self.env.su', 'partner_ids', 'start', 'stop', 'version')
+    def _get_busy_meetings_prefetch(self, partner_ids, start, stop, version):
+        """ Busy meetings of partners between start and stop, searched once per
+        version of those partners: meeting changes record a new one (see
+        ``_slots_cache_invalidate``), so prefetched meetings are never cleared
+        and outdated ones are evicted like any ormcache entry.
+
+        :param tuple partner_ids: sorted ids of <res.partner>;
+        :param datetime start: beginning of the search, in naive UTC;
+        :param datetime stop: end of the search, in naive UTC;
+        :param tuple version: version of those partners, see
+          ``appointment.slots.cache.stamp._get_version``;
+        :return: tuple of <calendar.event> ids, ordered by start
+        """
+        return tuple(self.env['calendar.event'].search(
+            ['&',
+             ('partner_ids', 'in', list(partner_ids)),
+             '&', '&',
+             ('show_as', '=', 'busy'),
+             ('stop', '>=', start),
+             ('start', '<=', stop),
+            ],
+            order='start asc',
+        ).ids)
 
     # --------------------------------------
     # Resources - Slots Availability
@@ -1237,8 +1717,12 @@ class AppointmentType(models.Model):
         )
 
         capacity_info_to_best_resources = {}
+        capacity_combination_memo = {}
+        slot_to_filter_resources = {}
         for slot in slots:
             capacity_info = {}
+            if slot['slot'] not in slot_to_filter_resources:
+                slot_to_filter_resources[slot['slot']] = slot['slot'].restrict_to_resource_ids & available_resources or available_resources
             for resource in available_resources:
                 if not self._slot_availability_is_resource_available(slot, resource, availability_values):
                     continue
@@ -1247,7 +1731,8 @@ class AppointmentType(models.Model):
                     slot['UTC'][0],
                     slot['UTC'][1],
                     resource_to_bookings=availability_values.get('resource_to_bookings'),
-                    filter_resources=slot['slot'].restrict_to_resource_ids & available_resources or available_resources,
+                    filter_resources=slot_to_filter_resources[slot['slot']],
+                    resource_to_booking_index=availability_values.get('resource_to_booking_index'),
                 )
                 if resources_remaining_capacity['total_remaining_capacity'] < asked_capacity:
                     continue
@@ -1272,6 +1757,7 @@ class AppointmentType(models.Model):
                     best_resources_selected = self._slot_availability_select_best_resources(
                         capacity_info,
                         asked_capacity,
+                        capacity_combination_memo=capacity_combination_memo,
                     )
                     capacity_info_to_best_resources[capacity_info] = best_resources_selected
                 else:
@@ -1299,11 +1785,15 @@ class AppointmentType(models.Model):
 
         slot_start_dt_utc, slot_end_dt_utc = slot['UTC'][0], slot['UTC'][1]
         resource_to_bookings = availability_values.get('resource_to_bookings')
+        resource_to_booking_index = availability_values.get('resource_to_booking_index')
         # Check if there is already a booking line for the time slot and make it available
         # only if the resource is shareable and the resource_manage_capacity is enable.
         # This avoid to mark the resource as "available" and compute unnecessary remaining capacity computation
         # because of potential linked resources.
-        if resource_to_bookings.get(resource):
+        if resource_to_booking_index is not None:
+            if resource in resource_to_booking_index and resource_to_booking_index[resource].count(slot_start_dt_utc, slot_end_dt_utc):
+                return resource.shareable if self.resource_manage_capacity else False
+        elif resource_to_bookings.get(resource):
             if resource_to_bookings[resource].filtered(lambda bl: bl.event_start < slot_end_dt_utc and bl.event_stop > slot_start_dt_utc):
                 return resource.shareable if self.resource_manage_capacity else False
 
@@ -1314,7 +1804,7 @@ class AppointmentType(models.Model):
 
         return True
 
-    def _get_resources_remaining_capacity(self, resources, slot_start_utc, slot_stop_utc, resource_to_bookings=None, with_linked_resources=True, filter_resources=None):
+    def _get_resources_remaining_capacity(self, resources, slot_start_utc, slot_stop_utc, resource_to_bookings=None, with_linked_resources=True, filter_resources=None, resource_to_booking_index=None):
         """ Compute the remaining capacities for resources in a particular time slot.
             :param <appointment.resource> resources : record containing one or a multiple of resources
             :param datetime slot_start_utc: start of slot (in naive UTC)
@@ -1326,6 +1816,9 @@ class AppointmentType(models.Model):
                 of particular resources (e.g. when we check if the resources are still available when a customer book an
                 appointment or to compute remaining capacity for a particular resource)
             :param <appointment.resource> filter_resources: filter the resources impacted with this value
+            :param dict resource_to_booking_index: capacity used by booking lines of resources from the prepared
+                values (see ``_slot_availability_prepare_resources_bookings_values``). When given, it is used
+                instead of resource_to_bookings to sum capacities in logarithmic time.
             :return remaining_capacity:
         """
         self.ensure_one()
@@ -1336,6 +1829,17 @@ class AppointmentType(models.Model):
         if not resources:
             return {'total_remaining_capacity': 0}
 
+        if resource_to_booking_index is not None:
+            resources_remaining_capacity = {
+                resource: resource.capacity - (
+                    resource_to_booking_index[resource].weight(slot_start_utc, slot_stop_utc)
+                    if resource in resource_to_booking_index else 0
+                )
+                for resource in all_resources
+            }
+            resources_remaining_capacity.update(total_remaining_capacity=sum(resources_remaining_capacity.values()))
+            return resources_remaining_capacity
+
         booking_lines = self.env['appointment.booking.line'].sudo()
         if resource_to_bookings is None:
             booking_lines = self.env['appointment.booking.line'].sudo().search([
@@ -1357,11 +1861,13 @@ class AppointmentType(models.Model):
         resources_remaining_capacity.update(total_remaining_capacity=sum(resources_remaining_capacity.values()))
         return resources_remaining_capacity
 
-    def _slot_availability_select_best_resources(self, capacity_info, asked_capacity):
+    def _slot_availability_select_best_resources(self, capacity_info, asked_capacity, capacity_combination_memo=None):
         """ Check and select the best resources for the capacity needed
             :params main_resources_remaining_capacity <dict>: dict containing remaining capacities of resources available
             :params linked_resources_remaining_capacity <dict>: dict containing remaining capacities of linked resources
             :params asked_capacity <integer>: asked capacity for the appointment
+            :params capacity_combination_memo <dict>: combinations of resources already selected for other slots
+                (see ``appointment.resource._get_best_capacity_combination``)
             :returns: we return recordset of best resources selected
         """
         self.ensure_one()
@@ -1382,17 +1888,18 @@ class AppointmentType(models.Model):
         capacity_needed = asked_capacity - first_resource_selected_capacity
         if capacity_needed > 0:
             # Get the best resources combination based on the capacity we need and the resources available.
-            resource_possible_combinations = available_resources._get_filtered_possible_capacity_combinations(
+            # Combinations fitting exactly the asked capacity are the smallest ones, hence preferred.
+            r_ids = None
+            if asked_capacity <= first_resource_selected_capacity_info['total_remaining_capacity'] - first_resource_selected_capacity:
+                r_ids = first_resource_selected.ids + first_resource_selected.linked_resource_ids.ids
+            resources_combination_selected = available_resources._get_best_capacity_combination(
                 asked_capacity,
                 capacity_info,
+                required_resource_ids=r_ids,
+                memo=capacity_combination_memo,
             )
-            if not resource_possible_combinations:
+            if not resources_combination_selected:
                 return self.env['appointment.resource']
-            if asked_capacity <= first_resource_selected_capacity_info['total_remaining_capacity'] - first_resource_selected_capacity:
-                r_ids = first_resource_selected.ids + first_resource_selected.linked_resource_ids.ids
-                resource_possible_combinations = list(filter(lambda cap: any(r_id in r_ids for r_id in cap[0]), resource_possible_combinations))
-            resources_combinations_exact_capacity = list(filter(lambda cap: cap[1] == asked_capacity, resource_possible_combinations))
-            resources_combination_selected = resources_combinations_exact_capacity[0] if resources_combinations_exact_capacity else resource_possible_combinations[0]
             return available_resources.filtered(lambda resource: resource.id in resources_combination_selected[0])
 
         if self.assign_method == 'time_resource':
@@ -1439,6 +1946,12 @@ class AppointmentType(models.Model):
                 'appointment_resource_id': recordset of booking line,
                 ...
               },
+            'resource_to_booking_index': capacity used by those bookings over time,
+              formatted as a dict
+              {
+                'appointment_resource_id': WeightedIntervals of (start, stop, capacity used),
+                ...
+              },
           }
         """
 
@@ -1452,6 +1965,13 @@ class AppointmentType(models.Model):
 
         return {
             'resource_to_bookings': resource_to_bookings,
+            'resource_to_booking_index': {
+                resource: WeightedIntervals(
+                    (booking_line.event_start, booking_line.event_stop, booking_line.capacity_used)
+                    for booking_line in resource_booking_lines
+                )
+                for resource, resource_booking_lines in resource_to_bookings.items()
+            },
         }
 
     def _slot_availability_prepare_resources_leave_values(self, appointment_resources, start_dt_utc, end_dt_utc):
@@ -1,12 +1,39 @@
 # -*- coding: utf-8 -*-
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
-from odoo import models, tools
+from odoo import api, models, tools
 
 
 class Attendee(models.Model):
     _inherit = 'calendar.attendee'
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        attendees = super().create(vals_list)
+        attendees._slots_cache_invalidate()
+        return attendees
+
+    def write(self, vals):
+        # partners before and after the write
+        slots_cache_tags = self._get_slots_cache_tags() if 'state' in vals or 'partner_id' in vals else None
+        res = super().write(vals)
+        if slots_cache_tags is not None:
+            self.env['appointment.type']._slots_cache_invalidate(slots_cache_tags | self._get_slots_cache_tags())
+        return res
+
+    def unlink(self):
+        self._slots_cache_invalidate()
+        return super().unlink()
+
+    def _get_slots_cache_tags(self):
+        """ Partners of those attendees, as ``(model name, id)`` tags of the
+        cached availabilities computed from their meetings. """
+        return {('res.partner', partner_id) for partner_id in self.partner_id.ids}
+
+    def _slots_cache_invalidate(self):
+        """ Drop cached availabilities computed from the meetings of those attendees. """
+        self.env['appointment.type']._slots_cache_invalidate(self._get_slots_cache_tags())
+
     def _compute_mail_tz(self):
         toupdate = self.filtered(lambda r: r.event_id.appointment_type_id.appointment_tz)
         for attendee in toupdate:
@@ -221,7 +221,9 @@ class CalendarEvent(models.Model):
                     vals['active'] = False
                 elif 'appointment_status' not in vals and vals.get('active') is False:
                     vals['appointment_status'] = 'cancelled'
-        return super().create(vals_list)
+        events = super().create(vals_list)
+        events._slots_cache_invalidate()
+        return events
 
     def write(self, vals):
         unconfirmed_bookings = self.filtered(lambda event: event.appointment_type_id and event.appointment_status != 'booked')
@@ -231,14 +233,47 @@ class CalendarEvent(models.Model):
             if 'active' not in vals and 'appointment_status' in vals:
                 vals['active'] = vals['appointment_status'] != 'cancelled'
 
+        # attendees and booked resources before and after the write
+        slots_cache_tags = self._get_slots_cache_tags() if not self._get_slots_cache_fields().isdisjoint(vals) else None
+
         res = super().write(vals)
 
+        if slots_cache_tags is not None:
+            self.env['appointment.type']._slots_cache_invalidate(slots_cache_tags | self._get_slots_cache_tags())
+
         confirmed_bookings = unconfirmed_bookings.filtered(lambda event: event.appointment_status == 'booked')
         if confirmed_bookings:
             confirmed_bookings.attendee_ids._send_invitation_emails()
 
         return res
 
+    def unlink(self):
+        self._slots_cache_invalidate()
+        return super().unlink()
+
+    @api.model
+    def _get_slots_cache_fields(self):
+        """ Fields impacting availabilities of attendees and booked resources,
+        see ``appointment.type._get_appointment_slots_cached``. """
+        return {
+            'active', 'allday', 'appointment_resource_ids', 'appointment_status', 'appointment_type_id',
+            'attendee_ids', 'booking_line_ids', 'partner_ids', 'resource_ids', 'resource_total_capacity_reserved',
+            'show_as', 'start', 'start_date', 'stop', 'stop_date',
+        }
+
+    def _get_slots_cache_tags(self):
+        """ Attendees and booked resources of those events, as ``(model name, id)``
+        tags of the cached availabilities computed from them. """
+        events_sudo = self.sudo()
+        return (
+            {('res.partner', partner_id) for partner_id in events_sudo.partner_ids.ids}
+            | {('appointment.resource', resource_id) for resource_id in events_sudo.booking_line_ids.appointment_resource_id.ids}
+        )
+
+    def _slots_cache_invalidate(self):
+        """ Drop cached availabilities computed from attendees or booked resources of those events. """
+        self.env['appointment.type']._slots_cache_invalidate(self._get_slots_cache_tags())
+
     def _init_column(self, column_name):
         """ Initialize the value of the given column for existing rows.
             Overridden here because we skip generating unique access tokens
@@ -568,7 +603,8 @@ class CalendarEvent(models.Model):
                 '|', ('company_id', '=', False), ('company_id', 'in', self.env.context['allowed_company_ids'])]
             )
 
-        resource_unavailabilities = appointment_resource_ids.resource_id._get_unavailable_intervals(start, stop)
+        resource_unavailabilities = self.env['appointment.type']._get_resources_unavailable_intervals_cached(
+            appointment_resource_ids.resource_id, start, stop)
 
         result = {}
         for appointment_resource_id in appointment_resource_ids:
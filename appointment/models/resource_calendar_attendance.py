@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import api, models
+
+
+class ResourceCalendarAttendance(models.Model):
+    _inherit = "resource.calendar.attendance"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        attendances = super().create(vals_list)
+        attendances._slots_cache_invalidate()
+        return attendances
+
+    def write(self, vals):
+        # working schedules before and after the write
+        slots_cache_tags = self._get_slots_cache_tags()
+        res = super().write(vals)
+        if 'calendar_id' in vals:
+            slots_cache_tags |= self._get_slots_cache_tags()
+        self.env['appointment.type']._slots_cache_invalidate(slots_cache_tags)
+        return res
+
+    def unlink(self):
+        self._slots_cache_invalidate()
+        return super().unlink()
+
+    def _get_slots_cache_tags(self):
+        """ Working schedules of those attendances, as ``(model name, id)``
+        tags of the cached availabilities computed from them. """
+        return {('resource.calendar', calendar_id) for calendar_id in self.calendar_id.ids}
+
+    def _slots_cache_invalidate(self):
+        """ Drop cached availabilities computed from the working schedules of
+        those attendances. """
+        self.env['appointment.type']._slots_cache_invalidate(self._get_slots_cache_tags())
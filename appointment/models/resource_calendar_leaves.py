@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import api, models
+
+
+class ResourceCalendarLeaves(models.Model):
+    _inherit = "resource.calendar.leaves"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        leaves = super().create(vals_list)
+        leaves._slots_cache_invalidate()
+        return leaves
+
+    def write(self, vals):
+        # resources and working schedules before and after the write
+        slots_cache_tags = self._get_slots_cache_tags()
+        res = super().write(vals)
+        if slots_cache_tags is not None and {'resource_id', 'calendar_id'} & set(vals):
+            new_tags = self._get_slots_cache_tags()
+            slots_cache_tags = None if new_tags is None else slots_cache_tags | new_tags
+        self.env['appointment.type']._slots_cache_invalidate(slots_cache_tags)
+        return res
+
+    def unlink(self):
+        self._slots_cache_invalidate()
+        return super().unlink()
+
+    def _get_slots_cache_tags(self):
+        """ Resources, or working schedules, of those leaves, as ``(model name, id)``
+        tags of the cached availabilities computed from them. Leaves bound to
+        neither of them apply to everybody: None is returned, standing for all
+        cached availabilities. """
+        if any(not leave.resource_id and not leave.calendar_id for leave in self):
+            return None
+        return (
+            {('resource.resource', resource_id) for resource_id in self.resource_id.ids}
+            | {('resource.calendar', calendar_id) for calendar_id in self.filtered(lambda leave: not leave.resource_id).calendar_id.ids}
+        )
+
+    def _slots_cache_invalidate(self):
+        """ Drop cached availabilities computed from the resources or working
+        schedules of those leaves. """
+        self.env['appointment.type']._slots_cache_invalidate(self._get_slots_cache_tags())
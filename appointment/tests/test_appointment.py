@@ -4,6 +4,7 @@ import pytz
 
 from datetime import date, datetime, timedelta, timezone
 from freezegun import freeze_time
+from unittest.mock import patch
 from werkzeug.urls import url_encode, url_join
 
 import odoo
@@ -713,6 +714,38 @@ class AppointmentTest(AppointmentCommon, HttpCaseWithUserDemo):
             }
         )
 
+    @users('apt_manager')
+    def test_generate_slots_recurring_dst(self):
+        """ Generates recurring slots over DST changes of both the appointment
+        and requested timezones, then after updating slots of the type. """
+        apt_type = self.apt_type_bxls_2days.with_user(self.env.user)
+        first_day = datetime(2022, 3, 7, tzinfo=pytz.utc)  # New York switches on 13/03, Brussels on 27/03
+        last_day = datetime(2022, 4, 7, tzinfo=pytz.utc)
+        appointment_tz, requested_tz = pytz.timezone('Europe/Brussels'), pytz.timezone('America/New_York')
+
+        with freeze_time(datetime(2022, 3, 6)):
+            slots = apt_type._slots_generate(first_day, last_day, 'America/New_York')
+        self.assertEqual(len(slots), 5 * 2 * 6, '5 Mondays and Tuesdays of 6 slots')
+        for slot in slots:
+            start_utc, end_utc = slot['UTC']
+            self.assertEqual(slot['America/New_York'], (
+                pytz.utc.localize(start_utc).astimezone(requested_tz),
+                pytz.utc.localize(end_utc).astimezone(requested_tz),
+            ))
+            self.assertEqual(slot['Europe/Brussels'][0], pytz.utc.localize(start_utc))
+            self.assertEqual(appointment_tz.normalize(slot['Europe/Brussels'][0]).hour, slot['slot'].start_hour)
+            self.assertEqual(end_utc - start_utc, timedelta(hours=1))
+
+        apt_type.slot_ids.filtered(lambda slot: slot.weekday == '2' and slot.start_hour == 8).start_hour = 12.5
+        with freeze_time(datetime(2022, 3, 6)):
+            slots = apt_type._slots_generate(first_day, last_day, 'America/New_York')
+        self.assertEqual(len(slots), 5 * 2 * 6)
+        tuesday_starts = {
+            appointment_tz.normalize(slot['Europe/Brussels'][0]).strftime('%H:%M')
+            for slot in slots if slot['slot'].weekday == '2'
+        }
+        self.assertEqual(tuesday_starts, {'09:00', '10:00', '11:00', '12:00', '12:30', '13:00'})
+
     @users('apt_manager')
     def test_generate_slots_recurring_start_hour_day_overflow(self):
         """ Generates recurring slots, make sure we don't overshoot the current day and generate meaningless slots """
@@ -912,6 +945,143 @@ class AppointmentTest(AppointmentCommon, HttpCaseWithUserDemo):
             }
         )
 
+    @users('apt_manager')
+    def test_generate_slots_recurring_cached(self):
+        """ Slots of public pages are reused until meetings of staff users or
+        slots of the appointment type are updated. """
+        apt_type = self.apt_type_bxls_2days.with_user(self.env.user)
+        first_tuesday = str((self.reference_monday + timedelta(days=1)).date())
+
+        def _get_day_hours(slots, day):
+            return [slot['datetime'][11:16] for slot in self._filter_appointment_slots(slots) if slot['datetime'].startswith(day)]
+
+        with freeze_time(self.reference_now):
+            stats = apt_type._get_slots_cache_stats()
+            slots = apt_type._get_appointment_slots_cached('Europe/Brussels')
+            self.assertEqual(slots, apt_type._get_appointment_slots('Europe/Brussels'))
+            self.assertEqual(apt_type._get_appointment_slots_cached('Europe/Brussels'), slots)
+            new_stats = apt_type._get_slots_cache_stats()
+            self.assertEqual(new_stats['hit'] - stats.get('hit', 0), 1)
+            self.assertEqual(new_stats['miss'] - stats.get('miss', 0), 1)
+            self.assertEqual(_get_day_hours(slots, first_tuesday), ['08:00', '09:00', '10:00', '11:00', '12:00', '13:00'])
+
+            # meeting of the staff user: 8-11 in Brussels
+            self._create_meetings(
+                self.staff_user_bxls,
+                [(self.reference_monday + timedelta(days=1),
+                  self.reference_monday + timedelta(days=1, hours=3),
+                  False
+                 )]
+            )
+            slots = apt_type._get_appointment_slots_cached('Europe/Brussels')
+            self.assertEqual(_get_day_hours(slots, first_tuesday), ['11:00', '12:00', '13:00'])
+
+            # slot of the appointment type removed
+            apt_type.slot_ids.filtered(lambda slot: slot.weekday == '2' and slot.start_hour == 13).unlink()
+            slots = apt_type._get_appointment_slots_cached('Europe/Brussels')
+            self.assertEqual(_get_day_hours(slots, first_tuesday), ['11:00', '12:00'])
+
+            # change recorded by another worker: only the stamp is seen here
+            stats = apt_type._get_slots_cache_stats()
+            self.env['appointment.slots.cache.stamp']._stamp({('res.partner', self.staff_user_bxls.partner_id.id)})
+            apt_type._get_appointment_slots_cached('Europe/Brussels')
+            new_stats = apt_type._get_slots_cache_stats()
+            self.assertEqual(new_stats['stale'] - stats.get('stale', 0), 1)
+            self.assertEqual(new_stats['hit'] - stats.get('hit', 0), 0)
+
+    def test_generate_slots_cache_stamps(self):
+        """ Changes to meetings are stamped once, and only for staff users. """
+        Stamp = self.env['appointment.slots.cache.stamp']
+        staff_partner_tag = ('res.partner', self.staff_user_bxls.partner_id.id)
+        other_user = mail_new_test_user(self.env, login='not_staff', name='Not Staff')
+        other_partner_tag = ('res.partner', other_user.partner_id.id)
+        start = self.reference_monday + timedelta(days=1)
+
+        stamps_count = Stamp._get_version({other_partner_tag})[0]
+        other_meeting = self._create_meetings(other_user, [(start, start + timedelta(hours=1), False)])
+        other_meeting.show_as = 'free'
+        self.assertEqual(Stamp._get_version({other_partner_tag})[0], stamps_count,
+                         'Meetings of users who are not staff have no impact on cached slots')
+
+        meeting = self._create_meetings(self.staff_user_bxls, [(start, start + timedelta(hours=1), False)])
+        stamps_count = Stamp._get_version({staff_partner_tag})[0]
+        meeting.show_as = 'free'
+        self.assertEqual(Stamp._get_version({staff_partner_tag})[0], stamps_count + 1)
+
+    @users('apt_manager')
+    def test_generate_slots_window(self):
+        """ Slots fetched month by month or for a week are the ones of the whole
+        horizon in those windows. """
+        apt_type = self.apt_type_bxls_2days.with_user(self.env.user)
+        # meeting of the staff user: 8-11 in Brussels
+        self._create_meetings(
+            self.staff_user_bxls,
+            [(self.reference_monday + timedelta(days=1),
+              self.reference_monday + timedelta(days=1, hours=3),
+              False
+             )]
+        )
+
+        with freeze_time(self.reference_now):
+            all_slots = [slot['datetime'] for slot in self._filter_appointment_slots(apt_type._get_appointment_slots('Europe/Brussels'))]
+            window = apt_type._get_appointment_slots_window('Europe/Brussels')
+            self.assertEqual(window['window_start'], '2022-02-01')
+            self.assertEqual(window['window_stop'], '2022-03-01')
+            self.assertFalse(window['previous_window_date'])
+            self.assertFalse(window['next_window_date'], 'Horizon of 15 days should end in February')
+            self.assertEqual(window['days'][1]['day'], '2022-02-15')
+            self.assertEqual(
+                [slot['datetime'][11:16] for slot in window['days'][1]['slots']],
+                ['11:00', '12:00', '13:00'],
+            )
+            self.assertEqual([slot['datetime'] for day in window['days'] for slot in day['slots']], all_slots)
+
+            window = apt_type._get_appointment_slots_window('Europe/Brussels', period='week')
+            window_slots, window_starts = [], []
+            while window:
+                window_starts.append(window['window_start'])
+                window_slots += [slot['datetime'] for day in window['days'] for slot in day['slots']]
+                self.assertEqual(window['nb_slots'], sum(len(day['slots']) for day in window['days']))
+                window = window['next_window_date'] and apt_type._get_appointment_slots_window(
+                    'Europe/Brussels', window_date=date.fromisoformat(window['next_window_date']), period='week')
+            # weeks start on Sunday in english
+            self.assertEqual(window_starts, ['2022-02-13', '2022-02-20', '2022-02-27'])
+            self.assertEqual(window_slots, all_slots)
+
+    @users('apt_manager')
+    def test_generate_slots_recurring_prefetched_meetings(self):
+        """ Appointment types sharing staff users check the meetings searched
+        once for all of them, giving the same slots. """
+        apt_type = self.apt_type_bxls_2days.with_user(self.env.user)
+        apt_type_long = apt_type.copy({'max_schedule_days': 30, 'name': 'Bxls Long Appt Type'})
+        meetings = self._create_meetings(
+            self.staff_user_bxls,
+            [(self.reference_monday + timedelta(days=1),
+              self.reference_monday + timedelta(days=1, hours=3),
+              False
+             ),
+             (self.reference_monday + timedelta(days=22),
+              self.reference_monday + timedelta(days=22, hours=2),
+              False
+             )]
+        )
+
+        with freeze_time(self.reference_now):
+            expected_slots = [apt_type._get_appointment_slots('Europe/Brussels'), apt_type_long._get_appointment_slots('Europe/Brussels')]
+            apt_types = (apt_type + apt_type_long)._with_busy_meetings_prefetch()
+            self.assertEqual(apt_types.env.context['appointment_busy_meetings_prefetch'], tuple(apt_types.ids))
+            slots = [apt_types[0]._get_appointment_slots('Europe/Brussels')]
+            with patch.object(type(self.env['calendar.event']), 'search', side_effect=AssertionError('Meetings should be prefetched')):
+                slots.append(apt_types[1]._get_appointment_slots('Europe/Brussels'))
+        self.assertEqual(slots, expected_slots)
+
+        # prefetched meetings are searched again once meetings of the staff change
+        meetings[1].sudo().unlink()
+        with freeze_time(self.reference_now):
+            expected_slots = apt_type_long._get_appointment_slots('Europe/Brussels')
+            self.assertEqual(apt_types[1]._get_appointment_slots('Europe/Brussels'), expected_slots)
+        self.assertNotEqual(slots[1], expected_slots, 'Removed meetings should not be prefetched anymore')
+
     @users('apt_manager')
     def test_generate_slots_unique(self):
         """ Check unique slots (note: custom appointment type does not check working
@@ -1,6 +1,7 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
 from datetime import datetime, timedelta
+from unittest.mock import patch
 import pytz
 
 from odoo.addons.mail.tests.common import mail_new_test_user
@@ -217,6 +218,30 @@ class AppointmentGanttTest(AppointmentGanttTestCommon):
         self.assertNotIn(self.user_john.partner_id.id, group_partner_ids)
         self.assertEqual(gantt_data['records'], [{'id': meeting.id}])
 
+    def test_gantt_paginated_rows(self):
+        """Check that paginated gantt rows include the rows added by group_expand, with
+        only the records of the displayed rows."""
+        self.apt_types[1].staff_user_ids = self.user_john
+        meetings = self._create_meetings(
+            self.user_bob,
+            [(self.reference_monday, self.reference_monday + timedelta(hours=1), False)],
+            self.apt_types[0].id
+        ) + self._create_meetings(
+            self.user_john,
+            [(self.reference_monday, self.reference_monday + timedelta(hours=2), False)],
+            self.apt_types[1].id
+        )
+        CalendarEvent = self.env['calendar.event'].with_context(self.gantt_context)
+        gantt_data = CalendarEvent.get_gantt_data(self.gantt_domain, ['partner_ids'], {})
+        self.assertEqual(sorted(record['id'] for record in gantt_data['records']), sorted(meetings.ids))
+
+        for offset in range(len(gantt_data['groups'])):
+            with self.subTest(offset=offset):
+                page_data = CalendarEvent.get_gantt_data(self.gantt_domain, ['partner_ids'], {}, limit=1, offset=offset)
+                self.assertEqual(page_data['length'], gantt_data['length'])
+                self.assertEqual(page_data['groups'], gantt_data['groups'][offset:offset + 1])
+                self.assertEqual(page_data['records'], [{'id': record_id} for record_id in gantt_data['groups'][offset]['__record_ids']])
+
     @users('staff_user_bxls')
     def test_gantt_resource_unavailabilities_multi_company(self):
         """Check that resources outside of allowed companies don't get calendar unavailabilities."""
@@ -267,6 +292,52 @@ class AppointmentGanttTest(AppointmentGanttTestCommon):
                     list(res_2_unavailabilities)
                 )
 
+    def test_gantt_resource_unavailabilities_cached(self):
+        """Check that cached working schedule unavailabilities are the computed ones, that
+        scrolling only computes the new weeks and that leaves are taken into account."""
+        AppointmentType = self.env['appointment.type']
+        ResourceResource = type(self.env['resource.resource'])
+        resources = (self.apt_resource_1 + self.apt_resource_2).resource_id
+        # from a Friday to a Monday, 2 weeks later
+        start = self.reference_monday.replace(hour=0) - timedelta(days=3)
+        stop = start + timedelta(days=17)
+
+        def _normalize(unavailabilities):
+            return {
+                resource_id: list(Intervals([(interval_start, interval_stop, set()) for interval_start, interval_stop in intervals]))
+                for resource_id, intervals in unavailabilities.items()
+            }
+
+        self.assertEqual(
+            _normalize(AppointmentType._get_resources_unavailable_intervals_cached(resources, start, stop)),
+            _normalize(resources._get_unavailable_intervals(start, stop)),
+        )
+
+        get_unavailable_intervals = ResourceResource._get_unavailable_intervals
+        with patch.object(ResourceResource, '_get_unavailable_intervals', autospec=True,
+                          side_effect=get_unavailable_intervals) as mock_get_unavailable_intervals:
+            unavailabilities = AppointmentType._get_resources_unavailable_intervals_cached(
+                resources, start + timedelta(days=7), stop + timedelta(days=7))
+        self.assertEqual(mock_get_unavailable_intervals.call_count, 1)
+        _resources, computed_start, computed_stop = mock_get_unavailable_intervals.call_args.args
+        self.assertEqual(computed_stop - computed_start, timedelta(days=7), 'Only the new week should be computed')
+        self.assertEqual(
+            _normalize(unavailabilities),
+            _normalize(resources._get_unavailable_intervals(start + timedelta(days=7), stop + timedelta(days=7))),
+        )
+
+        self.env['resource.calendar.leaves'].create({
+            'calendar_id': self.apt_resource_calendar.id,
+            'date_from': self.reference_monday.replace(hour=8),
+            'date_to': self.reference_monday.replace(hour=10),
+            'name': 'Gantt Test Leave',
+            'resource_id': self.apt_resource_1.resource_id.id,
+        })
+        self.assertEqual(
+            _normalize(AppointmentType._get_resources_unavailable_intervals_cached(resources, start, stop)),
+            _normalize(resources._get_unavailable_intervals(start, stop)),
+        )
+
     def test_gantt_without_attendees(self):
         meeting = self._create_meetings(
             self.user_john[0],
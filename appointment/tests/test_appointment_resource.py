@@ -626,6 +626,39 @@ class AppointmentResourceBookingTest(AppointmentCommon):
             self.assertEqual(len(table1_c2_slots), 0)
             self.assertEqual(len(resource_slots), len(table1_c2_c4_slots))
 
+    @users('apt_manager')
+    def test_appointment_resources_combinable_best_combination(self):
+        """ The pruned search of the best combination selects the combination that
+        would be sorted first among all possible combinations. """
+        tables = self.env['appointment.resource'].create([{
+            'appointment_type_ids': self.apt_type_resource.ids,
+            'capacity': capacity,
+            'name': 'Table %s' % index,
+            'sequence': index % 3,
+        } for index, capacity in enumerate([2, 2, 4, 4, 6, 2, 8, 4, 2, 6])])
+        for table in tables:
+            table.linked_resource_ids = tables.filtered(lambda other: other != table and (other.id + table.id) % 3)
+        capacity_info = {table: {'remaining_capacity': table.capacity - index % 2} for index, table in enumerate(tables)}
+        tables = tables.sorted('sequence')
+
+        for asked_capacity in (3, 5, 9, 14, 21, 27, 100):
+            for required_resources in (tables[:1] + tables[:1].linked_resource_ids, self.env['appointment.resource']):
+                with self.subTest(asked_capacity=asked_capacity, required_resources=required_resources.ids):
+                    possible_combinations = [
+                        combination for combination in tables._get_filtered_possible_capacity_combinations(asked_capacity, capacity_info)
+                        if not required_resources or any(resource_id in required_resources.ids for resource_id in combination[0])
+                    ]
+                    memo = {}
+                    best_combination = tables._get_best_capacity_combination(
+                        asked_capacity, capacity_info, required_resource_ids=required_resources.ids, memo=memo)
+                    if not possible_combinations:
+                        self.assertFalse(best_combination)
+                        continue
+                    self.assertEqual(set(best_combination[0]), set(possible_combinations[0][0]))
+                    self.assertEqual(best_combination[1], possible_combinations[0][1])
+                    self.assertEqual(tables._get_best_capacity_combination(
+                        asked_capacity, capacity_info, required_resource_ids=required_resources.ids, memo=memo), best_combination)
+
     @users('apt_manager')
     def test_appointment_resources_combinable_with_time_resource(self):
         """ Check that the last resource available is correctly computed with linked resources """
@@ -9,6 +9,7 @@ from freezegun import freeze_time
 from logging import getLogger
 
 from odoo.addons.appointment.tests.common import AppointmentCommon
+from odoo.addons.mail.tests.common import mail_new_test_user
 from odoo.tests import tagged
 from odoo.tests.common import warmup
 
@@ -101,3 +102,146 @@ class OnlineAppointmentPerformance(AppointmentUIPerformanceCase):
         t1 = time.time()
 
         _logger.info('Browsed /appointment/%i, time %.3f', self.apt_type_bxls_2days.id, t1 - t0)
+
+
+@tagged('appointment_performance', 'post_install', '-at_install')
+class AppointmentSlotsPerformance(AppointmentPerformanceCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(AppointmentSlotsPerformance, cls).setUpClass()
+        cls.staff_users_many = cls.env['res.users'].concat(*(
+            mail_new_test_user(
+                cls.env,
+                company_id=cls.company_admin.id,
+                email='staff_%s@test.example.com' % index,
+                groups='base.group_user',
+                name='Staff %s' % index,
+                notification_type='email',
+                login='staff_user_%s' % index,
+                tz='Europe/Brussels',
+            ) for index in range(40)
+        ))
+        # 15 minutes slots all working days long, every staff user being checked
+        cls.apt_type_many_staff = cls.env['appointment.type'].create({
+            'appointment_tz': 'Europe/Brussels',
+            'appointment_duration': 0.25,
+            'assign_method': 'time_resource',
+            'category': 'recurring',
+            'max_schedule_days': 90,
+            'min_schedule_hours': 1,
+            'name': 'Many Staff Appt Type',
+            'slot_ids': [
+                (0, False, {'weekday': weekday,
+                            'start_hour': 8,
+                            'end_hour': 18,
+                           })
+                for weekday in ['1', '2', '3', '4', '5']
+            ],
+            'staff_user_ids': [(6, 0, cls.staff_users_many.ids)],
+        })
+
+    def setUp(self):
+        super(AppointmentSlotsPerformance, self).setUp()
+        # every staff user is busy from 10:00 to 11:30 UTC each day, and out
+        # of office one day a week (a different one for each user)
+        for index, staff_user in enumerate(self.staff_users_many):
+            self._create_meetings(
+                staff_user,
+                [(self.reference_monday + timedelta(days=day, hours=3),
+                  self.reference_monday + timedelta(days=day, hours=4, minutes=30),
+                  False,
+                 ) for day in range(90)
+                ] + [
+                 (self.reference_monday + timedelta(days=day),
+                  self.reference_monday + timedelta(days=day, hours=1),
+                  True,
+                 ) for day in range(index % 7, 90, 7)
+                ]
+            )
+        self.flush_tracking()
+
+    def test_slots_users_availability_scaling(self):
+        """ Slots generation time against horizon and staff count """
+        for staff_count in (10, 40):
+            for max_schedule_days in (15, 45, 90):
+                with self.subTest(staff_count=staff_count, max_schedule_days=max_schedule_days):
+                    random.seed(1871)  # fix shuffle in _slots_fill_users_availability
+                    self.apt_type_many_staff.max_schedule_days = max_schedule_days
+                    staff_users = self.staff_users_many[:staff_count]
+                    t0 = time.time()
+                    with freeze_time(self.reference_now):
+                        slots = self.apt_type_many_staff._get_appointment_slots(
+                            'Europe/Brussels', filter_users=staff_users
+                        )
+                    t1 = time.time()
+
+                    slots_info = self._filter_appointment_slots(slots, filter_months=[(2, 2022)])
+                    self.assertTrue(slots_info)
+                    # 11:00 - 12:30 in Brussels during february: everybody is in a meeting
+                    self.assertFalse([
+                        slot for slot in slots_info
+                        if '11:00:00' <= slot['datetime'][11:] < '12:30:00'
+                    ])
+                    _logger.info('Slots for %s staff users over %s days, time %.3f',
+                                 staff_count, max_schedule_days, t1 - t0)
+
+
+@tagged('appointment_performance', 'post_install', '-at_install')
+class AppointmentResourcesSlotsPerformance(AppointmentPerformanceCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(AppointmentResourcesSlotsPerformance, cls).setUpClass()
+        # 30 minutes slots all days long, for 200 tables of 2 to 8 seats
+        cls.apt_type_many_resources = cls.env['appointment.type'].create({
+            'appointment_tz': 'UTC',
+            'appointment_duration': 0.5,
+            'assign_method': 'time_auto_assign',
+            'max_schedule_days': 60,
+            'min_schedule_hours': 1,
+            'name': 'Many Resources Appt Type',
+            'resource_manage_capacity': True,
+            'schedule_based_on': 'resources',
+            'slot_ids': [
+                (0, False, {'weekday': weekday,
+                            'start_hour': 11,
+                            'end_hour': 23,
+                           })
+                for weekday in ['1', '2', '3', '4', '5', '6', '7']
+            ],
+        })
+        cls.resources_many = cls.env['appointment.resource'].create([{
+            'appointment_type_ids': cls.apt_type_many_resources.ids,
+            'capacity': 2 + index % 4 * 2,
+            'name': 'Table %s' % index,
+            'shareable': not index % 5,
+        } for index in range(200)])
+        # link tables two by two
+        for resource, linked_resource in zip(cls.resources_many[::2], cls.resources_many[1::2]):
+            resource.linked_resource_ids = linked_resource
+
+    def setUp(self):
+        super(AppointmentResourcesSlotsPerformance, self).setUp()
+        # each table is booked for 2 hours one evening out of three
+        self.env['calendar.event'].with_context(self._test_context).create([{
+            'appointment_type_id': self.apt_type_many_resources.id,
+            'booking_line_ids': [(0, 0, {'appointment_resource_id': resource.id, 'capacity_reserved': 2})],
+            'name': 'Booking %s' % resource.name,
+            'start': self.reference_monday + timedelta(days=day, hours=12),
+            'stop': self.reference_monday + timedelta(days=day, hours=14),
+        } for index, resource in enumerate(self.resources_many) for day in range(index % 3, 60, 3)])
+        self.flush_tracking()
+
+    def test_slots_resources_availability_scaling(self):
+        """ Slots generation time for 200 resources over 60 days """
+        for asked_capacity in (1, 4, 12):
+            with self.subTest(asked_capacity=asked_capacity):
+                t0 = time.time()
+                with freeze_time(self.reference_now):
+                    slots = self.apt_type_many_resources._get_appointment_slots('UTC', asked_capacity=asked_capacity)
+                t1 = time.time()
+
+                self.assertTrue(self._filter_appointment_slots(slots))
+                _logger.info('Slots for 200 resources over 60 days asking for %s, time %.3f',
+                             asked_capacity, t1 - t0)
@@ -1,7 +1,7 @@
 from datetime import datetime
 
 from odoo.tests.common import BaseCase
-from odoo.addons.appointment.utils import intervals_overlap, invert_intervals
+from odoo.addons.appointment.utils import SortedIntervals, intervals_overlap, invert_intervals
 
 class TestAppointmentIntervalUtils(BaseCase):
     def test_intervals_intersections(self):
@@ -62,3 +62,33 @@ class TestAppointmentIntervalUtils(BaseCase):
             start, end = limits
             with self.subTest(start=start, end=end):
                 self.assertListEqual(invert_intervals(test_intervals, start, end), expected_result)
+
+    def test_sorted_intervals(self):
+        busy_intervals = SortedIntervals([
+            (datetime(2023, 2, 13), datetime(2023, 2, 15)),  # overlapping, unordered
+            (datetime(2023, 2, 9), datetime(2023, 2, 10)),  # adjacent
+            (datetime(2023, 2, 10), datetime(2023, 2, 11)),
+            (datetime(2023, 2, 14), datetime(2023, 2, 18)),
+            (datetime(2023, 2, 15), datetime(2023, 2, 16)),  # contained inside the previous
+            (datetime(2023, 2, 20, 12), datetime(2023, 2, 20, 12)),  # 0-length
+        ])
+        self.assertListEqual(list(busy_intervals), [
+            (datetime(2023, 2, 9), datetime(2023, 2, 11)),
+            (datetime(2023, 2, 13), datetime(2023, 2, 18)),
+            (datetime(2023, 2, 20, 12), datetime(2023, 2, 20, 12)),
+        ])
+        test_data = [
+            ((datetime(2023, 2, 1), datetime(2023, 2, 9)), False),  # before, touching
+            ((datetime(2023, 2, 1), datetime(2023, 2, 10)), True),
+            ((datetime(2023, 2, 10, 12), datetime(2023, 2, 10, 13)), True),  # contained
+            ((datetime(2023, 2, 11), datetime(2023, 2, 13)), False),  # exact gap
+            ((datetime(2023, 2, 12), datetime(2023, 2, 20)), True),  # containing
+            ((datetime(2023, 2, 18), datetime(2023, 2, 20, 12)), False),  # touching 0-length
+            ((datetime(2023, 2, 20), datetime(2023, 2, 21)), True),  # containing 0-length
+            ((datetime(2023, 2, 20, 12), datetime(2023, 2, 21)), False),
+            ((datetime(2023, 3, 1), datetime(2023, 3, 2)), False),  # after everything
+        ]
+        for (start, stop), overlaps in test_data:
+            with self.subTest(start=start, stop=stop):
+                self.assertEqual(busy_intervals.overlaps(start, stop), overlaps)
+        self.assertFalse(SortedIntervals().overlaps(datetime(2023, 2, 1), datetime(2023, 2, 2)))
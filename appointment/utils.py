@@ -1,6 +1,12 @@
 # -*- coding: utf-8 -*-
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from collections import Counter
+
 from odoo.addons.resource.models.utils import Intervals, timezone_datetime
 
 def intervals_overlap(interval_a, interval_b):
@@ -44,3 +50,223 @@ def invert_intervals(intervals, first_start, last_stop):
         items.append((prev_stop, last_stop))
     # abuse Intervals to merge contiguous intervals
     return [(start, stop) for start, stop, _ in Intervals([(start, stop, set()) for start, stop in items])]
+
+class SortedIntervals:
+    """Union of [start, stop) time ranges, kept sorted and merged so that
+    overlap checks are a binary search instead of a scan of every range.
+
+    Ranges sharing a bound are merged together, which is harmless for overlap
+    checks as any range intersecting the merged one intersects one of its parts.
+    0-width ranges are kept: they block any range strictly containing them.
+
+    :examples:
+    SortedIntervals([(1, 3), (2, 4), (6, 7)]) -> [(1, 4), (6, 7)]
+    SortedIntervals([(1, 3), (2, 4), (6, 7)]).overlaps(4, 6) -> False
+    SortedIntervals([(1, 3), (2, 4), (6, 7)]).overlaps(3, 5) -> True
+
+    :param iter[tuple[datetime, datetime]] intervals: ranges, in any order
+    """
+    __slots__ = ('starts', 'stops')
+
+    def __init__(self, intervals=()):
+        self.starts, self.stops = [], []
+        for start, stop in sorted(intervals):
+            if self.stops and start <= self.stops[-1]:
+                self.stops[-1] = max(self.stops[-1], stop)
+            else:
+                self.starts.append(start)
+                self.stops.append(stop)
+
+    def __bool__(self):
+        return bool(self.starts)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        return zip(self.starts, self.stops)
+
+    def overlaps(self, start, stop):
+        """Check whether [start, stop) intersects any of the ranges.
+
+        :param datetime start: beginning of the checked range
+        :param datetime stop: end of the checked range
+        :return bool: True if some range starts before stop and ends after start
+        """
+        # once merged, starts and stops are both strictly increasing: if the first
+        # range ending after start does not begin before stop, no later one does
+        index = bisect_right(self.stops, start)
+        return index < len(self.starts) and self.starts[index] < stop
+
+
+class WeightedIntervals:
+    """Weighted [start, stop) time ranges, giving the total weight and the
+    number of ranges intersecting a given range by binary search.
+
+    Ranges intersecting [start, stop) are those starting before stop, minus
+    those already ended at start (which all start before stop as well): both
+    are read from prefix sums over ranges sorted by start and by stop.
+
+    :examples:
+    WeightedIntervals([(1, 3, 2), (2, 5, 1), (6, 7, 4)]).weight(2, 6) -> 3
+    WeightedIntervals([(1, 3, 2), (2, 5, 1), (6, 7, 4)]).count(3, 7) -> 2
+
+    :param iter[tuple[datetime, datetime, int]] intervals: ranges and their weight, in any order
+    """
+    __slots__ = ('starts', 'stops', '_start_weights', '_stop_weights')
+
+    def __init__(self, intervals=()):
+        intervals = list(intervals)
+        by_start = sorted((start, weight) for start, _stop, weight in intervals)
+        by_stop = sorted((stop, weight) for _start, stop, weight in intervals)
+        self.starts = [start for start, _weight in by_start]
+        self.stops = [stop for stop, _weight in by_stop]
+        self._start_weights = [0, *accumulate(weight for _start, weight in by_start)]
+        self._stop_weights = [0, *accumulate(weight for _stop, weight in by_stop)]
+
+    def __bool__(self):
+        return bool(self.starts)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _bounds(self, start, stop):
+        return bisect_left(self.starts, stop), bisect_right(self.stops, start)
+
+    def count(self, start, stop):
+        """Number of ranges intersecting [start, stop)."""
+        started, ended = self._bounds(start, stop)
+        return started - ended
+
+    def weight(self, start, stop):
+        """Total weight of ranges intersecting [start, stop)."""
+        started, ended = self._bounds(start, stop)
+        return self._start_weights[started] - self._stop_weights[ended]
+
+
+class TaggedTTLCache:
+    """Process-wide cache of computed values, each entry expiring after a
+    time-to-live and being tagged with the records it was computed from.
+
+    Entries are dropped when any of their tags is invalidated. This is only
+    seen by the current process: to notice changes made by other workers, a
+    version of the tags (e.g. read from the database) can be stored with each
+    entry, and checked again by the ``validate`` callable given to ``get``.
+    Without it, other workers only pick up changes once the time-to-live is
+    over.
+
+    Hits, misses, expirations, stale entries and invalidations are counted in
+    ``stats``.
+
+    :param int max_size: number of entries kept, oldest ones being evicted first
+    """
+
+    def __init__(self, max_size=512):
+        self.max_size = max_size
+        self.stats = Counter()
+        self._entries = {}  # key: (expiration time, tags, value, version)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None, validate=None):
+        """Return the value cached for key, or default if missing or expired.
+
+        :param validate: optional callable ``validate(tags, version)``, with
+            the tags and version given to ``set``, returning whether the entry
+            is still valid; stale entries are dropped
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['miss'] += 1
+                return default
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.stats['expired'] += 1
+                self.stats['miss'] += 1
+                return default
+        # called outside the lock, it may query the database
+        if validate is not None and not validate(entry[1], entry[3]):
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+                self.stats['stale'] += 1
+                self.stats['miss'] += 1
+            return default
+        with self._lock:
+            self.stats['hit'] += 1
+        return entry[2]
+
+    def set(self, key, value, tags, ttl, version=None):
+        """Cache value for key during ttl seconds.
+
+        :param set tags: hashable tags, e.g. ``('res.partner', 3)``, used by ``invalidate``
+        :param float ttl: time-to-live in seconds
+        :param version: version of the tags the value was computed from,
+            given back to the ``validate`` callable of ``get``
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            while len(self._entries) >= self.max_size:
+                del self._entries[next(iter(self._entries))]
+                self.stats['evicted'] += 1
+            self._entries[key] = (time.monotonic() + ttl, frozenset(tags), value, version)
+
+    def invalidate(self, tags=None):
+        """Drop entries sharing at least one tag with the given ones, or all
+        entries if no tags are given.
+
+        :param iter tags: hashable tags, as given to ``set``
+        """
+        with self._lock:
+            if tags is None:
+                dropped = list(self._entries)
+            else:
+                tags = set(tags)
+                if not tags:
+                    return
+                dropped = [key for key, entry in self._entries.items() if not entry[1].isdisjoint(tags)]
+            for key in dropped:
+                del self._entries[key]
+            self.stats['invalidated'] += len(dropped)
+
+
+class TimezoneSegments:
+    """UTC offsets of a pytz timezone over a time window, split on its DST
+    transitions, to convert many UTC datetimes of that window at once.
+
+    ``fromutc`` gives the same result as ``dt.astimezone(tz)`` on an aware
+    datetime, without walking the whole transitions table of the timezone
+    for each datetime. Datetimes outside of the window go through pytz.
+
+    :param tzinfo tz: pytz timezone
+    :param datetime start: beginning of the window, in naive UTC
+    :param datetime stop: end of the window, in naive UTC
+    """
+    __slots__ = ('tz', 'start', 'stop', '_starts', '_offsets', '_tzinfos')
+
+    def __init__(self, tz, start, stop):
+        self.tz, self.start, self.stop = tz, start, stop
+        transitions = getattr(tz, '_utc_transition_times', None)
+        if not transitions:
+            # fixed offset, like UTC or Etc/GMT+1
+            self._starts, self._offsets, self._tzinfos = [start], [tz.utcoffset(None)], [tz]
+            return
+        # same lookup as pytz DstTzInfo.fromutc, only once per transition of the window
+        first = max(0, bisect_right(transitions, start) - 1)
+        last = max(0, bisect_right(transitions, stop) - 1)
+        self._starts = [start] + transitions[first + 1:last + 1]
+        self._offsets, self._tzinfos = [], []
+        for index in range(first, last + 1):
+            transition_info = tz._transition_info[index]
+            self._offsets.append(transition_info[0])
+            self._tzinfos.append(tz._tzinfos[transition_info])
+
+    def fromutc(self, dt):
+        """Convert a naive UTC datetime into an aware datetime in the timezone."""
+        if not self.start <= dt <= self.stop:
+            return self.tz.fromutc(dt.replace(tzinfo=self.tz))
+        index = bisect_right(self._starts, dt) - 1
+        return (dt + self._offsets[index]).replace(tzinfo=self._tzinfos[index])
@@ -46,16 +46,12 @@ class Partner(models.Model):
                  'associate_member', 'associate_member.membership_state')
     def _compute_membership_state(self):
         today = fields.Date.today()
+        summaries = (self | self.associate_member)._get_membership_lines_summary(today)
         for partner in self:
-            partner.membership_start = self.env['membership.membership_line'].search([
-                ('partner', 'in', (partner.associate_member or partner).ids), ('date_cancel', '=', False)
-            ], limit=1, order='date_from').date_from
-            partner.membership_stop = self.env['membership.membership_line'].search([
-                ('partner', 'in', (partner.associate_member or partner).ids), ('date_cancel', '=', False)
-            ], limit=1, order='date_to desc').date_to
-            partner.membership_cancel = self.env['membership.membership_line'].search([
-                ('partner', 'in', partner.ids)
-            ], limit=1, order='date_cancel').date_cancel
+            dates = summaries.get((partner.associate_member or partner).id, {})
+            partner.membership_start = dates.get('start')
+            partner.membership_stop = dates.get('stop')
+            partner.membership_cancel = summaries.get(partner.id, {}).get('cancel')
 
             if partner.associate_member:
                 partner.membership_state = partner.associate_member.membership_state
@@ -65,19 +61,105 @@ class Partner(models.Model):
                 partner.membership_state = 'free'
                 continue
 
+            summary = summaries.get(partner.id, {'state': 'none'})
+            # an expired line whose invoice is neither paid nor cancelled keeps the current state
+            if 'state' in summary:
+                partner.membership_state = summary['state']
+
+    def _get_membership_lines_summary(self, today):
+        """ Summarize the membership lines of the partners in ``self`` at once.
+
+        The start and stop dates are the first ``date_from`` and last ``date_to``
+        of the uncancelled lines (an open ended line leaves the stop date empty),
+        the cancel date is the first ``date_cancel``. The state is given by the
+        most recent line either running today or expired, see
+        :meth:`_get_membership_line_state`.
+
+        :return: dict ``{partner id: {'start', 'stop', 'cancel'[, 'state']}}``,
+            partners without membership lines are left out
+        """
+        summaries = {}
+        partners = self.filtered('id')
+        if partners:
+            self.env['membership.membership_line'].flush_model([
+                'partner', 'date_from', 'date_to', 'date_cancel', 'state', 'account_invoice_line',
+            ])
+            self.env['account.move.line'].flush_model(['move_id'])
+            self.env['account.move'].flush_model(['state', 'payment_state'])
+            # lines are ordered as the one2many: the first running or expired
+            # line of each partner decides its state
+            self._cr.execute('''
+                WITH lines AS (
+                    SELECT line.id, line.partner, line.date_from, line.date_to, line.date_cancel, line.state,
+                           move.id AS move_id, move.state AS move_state, move.payment_state,
+                           COALESCE(line.date_to, %(date_min)s) >= %(today)s
+                               AND COALESCE(line.date_from, %(date_min)s) <= %(today)s AS is_running,
+                           COALESCE(line.date_from, %(date_min)s) < %(today)s
+                               AND COALESCE(line.date_to, %(date_min)s) <= %(today)s
+                               AND COALESCE(line.date_from, %(date_min)s) < COALESCE(line.date_to, %(date_min)s) AS is_expired
+                      FROM membership_membership_line line
+                 LEFT JOIN account_move_line aml ON aml.id = line.account_invoice_line
+                 LEFT JOIN account_move move ON move.id = aml.move_id
+                     WHERE line.partner IN %(partner_ids)s
+                )
+                SELECT DISTINCT ON (partner)
+                       partner,
+                       MIN(date_from) FILTER (WHERE date_cancel IS NULL) OVER partner_lines,
+                       BOOL_OR(date_to IS NULL) FILTER (WHERE date_cancel IS NULL) OVER partner_lines,
+                       MAX(date_to) FILTER (WHERE date_cancel IS NULL) OVER partner_lines,
+                       MIN(date_cancel) OVER partner_lines,
+                       is_running, is_expired, state, move_id, move_state, payment_state
+                  FROM lines
+                WINDOW partner_lines AS (PARTITION BY partner)
+              ORDER BY partner, (is_running OR is_expired) DESC, id DESC
+            ''', {'partner_ids': tuple(partners.ids), 'today': today, 'date_min': date.min})
+            for (partner_id, date_from, open_ended, date_to, date_cancel,
+                 is_running, is_expired, state, move_id, move_state, payment_state) in self._cr.fetchall():
+                summaries[partner_id] = {
+                    'start': date_from,
+                    'stop': not open_ended and date_to,
+                    'cancel': date_cancel,
+                    **self._get_membership_line_state(is_running, is_expired, state, move_id, move_state, payment_state),
+                }
+
+        # new records: their lines only live in cache
+        for partner in self - partners:
+            if not partner.member_lines:
+                continue
+            uncancelled_lines = partner.member_lines.filtered(lambda line: not line.date_cancel)
+            summary = summaries[partner.id] = {
+                'start': min(filter(None, uncancelled_lines.mapped('date_from')), default=False),
+                'stop': all(uncancelled_lines.mapped('date_to')) and max(uncancelled_lines.mapped('date_to'), default=False),
+                'cancel': min(filter(None, partner.member_lines.mapped('date_cancel')), default=False),
+                'state': 'none',
+            }
             for mline in partner.member_lines:
-                if (mline.date_to or date.min) >= today and (mline.date_from or date.min) <= today:
-                    partner.membership_state = mline.state
-                    break
-                elif ((mline.date_from or date.min) < today and (mline.date_to or date.min) <= today and \
-                      (mline.date_from or date.min) < (mline.date_to or date.min)):
-                    if mline.account_invoice_id and mline.account_invoice_id.payment_state in ('in_payment', 'paid'):
-                        partner.membership_state = 'old'
-                    elif mline.account_invoice_id and mline.account_invoice_id.state == 'cancel':
-                        partner.membership_state = 'canceled'
+                date_from, date_to = mline.date_from or date.min, mline.date_to or date.min
+                is_running = date_to >= today and date_from <= today
+                is_expired = date_from < today and date_to <= today and date_from < date_to
+                if is_running or is_expired:
+                    del summary['state']
+                    summary.update(self._get_membership_line_state(
+                        is_running, is_expired, mline.state, mline.account_invoice_id.id,
+                        mline.account_invoice_id.state, mline.account_invoice_id.payment_state,
+                    ))
                     break
-            else:
-                partner.membership_state = 'none'
+        return summaries
+
+    @api.model
+    def _get_membership_line_state(self, is_running, is_expired, state, move_id, move_state, payment_state):
+        """ Membership state given by the deciding line of a partner, as a dict
+        ``{'state': state}``, empty when an expired line whose invoice is neither
+        paid nor cancelled keeps the current state of the partner. """
+        if is_running:
+            return {'state': state}
+        if is_expired:
+            if move_id and payment_state in ('in_payment', 'paid'):
+                return {'state': 'old'}
+            if move_id and move_state == 'cancel':
+                return {'state': 'canceled'}
+            return {}
+        return {'state': 'none'}
 
     @api.constrains('associate_member')
     def _check_recursion_associate_member(self):
@@ -158,3 +158,22 @@ class TestMembership(TestMembershipCommon):
         self.partner_1._compute_membership_state()
         self.assertEqual(invoice.state, 'cancel')
         self.assertEqual(self.partner_1.membership_state, 'canceled')
+
+    def test_membership_state_batch(self):
+        partner_3, partner_4 = self.env['res.partner'].create([
+            {'name': 'Gaston Lagaffe'},
+            {'name': 'Jeanne Lagaffe', 'associate_member': self.partner_1.id},
+        ])
+        invoice_1, _invoice_3 = (self.partner_1 + partner_3).create_membership_invoice(self.membership_1, 75.0)
+        invoice_1.action_post()
+
+        # recompute all partners at once, as the cron does
+        partners = self.partner_1 + self.partner_2 + partner_3 + partner_4
+        self.env.add_to_compute(partners._fields['membership_state'], partners)
+        self.env.flush_all()
+
+        self.assertEqual(partners.mapped('membership_state'), ['invoiced', 'free', 'waiting', 'invoiced'])
+        self.assertEqual(partner_4.membership_start, self.membership_1.membership_date_from)
+        self.assertEqual(partner_4.membership_stop, self.membership_1.membership_date_to)
+        self.assertFalse(partner_4.membership_cancel)
+        self.assertFalse(self.partner_2.membership_start)
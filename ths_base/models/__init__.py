@@ -10,6 +10,7 @@ from . import stock_quant
 from . import stock_scrap
 from . import stock_landed_cost
 from . import stock_move
+from . import stock_rule
 from . import product
 from . import partner_type
 from . import product_category
\ No newline at end of file
@@ -1,6 +1,8 @@
 # In ths_base/models/account_move.py
 # -*- coding: utf-8 -*-
 
+from collections import defaultdict
+
 from odoo import models, fields, api, _
 from odoo.osv import expression
 #import logging
@@ -36,17 +38,31 @@ class AccountMove(models.Model):
     #         move.ths_hide_taxes = hide_taxes
 
     def _compute_landed_costs(self):
-        """ Find landed costs linked via PO (if bill from PO) or directly """
+        """ Find landed costs linked via PO (if bill from PO) or directly, for all moves with one search """
         LandedCost = self.env['stock.landed.cost']
+        move_po_ids = {move: set(move.invoice_line_ids.purchase_line_id.order_id.ids) for move in self}
+        bill_ids = self._origin.ids
+        po_ids = list(set().union(*move_po_ids.values()))
+        related_lcs = LandedCost
+        if bill_ids or po_ids:
+            related_lcs = LandedCost.search(expression.OR([
+                [('vendor_bill_id', 'in', bill_ids)],
+                [('purchase_order_id', 'in', po_ids)],
+            ]))
+        # Both kinds of links keep the landed cost order, as separate searches would
+        lc_ids_by_bill = defaultdict(list)
+        lc_ids_by_po = defaultdict(list)
+        for lc in related_lcs:
+            lc_ids_by_bill[lc.vendor_bill_id.id].append(lc.id)
+            lc_ids_by_po[lc.purchase_order_id.id].append(lc.id)
+        lc_position = {lc_id: position for position, lc_id in enumerate(related_lcs.ids)}
         for move in self:
-            landed_costs = LandedCost
             # Find via direct link (most reliable if set)
-            landed_costs |= LandedCost.search([('vendor_bill_id', '=', move.id)])
+            landed_costs = LandedCost.browse(lc_ids_by_bill[move._origin.id] if move._origin else [])
             # Find via PO link (can find LCs created from PO before bill link)
-            po_ids = move.invoice_line_ids.purchase_line_id.order_id.ids
-            if po_ids:
-                landed_costs |= LandedCost.search(
-                    [('purchase_order_id', 'in', list(set(po_ids)))])  # Use set for unique POs
+            po_lc_ids = {lc_id for po_id in move_po_ids[move] for lc_id in lc_ids_by_po[po_id]}
+            if po_lc_ids:
+                landed_costs |= LandedCost.browse(sorted(po_lc_ids, key=lc_position.get))
 
             move.ths_stock_landed_cost_ids = landed_costs
             move.landed_cost_count = len(landed_costs)
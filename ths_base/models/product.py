@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from odoo import models, fields, api
 from odoo.tools.float_utils import float_compare
 import logging
@@ -24,17 +26,47 @@ class ProductProduct(models.Model):
         self.ensure_one()
         if date is None:
             date = fields.Date.context_today(self)
-        precision_digits = self.env['decimal.precision'].precision_get('Product Unit of Measure')
+        return self._get_best_seller(self.product_tmpl_id.seller_ids, partner_id, quantity, date)
+
+    def _select_sellers(self, partner_id=False, quantity=0.0, date=None, quantities=None):
+        """
+        Bulk version of _select_seller: the best seller of every product of self, out of the sellers
+        of all their templates read in a single query. Procurement runs use it, see StockRule._run_buy.
+        :param quantities: optional dict {product id: quantity}, products missing from it use quantity
+        :return: dict {product: seller}, the seller being empty when none is valid
+        """
+        if date is None:
+            date = fields.Date.context_today(self)
+        quantities = quantities or {}
+
+        # Same records and order as product_tmpl_id.seller_ids
+        seller_ids_by_template = defaultdict(list)
+        for seller in self.env['product.supplierinfo'].search_fetch(
+                [('product_tmpl_id', 'in', self.product_tmpl_id.ids)],
+                ['product_tmpl_id', 'partner_id', 'sequence', 'ths_manual_priority_vendor',
+                 'date_start', 'date_end', 'min_qty', 'price']):
+            seller_ids_by_template[seller.product_tmpl_id.id].append(seller.id)
+
+        return {
+            product: self._get_best_seller(
+                self.env['product.supplierinfo'].browse(seller_ids_by_template[product.product_tmpl_id.id]),
+                partner_id, quantities.get(product.id, quantity), date,
+            )
+            for product in self
+        }
 
-        # _logger.info(
-        # f"Selecting seller for {self.display_name}, qty: {quantity}, date: {date}, precision_digits: {precision_digits}")
+    @api.model
+    def _get_best_seller(self, all_sellers, partner_id, quantity, date):
+        """
+        Manual priority vendor if valid, else the valid seller with the lowest price.
+        :param all_sellers: sellers of the product, in their model order
+        """
+        precision_digits = self.env['decimal.precision'].precision_get('Product Unit of Measure')
 
-        all_sellers = self.product_tmpl_id.seller_ids
         if partner_id:
             all_sellers = all_sellers.filtered(lambda s: s.partner_id == partner_id)
 
         if not all_sellers:
-            # _logger.warning(f"No sellers found for {self.display_name} (partner filter: {bool(partner_id)})")
             return self.env['product.supplierinfo']
 
         # --- Check for manual override ---
@@ -53,15 +85,9 @@ class ProductProduct(models.Model):
                                                        precision_digits=precision_digits) != -1)
             )
             if is_manual_valid:
-                # _logger.info(
-                # f"Manual override: Selecting seller {top_manual_seller.partner_id.name} based on ths_manual_priority_vendor flag and sequence {top_manual_seller.sequence}.")
                 return top_manual_seller
-            # else:
-            # _logger.info(
-            # f"Manual override vendor {top_manual_seller.partner_id.name} found but is not valid (date/min_qty). Proceeding to lowest price.")
 
         # --- ELSE: Proceed with lowest price logic ---
-        # _logger.info(f"No valid manual override found/selected. Proceeding with lowest price selection.")
         valid_sellers = all_sellers.filtered(
             lambda s:
             (s.date_start is False or s.date_start <= date) and
@@ -70,22 +96,10 @@ class ProductProduct(models.Model):
         )
 
         if not valid_sellers:
-            # _logger.warning(
-            # f"No *valid* sellers found for {self.display_name} based on date/min_qty after checking for manual override.")
             return self.env['product.supplierinfo']
 
         # Sort valid sellers by price (ascending)
-        sorted_sellers_by_price = valid_sellers.sorted(key=lambda s: (s.price, s.sequence, s.id))
-
-        if not sorted_sellers_by_price:
-            # _logger.error(
-            # f"Sorting by price resulted in empty list for {self.display_name}, though valid_sellers was not empty.")
-            return self.env['product.supplierinfo']
-
-        best_seller = sorted_sellers_by_price[0]
-        # _logger.info(
-        # f"Lowest price selection: Selecting seller {best_seller.partner_id.name} with price {best_seller.price} {best_seller.currency_id.symbol}. Found {len(valid_sellers)} valid options (after filtering).")
-        return best_seller
+        return valid_sellers.sorted(key=lambda s: (s.price, s.sequence, s.id))[0]
 
 
 class ProductBrand(models.Model):
@@ -118,53 +118,129 @@ class PurchaseOrder(models.Model):
     def button_confirm(self):
         """ Override to trigger LC creation/update after confirmation """
         res = super(PurchaseOrder, self).button_confirm()
-        for order in self:
-            try:
-                order._create_or_update_landed_cost_from_po()
-            except Exception as e:
-                # Log error but don't block PO confirmation
-                _logger.error(f"Error during automatic LC creation/update for PO {order.name}: {e}")
+        self._create_or_update_landed_costs_from_po()
         return res
 
     def _create_or_update_landed_cost_from_po(self):
         """
         Finds/Creates ONE draft Landed Cost record linked to this PO
         and populates its cost lines based on PO lines marked as landed costs.
-        Called from button_confirm.
         """
         self.ensure_one()
-        #_logger.info(f"PO {self.name}: Checking for landed cost lines upon confirmation...")
+        self._create_or_update_landed_costs_from_po(raise_errors=True)
+
+    def _create_or_update_landed_costs_from_po(self, raise_errors=False):
+        """
+        Batch of _create_or_update_landed_cost_from_po, called from button_confirm:
+        existing draft Landed Costs of all orders are found with one search, and
+        the missing ones are created at once, or order by order if that fails.
+        Errors are logged per order and don't block PO confirmation, unless
+        raise_errors is set.
+        """
+        LandedCost = self.env['stock.landed.cost']
 
         # Find PO lines with products marked as landed costs
-        po_lc_lines = self.order_line.filtered(
-            lambda l: l.product_id and l.product_id.product_tmpl_id.landed_cost_ok
-        )
-
-        if not po_lc_lines:
-            _logger.info(f"PO {self.name}: No landed cost lines found.")
-            # If no LC lines on PO, should we delete existing draft LCs linked?
-            # Potentially dangerous if user manually created one. Let's skip deletion for now.
-            # existing_draft_lcs = self.ths_stock_landed_cost_ids.filtered(lambda lc: lc.state == 'draft')
-            # if existing_draft_lcs:
-            #    _logger.warning(f"PO {self.name}: LC lines removed, but draft LCs {existing_draft_lcs.ids} still exist. Not deleting automatically.")
+        orders_lc_lines = {}
+        for order in self:
+            po_lc_lines = order.order_line.filtered(
+                lambda l: l.product_id and l.product_id.product_tmpl_id.landed_cost_ok
+            )
+            if po_lc_lines:
+                orders_lc_lines[order] = po_lc_lines
+            else:
+                _logger.info(f"PO {order.name}: No landed cost lines found.")
+                # If no LC lines on PO, should we delete existing draft LCs linked?
+                # Potentially dangerous if user manually created one. Let's skip deletion for now.
+        if not orders_lc_lines:
             return
 
-        #_logger.info(f"PO {self.name}: Found {len(po_lc_lines)} landed cost lines. Finding/Creating LC record...")
+        # Find existing DRAFT landed cost linked ONLY to each PO, the first one in LC order
+        existing_lcs = {}
+        for lc in LandedCost.search([
+            ('purchase_order_id', 'in', [order.id for order in orders_lc_lines]),
+            ('state', '=', 'draft'),
+        ]):
+            existing_lcs.setdefault(lc.purchase_order_id, lc)
 
-        LandedCost = self.env['stock.landed.cost']
-        # Find existing DRAFT landed cost linked ONLY to this PO
-        domain = [('purchase_order_id', '=', self.id), ('state', '=', 'draft')]
-        existing_lc = LandedCost.search(domain, limit=1)
+        new_lc_orders = []
+        new_lc_vals_list = []
+        for order, po_lc_lines in orders_lc_lines.items():
+            try:
+                cost_lines_vals = order._prepare_landed_cost_lines_vals(po_lc_lines)
+                if not cost_lines_vals:
+                    _logger.warning(f"PO {order.name}: No valid cost lines could be prepared. No LC created/updated.")
+                    continue
+
+                # Determine effective date to use
+                lc_date = order.ths_effective_date or order.date_order.date() or fields.Date.context_today(order)
+
+                existing_lc = existing_lcs.get(order)
+                if existing_lc:
+                    # Update existing draft LC: Replace cost lines
+                    with self.env.cr.savepoint():
+                        existing_lc.write({
+                            'cost_lines': [(5, 0, 0)] + cost_lines_vals,  # Replace all existing lines
+                            'date': lc_date,
+                            'ths_effective_date': lc_date,
+                        })
+                        existing_lc.message_post(
+                            body=_("Cost lines updated based on confirmed Purchase Order %s.", order.display_name))
+                else:
+                    new_lc_orders.append(order)
+                    new_lc_vals_list.append({
+                        'purchase_order_id': order.id,
+                        'vendor_bill_id': False,  # Bill comes later
+                        'date': lc_date,
+                        'ths_effective_date': lc_date,
+                        'cost_lines': cost_lines_vals,
+                    })
+            except Exception as e:
+                if raise_errors:
+                    raise
+                # Log error but don't block PO confirmation
+                _logger.error(f"Error during automatic LC creation/update for PO {order.name}: {e}")
 
-        # Prepare cost line values from PO lines
+        if not new_lc_vals_list:
+            return
+        if raise_errors:
+            new_lcs = LandedCost.create(new_lc_vals_list)
+        else:
+            try:
+                with self.env.cr.savepoint():
+                    new_lcs = LandedCost.create(new_lc_vals_list)
+            except Exception as e:
+                # Retry order by order, so that a faulty order only skips itself
+                _logger.warning(f"Error during automatic LC creation for POs {[order.name for order in new_lc_orders]}, "
+                                f"retrying order by order: {e}")
+                created_orders = []
+                new_lcs = LandedCost
+                for order, lc_vals in zip(new_lc_orders, new_lc_vals_list):
+                    try:
+                        with self.env.cr.savepoint():
+                            new_lcs |= LandedCost.create(lc_vals)
+                        created_orders.append(order)
+                    except Exception as e:
+                        _logger.error(f"Error during automatic LC creation for PO {order.name}: {e}")
+                new_lc_orders = created_orders
+        for order, new_lc in zip(new_lc_orders, new_lcs):
+            # Post message on LC
+            po_link = Markup(order._get_html_link()) if hasattr(order, '_get_html_link') else order.name
+            new_lc.message_post(body=_("Landed Cost created automatically from Purchase Order %s.", po_link))
+            # Post message on PO
+            lc_link = Markup(new_lc._get_html_link()) if hasattr(new_lc, '_get_html_link') else new_lc.name
+            order.message_post(
+                body=_("Automatically created Landed Cost %(lc_link)s based on lines in %(po_link)s.", lc_link=lc_link,
+                       po_link=po_link))
+
+    def _prepare_landed_cost_lines_vals(self, po_lc_lines):
+        """ Landed cost line commands for the given landed cost lines of this PO """
+        self.ensure_one()
         cost_lines_vals = []
         for po_line in po_lc_lines:
             # Use the product's default expense account or fallback
             accounts = po_line.product_id.product_tmpl_id.get_product_accounts(fiscal_pos=self.fiscal_position_id)
             account_id = accounts.get('expense') or po_line.product_id.categ_id.property_account_expense_categ_id
             if not account_id:
-                #_logger.warning(
-                    #f"PO {self.name}: Cannot find expense account for LC product {po_line.product_id.name} on line {po_line.id}. Skipping.")
                 continue  # Skip if no account defined
 
             cost_lines_vals.append((0, 0, {
@@ -174,46 +250,7 @@ class PurchaseOrder(models.Model):
                 'split_method': po_line.product_id.split_method_landed_cost or 'equal',
                 'price_unit': po_line.price_subtotal,
             }))
-
-        if not cost_lines_vals:
-            _logger.warning(f"PO {self.name}: No valid cost lines could be prepared. No LC created/updated.")
-            return
-
-        # Determine effective date to use
-        lc_date = self.ths_effective_date or self.date_order.date() or fields.Date.context_today(self)
-
-        if existing_lc:
-            # Update existing draft LC: Replace cost lines
-            #_logger.info(
-                #f"PO {self.name}: Updating existing draft LC {existing_lc.name} ({existing_lc.id}) with {len(cost_lines_vals)} lines.")
-            update_vals = {
-                'cost_lines': [(5, 0, 0)] + cost_lines_vals,  # Replace all existing lines
-                'date': lc_date,
-                'ths_effective_date': lc_date,
-            }
-            existing_lc.write(update_vals)
-            existing_lc.message_post(
-                body=_("Cost lines updated based on confirmed Purchase Order %s.", self.display_name))
-        else:
-            # Create new draft LC
-            #_logger.info(f"PO {self.name}: Creating new draft LC with {len(cost_lines_vals)} lines.")
-            lc_vals = {
-                'purchase_order_id': self.id,
-                'vendor_bill_id': False,  # Bill comes later
-                'date': lc_date,
-                'ths_effective_date': lc_date,
-                'cost_lines': cost_lines_vals,
-            }
-            new_lc = LandedCost.create(lc_vals)
-            #_logger.info(f"PO {self.name}: Created new Landed Cost {new_lc.name} ({new_lc.id})")
-            # Post message on LC
-            po_link = Markup(self._get_html_link()) if hasattr(self, '_get_html_link') else self.name
-            new_lc.message_post(body=_("Landed Cost created automatically from Purchase Order %s.", po_link))
-            # Post message on PO
-            lc_link = Markup(new_lc._get_html_link()) if hasattr(new_lc, '_get_html_link') else new_lc.name
-            self.message_post(
-                body=_("Automatically created Landed Cost %(lc_link)s based on lines in %(po_link)s.", lc_link=lc_link,
-                       po_link=po_link))
+        return cost_lines_vals
 
 class PurchaseOrderLine(models.Model):
     _inherit= "purchase.order.line"
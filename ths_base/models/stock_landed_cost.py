@@ -3,6 +3,7 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
 from odoo.osv import expression
+from odoo.tools import groupby
 #from datetime import datetime
 import logging
 from markupsafe import Markup  # For chatter message links
@@ -370,63 +371,75 @@ class StockLandedCost(models.Model):
     #     return super(StockLandedCost, self.with_context(auto_computing=True)).compute_landed_cost()
 
     def button_validate(self):
-        """ Extend standard validation to ensure proper cost recomputation """
-        # Snapshot
-        _logger.info(f"LC {self.id}: Taking snapshot of product costs before validation.")
+        """ Extend standard validation to ensure proper cost recomputation.
+            Supports many landed costs at once: one cost snapshot, one validation per effective date,
+            then the JE refs and chatter of all of them.
+        """
+        # Snapshot, taken once for the whole batch: the costs just before these landed costs apply
+        _logger.info(f"LC {self.ids}: Taking snapshot of product costs before validation.")
         products_to_snapshot = self.valuation_adjustment_lines.mapped('product_id').filtered(
             lambda p: p.cost_method in ('average', 'fifo'))
         if products_to_snapshot:
-            _logger.info(f"LC {self.id}: Snapping cost for products: {products_to_snapshot.ids}")
-            for product in products_to_snapshot:
+            _logger.info(f"LC {self.ids}: Snapping cost for products: {products_to_snapshot.ids}")
+            # One write per distinct cost, flushed together as a single UPDATE
+            for standard_price, products in groupby(products_to_snapshot, key=lambda p: p.standard_price):
+                products = self.env['product.product'].union(*products)
                 try:
-                    product.sudo().write({'ths_last_standard_price': product.standard_price})
+                    products.sudo().write({'ths_last_standard_price': standard_price})
                 except Exception as e:
-                    _logger.error(f"Failed to snapshot cost for product {product.id}: {e}")
+                    _logger.error(f"Failed to snapshot cost for products {products.ids}: {e}")
         else:
-            _logger.info(f"LC {self.id}: No relevant products found on adjustment lines to snapshot cost for.")
-
-        # Effective date context logic
-        context_with_date = self.env.context.copy()
-        final_je_date = self.ths_effective_date or self.date
-        if final_je_date:
-            context_with_date['force_period_date'] = final_je_date
+            _logger.info(f"LC {self.ids}: No relevant products found on adjustment lines to snapshot cost for.")
 
         # Auto Compute incase forgotten by user
         self.compute_landed_cost()
 
-        # Call super
-        res = super(StockLandedCost, self.with_context(context_with_date)).button_validate()
+        # Call super, once per effective date as the JE date goes through the context
+        res = True
+        for final_je_date, landed_costs in groupby(self, key=lambda lc: lc.ths_effective_date or lc.date):
+            landed_costs = self.union(*landed_costs)
+            context_with_date = self.env.context.copy()
+            if final_je_date:
+                context_with_date['force_period_date'] = final_je_date
+            res = super(StockLandedCost, landed_costs.with_context(context_with_date)).button_validate()
 
+        landed_costs_with_je = self.filtered('account_move_id')
         # Keep JE Ref update logic
-        if self.account_move_id:
+        for landed_cost in landed_costs_with_je:
             try:
-                new_ref = f"LC: {self.name or '/'}";
+                new_ref = f"LC: {landed_cost.name or '/'}";
                 ref_parts = []
-                if self.purchase_order_id: ref_parts.append(f"PO: {self.purchase_order_id.name}")
-                if self.vendor_bill_id: ref_parts.append(f"Bill: {self.vendor_bill_id.name or '/'}")
+                if landed_cost.purchase_order_id: ref_parts.append(f"PO: {landed_cost.purchase_order_id.name}")
+                if landed_cost.vendor_bill_id: ref_parts.append(f"Bill: {landed_cost.vendor_bill_id.name or '/'}")
                 # Include reversal info in ref if applicable
-                if self.original_lc_id: ref_parts.append(f"Reversal of: {self.original_lc_id.name}")
-                # if self.ths_effective_date: ref_parts.append(f"EffDt: {fields.Date.to_string(self.ths_effective_date)}")
+                if landed_cost.original_lc_id: ref_parts.append(f"Reversal of: {landed_cost.original_lc_id.name}")
                 if ref_parts: new_ref += " (" + " | ".join(ref_parts) + ")"
-                self.account_move_id.sudo().write({'ref': new_ref})
-                _logger.info(f"LC {self.id}: Updated JE {self.account_move_id.name} ref to: {new_ref}")
+                landed_cost.account_move_id.sudo().write({'ref': new_ref})
             except Exception as e:
-                _logger.error(f"LC {self.id}: Failed to update JE ref: {e}")
+                _logger.error(f"LC {landed_cost.id}: Failed to update JE ref: {e}")
+        if landed_costs_with_je:
+            _logger.info(f"LC {landed_costs_with_je.ids}: Updated refs of JEs {landed_costs_with_je.account_move_id.ids}")
 
             # *** ADD CHATTER TO JE ***
             try:
-                lc_link = Markup(self._get_html_link()) if hasattr(self, '_get_html_link') else self.name
-                body_msg = _("Journal Entry created from Landed Cost: %s", lc_link)
-                self.account_move_id.message_post(body=body_msg)
-                _logger.info(f"Posted chatter on JE {self.account_move_id.name} linking back to LC {self.id}")
+                landed_costs_with_je.account_move_id._message_log_batch(bodies={
+                    landed_cost.account_move_id.id: _(
+                        "Journal Entry created from Landed Cost: %s",
+                        Markup(landed_cost._get_html_link()) if hasattr(landed_cost, '_get_html_link') else landed_cost.name,
+                    )
+                    for landed_cost in landed_costs_with_je
+                })
+                _logger.info(f"Posted chatter on JEs {landed_costs_with_je.account_move_id.ids} linking back to their LC")
             except Exception as e:
-                _logger.error(f"Failed to post chatter on JE {self.account_move_id.name}: {e}")
+                _logger.error(f"Failed to post chatter on JEs {landed_costs_with_je.account_move_id.ids}: {e}")
             # *** END ADD CHATTER ***
 
             # Verify Date
-            if final_je_date and self.account_move_id.date != final_je_date:
-                _logger.warning(
-                    f"LC {self.id}: JE {self.account_move_id.name} date ({self.account_move_id.date}) != effective date ({final_je_date}).")
+            for landed_cost in landed_costs_with_je:
+                final_je_date = landed_cost.ths_effective_date or landed_cost.date
+                if final_je_date and landed_cost.account_move_id.date != final_je_date:
+                    _logger.warning(
+                        f"LC {landed_cost.id}: JE {landed_cost.account_move_id.name} date ({landed_cost.account_move_id.date}) != effective date ({final_je_date}).")
         return res
 
     # --- Reversal Method ---
@@ -3,6 +3,7 @@
 
 from odoo import models, fields
 #from odoo.exceptions import UserError
+from collections import defaultdict
 from datetime import datetime
 import logging
 
@@ -24,23 +25,16 @@ class StockMove(models.Model):
                     - Set move.date BEFORE super() based on ths_effective_date.
                     - Check AFTER super() if the date was reset and correct if necessary.
                     - Update move line date AFTER super().
+            Moves and lines are written once per effective date, not one by one.
         """
         # _logger.info(f"Move {self.ids}: Entering _action_done. Context: {self.env.context}")
         self = self.with_context(self.env.context)
         moves_to_process = self.filtered(lambda m: m.state not in ('done', 'cancel'))
         moves_with_effective_date = moves_to_process.filtered(lambda m: m.ths_effective_date)
-        original_move_dates = {move.id: move.date for move in moves_with_effective_date}
+        original_move_ids = set(moves_with_effective_date.ids)
 
         # --- Effective Date Injection BEFORE Super() ---
-        for move in moves_with_effective_date:
-            effective_datetime_naive = datetime.combine(move.ths_effective_date, fields.time.min)
-            effective_datetime_utc = effective_datetime_naive
-            # _logger.info(
-            # f"PRE-SUPER: Setting move {move.id} date to {effective_datetime_utc} based on effective date {move.ths_effective_date}")
-            try:
-                move.sudo().write({'date': effective_datetime_utc})
-            except Exception as e:
-                _logger.error(f"Error writing effective date PRE-super for move {move.id}: {e}")
+        self._write_effective_date(moves_with_effective_date, "PRE-super")
 
         # --- Call original method ---
         res_moves = super(StockMove, self)._action_done(cancel_backorder=cancel_backorder)
@@ -48,62 +42,49 @@ class StockMove(models.Model):
 
         # --- Post-Super Verification / Correction for Move & Move Lines ---
         processed_moves_to_check = self.env['stock.move'].browse([
-            move_id for move_id in original_move_dates.keys() if move_id in res_moves.ids
-        ])
-
-        moves_corrected = self.env['stock.move']  # Track moves whose date was just corrected
+            move_id for move_id in res_moves.ids if move_id in original_move_ids
+        ]).exists().filtered('ths_effective_date')
 
-        for move in processed_moves_to_check:
-            if not move.exists() or not move.ths_effective_date: continue
-
-            effective_datetime_naive = datetime.combine(move.ths_effective_date, fields.time.min)
-            effective_datetime_utc = effective_datetime_naive
-            current_move_date_utc = fields.Datetime.to_datetime(move.date)
-
-            # Correct Stock Move date if needed
-            if not current_move_date_utc or current_move_date_utc.date() != move.ths_effective_date:
-                # _logger.warning(
-                # f"POST-SUPER CHECK: Move {move.id} date ({move.date}) was reset. Target: {effective_datetime_utc}. Forcing correction.")
-                try:
-                    move.sudo().write({'date': effective_datetime_utc})
-                    _logger.info(f"Applied post-super date correction for move {move.id}")
-                    moves_corrected |= move
-                except Exception as e:
-                    _logger.error(f"Error applying post-super date correction for move {move.id}: {e}")
-            else:
-                _logger.info(
-                    f"POST-SUPER CHECK: Move {move.id} date ({move.date}) already matches effective date {move.ths_effective_date}.")
+        # Correct Stock Move dates that were reset
+        moves_reset = processed_moves_to_check.filtered(lambda m: self._is_date_off(m.date, m.ths_effective_date))
+        if self._write_effective_date(moves_reset, "post-super date correction"):
+            _logger.info(f"Applied post-super date correction for moves {moves_reset.ids}")
 
         # --- Update Stock Move Line Dates ---
-        # Process moves that had an effective date, focusing on those just corrected or already correct
-        moves_to_update_lines = processed_moves_to_check  # All moves that should have the effective date
-
-        if moves_to_update_lines:
-            # _logger.info(f"Attempting to align date on move lines for moves: {moves_to_update_lines.ids}")
+        # All moves that should have the effective date
+        if processed_moves_to_check:
             # Use sudo() for searching lines in case permissions changed
-            lines_to_update = self.env['stock.move.line'].sudo().search([('move_id', 'in', moves_to_update_lines.ids)])
-            if lines_to_update:
-                # _logger.info(f"Found {len(lines_to_update)} move lines to check/update.")
-                for line in lines_to_update:
-                    # Double check parent move still exists and has the date
-                    if line.move_id.exists() and line.move_id.ths_effective_date:
-                        line_effective_dt_naive = datetime.combine(line.move_id.ths_effective_date, fields.time.min)
-                        line_effective_dt_utc = line_effective_dt_naive
-                        current_line_date_utc = fields.Datetime.to_datetime(line.date)
-                        # Only write if different
-                        if not current_line_date_utc or current_line_date_utc.date() != line.move_id.ths_effective_date:
-                            try:
-                                line.sudo().write({'date': line_effective_dt_utc})
-                                # _logger.info(
-                                # f"Applied effective date {line.move_id.ths_effective_date} to move line {line.id}")
-                            except Exception as e:
-                                _logger.error(f"Error applying effective date to move line {line.id}: {e}")
-                        # else:
-                        #    _logger.debug(f"Move line {line.id} date already matches effective date.")
-                    # else: Skip line if parent move lost its effective date somehow
+            lines_to_update = self.env['stock.move.line'].sudo().search([
+                ('move_id', 'in', processed_moves_to_check.ids),
+            ]).filtered(lambda l: self._is_date_off(l.date, l.move_id.ths_effective_date))
+            self._write_effective_date(lines_to_update, "effective date on move lines",
+                                       effective_date=lambda line: line.move_id.ths_effective_date)
 
         return res_moves
 
+    @staticmethod
+    def _is_date_off(date, effective_date):
+        """ Whether a datetime doesn't fall on the effective date. """
+        current_date_utc = fields.Datetime.to_datetime(date)
+        return not current_date_utc or current_date_utc.date() != effective_date
+
+    @staticmethod
+    def _write_effective_date(records, step, effective_date=lambda move: move.ths_effective_date):
+        """ Set the date of moves or move lines to the start of their effective date, with one write per date.
+            :return: whether any record was written
+        """
+        records_by_date = defaultdict(list)
+        for record in records:
+            records_by_date[effective_date(record)].append(record.id)
+        for date, record_ids in records_by_date.items():
+            effective_datetime_naive = datetime.combine(date, fields.time.min)
+            effective_datetime_utc = effective_datetime_naive
+            try:
+                records.browse(record_ids).sudo().write({'date': effective_datetime_utc})
+            except Exception as e:
+                _logger.error(f"Error applying {step} for {records._name} {record_ids}: {e}")
+        return bool(records_by_date)
+
     # --- Override for JE Header Date ---
     def _prepare_account_move_vals(self, credit_account_id, debit_account_id, journal_id, qty, description, svl_id,
                                    cost):
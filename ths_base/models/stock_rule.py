@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+from collections import defaultdict
+
+from odoo import models, fields, api
+
+
+class StockRule(models.Model):
+    _inherit = 'stock.rule'
+
+    @api.model
+    def _run_buy(self, procurements):
+        # Reordering rules, MTO and purchase scheduling resolve the vendor of the same products over and over:
+        # they are selected in bulk once per run, and passed on as the vendor chosen for the procurement.
+        return super()._run_buy(self._prefill_buy_sellers(procurements))
+
+    @api.model
+    def _prefill_buy_sellers(self, procurements):
+        """
+        Set the vendor _run_buy would select on procurements without one, see ProductProduct._select_seller.
+        Each (product, quantity) is selected once per company, vendor and date, products in bulk.
+        :param procurements: list of (procurement, rule) tuples, as given to _run_buy
+        :return: the same list, procurements with a valid seller having it as supplierinfo_id
+        """
+        requests = []
+        quantities_by_batch = defaultdict(lambda: defaultdict(set))
+        for procurement, rule in procurements:
+            values = procurement.values
+            if values.get('supplierinfo_id') or (values.get('orderpoint_id') and values['orderpoint_id'].supplier_id):
+                requests.append(None)
+                continue
+            batch = (
+                rule.company_id or procurement.company_id,
+                self._get_partner_id(values, rule),
+                max(fields.Datetime.from_string(values['date_planned']).date(), fields.Date.today()),
+            )
+            requests.append((batch, procurement.product_id.id, procurement.product_qty))
+            quantities_by_batch[batch][procurement.product_id.id].add(procurement.product_qty)
+
+        sellers = {}
+        for (company, partner, date), quantities_by_product in quantities_by_batch.items():
+            # a product needed in several quantities is selected once per quantity
+            while quantities_by_product:
+                quantities = {product_id: product_quantities.pop() for product_id, product_quantities in quantities_by_product.items()}
+                products = self.env['product.product'].with_company(company).browse(quantities)
+                for product, seller in products._select_sellers(partner_id=partner, date=date, quantities=quantities).items():
+                    sellers[(company, partner, date), product.id, quantities[product.id]] = seller
+                quantities_by_product = {product_id: product_quantities for product_id, product_quantities in quantities_by_product.items() if product_quantities}
+
+        result = []
+        for (procurement, rule), request in zip(procurements, requests):
+            seller = sellers.get(request) if request else None
+            if seller:
+                procurement = procurement._replace(values=dict(procurement.values, supplierinfo_id=seller))
+            result.append((procurement, rule))
+        return result
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests.common import TransactionCase
+
+
+class TestProductSeller(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.today = fields.Date.today()
+        cls.vendor_1, cls.vendor_2, cls.vendor_3 = cls.env['res.partner'].create([
+            {'name': 'Vendor 1'},
+            {'name': 'Vendor 2'},
+            {'name': 'Vendor 3'},
+        ])
+        cls.product_cheap, cls.product_priority, cls.product_none = cls.env['product.product'].create([
+            {'name': 'Cheap Vendor Product', 'is_storable': True},
+            {'name': 'Priority Vendor Product', 'is_storable': True},
+            {'name': 'No Vendor Product', 'is_storable': True},
+        ])
+        cls.env['product.supplierinfo'].create([
+            {'product_tmpl_id': cls.product_cheap.product_tmpl_id.id, 'partner_id': cls.vendor_1.id, 'price': 10.0},
+            {'product_tmpl_id': cls.product_cheap.product_tmpl_id.id, 'partner_id': cls.vendor_2.id, 'price': 8.0, 'min_qty': 10.0},
+            {'product_tmpl_id': cls.product_cheap.product_tmpl_id.id, 'partner_id': cls.vendor_3.id, 'price': 5.0,
+             'date_end': cls.today + timedelta(days=10)},
+            {'product_tmpl_id': cls.product_priority.product_tmpl_id.id, 'partner_id': cls.vendor_1.id, 'price': 20.0,
+             'sequence': 1, 'ths_manual_priority_vendor': True, 'min_qty': 5.0},
+            {'product_tmpl_id': cls.product_priority.product_tmpl_id.id, 'partner_id': cls.vendor_2.id, 'price': 15.0},
+        ])
+        cls.products = cls.product_cheap | cls.product_priority | cls.product_none
+
+    def test_select_sellers_equivalence(self):
+        """ The bulk selection picks the same sellers as _select_seller. """
+        for partner in (False, self.vendor_1, self.vendor_2):
+            for quantity in (1.0, 5.0, 10.0):
+                for date in (self.today, self.today + timedelta(days=30)):
+                    sellers = self.products._select_sellers(partner_id=partner, quantity=quantity, date=date)
+                    for product in self.products:
+                        self.assertEqual(
+                            sellers[product], product._select_seller(partner_id=partner, quantity=quantity, date=date),
+                            f"Seller of {product.name} for {partner and partner.name}, {quantity} on {date}",
+                        )
+
+        sellers = self.products._select_sellers(quantity=1.0, quantities={self.product_cheap.id: 10.0})
+        self.assertEqual(sellers[self.product_cheap], self.product_cheap._select_seller(quantity=10.0))
+        self.assertEqual(sellers[self.product_priority], self.product_priority._select_seller(quantity=1.0))
+
+    def test_prefill_buy_sellers(self):
+        """ Procurements of a run get the seller _select_seller picks for them, products in several quantities
+        once per quantity, and procurements with a vendor keep it. """
+        rule = self.env.ref('purchase_stock.route_warehouse0_buy').rule_ids[:1]
+        date_planned = fields.Datetime.now()
+        Procurement = self.env['procurement.group'].Procurement
+
+        def procurement(product, quantity, **values):
+            return Procurement(
+                product, quantity, product.uom_id, rule.location_dest_id, product.name, 'test', self.env.company,
+                dict(values, date_planned=date_planned),
+            ), rule
+
+        supplierinfo_vendor_1 = self.product_cheap.seller_ids.filtered(lambda seller: seller.partner_id == self.vendor_1)
+        procurements = [
+            procurement(self.product_cheap, 1.0),
+            procurement(self.product_cheap, 10.0),
+            procurement(self.product_priority, 5.0),
+            procurement(self.product_none, 1.0),
+            procurement(self.product_cheap, 1.0, supplierinfo_id=supplierinfo_vendor_1),
+        ]
+        result = self.env['stock.rule']._prefill_buy_sellers(procurements)
+
+        self.assertEqual([rule for _procurement, rule in result], [rule for _procurement, rule in procurements])
+        for (procurement, _rule), (expected_procurement, _expected_rule) in zip(result[:4], procurements):
+            expected_seller = expected_procurement.product_id._select_seller(
+                quantity=expected_procurement.product_qty, date=self.today)
+            self.assertEqual(procurement.values.get('supplierinfo_id', self.env['product.supplierinfo']), expected_seller)
+        self.assertNotIn('supplierinfo_id', result[3][0].values, "Procurements without a valid seller are left as is")
+        self.assertEqual(result[4][0].values['supplierinfo_id'], supplierinfo_vendor_1)
@@ -14,6 +14,7 @@ This module enhances Odoo's HR functionality by:
 - Adding 'Part Time' and 'External Contractor' options to Employee Type selection.
 - Establishing link between Employee creation and Partner creation/update (setting Partner Type to 'Employee').
 - Providing retroactive actions to create missing locations/accounts/sequences.
+- Scheduled, resumable bulk creation of the missing department and employee items.
 - Defining specific HR User and Manager groups for security.
     """,
     'author': 'Techouse Solutions / Ismail Abdelkhalik',
@@ -40,6 +41,7 @@ This module enhances Odoo's HR functionality by:
         'data/partner_type_data.xml',
         'data/stock_location_data.xml',
         'data/account_analytics_data.xml',
+        'data/ir_cron.xml',
 
         # Views
         'views/partner_type.xml',
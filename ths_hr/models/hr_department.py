@@ -1,12 +1,63 @@
 # -*- coding: utf-8 -*-
 
+from collections import Counter
+
 from odoo import models, fields, api
+from odoo.tools import split_every
 #from odoo.exceptions import UserError, ValidationError
 import logging
 import re  # For sanitizing names
 
 _logger = logging.getLogger(__name__)
 
+# Number of records provisioned per batch (and per commit in scheduled runs)
+PROVISION_BATCH_SIZE = 500
+
+
+def search_existing(model, domain, key):
+    """ Map the records of ``model`` matching ``domain`` by ``key(record)``, keeping the
+    first record of each key as a ``search(..., limit=1)`` on that key would. """
+    existing = {}
+    for record in model.search(domain):
+        existing.setdefault(key(record), record)
+    return existing
+
+
+def provision_in_batches(records, provision, commit=False):
+    """ Run ``provision`` on ``records`` by batches and log the progress.
+
+    A batch that fails is retried record by record, so that a faulty record only
+    skips itself. With ``commit`` (scheduled runs) each batch is committed and
+    reported to the cron: an interrupted run keeps the work done, and as the
+    provisioning only handles what is still missing, the next run resumes there.
+
+    :param provision: function taking a recordset and returning a dict of counts
+    :return: tuple (summed counts, list of error messages)
+    """
+    totals = Counter()
+    errors = []
+    done = 0
+    for batch in split_every(PROVISION_BATCH_SIZE, records.ids, records.browse):
+        try:
+            with records.env.cr.savepoint():
+                totals.update(provision(batch))
+        except Exception as e:
+            _logger.warning("Provisioning of %s %s failed, retrying record by record: %s",
+                            records._name, batch.ids, e)
+            for record in batch:
+                try:
+                    with records.env.cr.savepoint():
+                        totals.update(provision(record))
+                except Exception as e:
+                    _logger.error("Failed to provision %s %s: %s", records._name, record.id, e)
+                    errors.append(f"{record.display_name}: {e}")
+        done += len(batch)
+        _logger.info("Provisioned %s/%s %s records: %s", done, len(records), records._name, dict(totals))
+        if commit:
+            records.env['ir.cron']._notify_progress(done=done, remaining=len(records) - done)
+            records.env.cr.commit()
+    return totals, errors
+
 
 class HrDepartment(models.Model):
     _inherit = 'hr.department'
@@ -54,17 +105,9 @@ class HrDepartment(models.Model):
     def create(self, vals_list):
         """Override create to automatically create sequence, location and analytic account."""
         departments = super(HrDepartment, self).create(vals_list)
-        for department in departments:
-            try:
-                # Use sudo() for cross-model creation/linking consistency
-                department.sudo()._create_department_sequence_if_needed()
-                department.sudo()._create_department_location_if_needed()
-                department.sudo()._create_department_transfer_operation_if_needed()
-                department.sudo()._create_department_analytic_account_if_needed()
-            except Exception as e:
-                _logger.error(
-                    f"Error during post-creation sync for new department {department.name} (ID: {department.id}): {e}")
-                # Don't block department creation, just log the error
+        # Use sudo() for cross-model creation/linking consistency, errors are
+        # logged and don't block department creation
+        provision_in_batches(departments.sudo(), lambda batch: batch._provision_missing_items())
         return departments
 
     def write(self, vals):
@@ -405,6 +448,189 @@ class HrDepartment(models.Model):
             _logger.error("Failed to create analytic account: %s", str(e))
             raise
 
+    # -- Bulk Provisioning --
+    def _provision_missing_items(self):
+        """ Create or link the missing sequences, locations, transfer operations and
+        analytic accounts of the departments in ``self``.
+
+        Each kind of item is looked up with one search and created with one
+        ``create`` for all the departments, departments already linked are left
+        untouched: provisioning again only handles what is still missing.
+
+        :return: dict of the number of items created or linked by kind
+        """
+        counts = {'sequences': self._provision_sequences()}
+        if self.env.context.get('skip_auto_create'):
+            return counts
+        departments = self.filtered('name')
+        counts['locations'] = departments._provision_locations()
+        counts['operations'] = departments._provision_transfer_operations()
+        counts['analytic_accounts'] = departments._provision_analytic_accounts()
+        return counts
+
+    def _provision_sequences(self):
+        """ Bulk version of :meth:`_create_department_sequence_if_needed`. """
+        Sequence = self.env['ir.sequence'].sudo()
+        departments = self
+        if not self.env.context.get('force_create_missing'):
+            departments = departments.filtered(lambda d: d.name and d.code)
+        # Unlink if code is removed
+        departments.filtered(lambda d: not d.code and d.ths_sequence_id).write({'ths_sequence_id': False})
+        departments = departments.filtered('code')
+        if not departments:
+            return 0
+
+        keys = {
+            dept: (f'hr.department.seq.{self._sanitize_code(dept.code)}', dept.company_id.id or self.env.company.id)
+            for dept in departments
+        }
+        sequences = search_existing(Sequence, [
+            ('code', 'in', list({code for code, company_id in keys.values()})),
+            ('company_id', 'in', list({company_id for code, company_id in keys.values()})),
+        ], lambda sequence: (sequence.code, sequence.company_id.id))
+
+        missing = {}
+        for dept, key in keys.items():
+            sanitized_code = self._sanitize_code(dept.code)
+            expected = {
+                'name': f"Department Sequence - {dept.name or sanitized_code}",
+                'prefix': f"{sanitized_code}-",
+            }
+            sequence = sequences.get(key)
+            if sequence:
+                vals_to_write = {fname: value for fname, value in expected.items() if sequence[fname] != value}
+                if vals_to_write:
+                    sequence.write(vals_to_write)
+            elif key not in missing:
+                missing[key] = {
+                    **expected,
+                    'code': key[0],
+                    'padding': 4,
+                    'company_id': key[1],
+                    'implementation': 'no_gap',
+                }
+        if missing:
+            sequences.update(zip(missing, Sequence.create(list(missing.values()))))
+            _logger.info("Created %s department sequences.", len(missing))
+
+        linked = departments.filtered(lambda d: d.ths_sequence_id != sequences[keys[d]])
+        for dept in linked:
+            dept.ths_sequence_id = sequences[keys[dept]]
+        return len(linked)
+
+    def _provision_locations(self):
+        """ Bulk version of :meth:`_create_department_location_if_needed`. """
+        departments = self.filtered(lambda d: d.name and not d.ths_inv_location_id)
+        parent_loc = departments and self._get_department_parent_location()
+        if not parent_loc:
+            return 0
+
+        locations = self.env['stock.location'].sudo().create([{
+            'name': self._sanitize_name(dept.name),
+            'location_id': parent_loc.id,
+            'usage': 'inventory',
+            'company_id': dept.company_id.id,
+        } for dept in departments])
+        for dept, location in zip(departments, locations):
+            dept.ths_inv_location_id = location
+        _logger.info("Created %s department locations.", len(locations))
+        return len(locations)
+
+    def _provision_transfer_operations(self):
+        """ Bulk version of :meth:`_create_department_transfer_operation_if_needed`. """
+        departments = self.filtered(lambda d: d.ths_inv_location_id and not d.ths_transfer_operation_id)
+        if not departments:
+            return 0
+        Sequence = self.env['ir.sequence'].sudo()
+        company_ids = {dept: dept.company_id.id or self.env.company.id for dept in departments}
+
+        keys = {
+            dept: (f"stock.picking.type.intr.{self._sanitize_code(dept.code or 'DEPT')}", company_ids[dept])
+            for dept in departments
+        }
+        sequences = search_existing(Sequence, [
+            ('code', 'in', list({code for code, company_id in keys.values()})),
+            ('company_id', 'in', list(set(company_ids.values()))),
+        ], lambda sequence: (sequence.code, sequence.company_id.id))
+        missing = {}
+        for dept, key in keys.items():
+            if key not in sequences and key not in missing:
+                missing[key] = {
+                    'name': f"Internal Transfer {self._sanitize_name(dept.name)} Sequence",
+                    'code': key[0],
+                    'prefix': f"INTR/{dept.code or 'DEPT'}/%(year)s%(month)s%(day)s",
+                    'padding': 2,
+                    'company_id': key[1],
+                    'implementation': 'no_gap',
+                }
+        if missing:
+            sequences.update(zip(missing, Sequence.create(list(missing.values()))))
+            _logger.info("Created %s transfer operation sequences.", len(missing))
+
+        warehouses = search_existing(
+            self.env['stock.warehouse'],
+            [('company_id', 'in', list(set(company_ids.values())))],
+            lambda warehouse: warehouse.company_id.id,
+        )
+        src_location = self.env.ref('stock.stock_location_stock')
+        departments_to_link = []
+        operation_vals_list = []
+        for dept in departments:
+            warehouse = warehouses.get(company_ids[dept])
+            if not warehouse:
+                _logger.error("No warehouse found for company %s", company_ids[dept])
+                continue
+            departments_to_link.append(dept)
+            operation_vals_list.append({
+                'name': f"{self._sanitize_name(dept.name)} Internal Transfer from Main",
+                'sequence_id': sequences[keys[dept]].id,
+                'code': 'internal',
+                'warehouse_id': warehouse.id,
+                'use_create_lots': False,
+                'use_existing_lots': True,
+                'default_location_src_id': src_location.id,
+                'default_location_dest_id': dept.ths_inv_location_id.id,
+                'company_id': company_ids[dept],
+                'sequence_code': 'INTR',
+                'show_operations': True,
+            })
+
+        operations = self.env['stock.picking.type'].sudo().create(operation_vals_list)
+        for dept, operation in zip(departments_to_link, operations):
+            dept.ths_transfer_operation_id = operation
+        _logger.info("Created %s department transfer operations.", len(operations))
+        return len(operations)
+
+    def _provision_analytic_accounts(self):
+        """ Bulk version of :meth:`_create_department_analytic_account_if_needed`. """
+        departments = self.filtered(lambda d: d.name and not d.ths_analytic_acc_id)
+        analytic_plan = departments and self._get_department_analytic_plan()
+        if not analytic_plan:
+            return 0
+
+        analytic_accounts = self.env['account.analytic.account'].sudo().create([{
+            'name': dept.name,
+            'code': dept.code,
+            'plan_id': analytic_plan.id,
+            'company_id': dept.company_id.id,
+        } for dept in departments])
+        for dept, analytic_account in zip(departments, analytic_accounts):
+            dept.ths_analytic_acc_id = analytic_account
+        _logger.info("Created %s department analytic accounts.", len(analytic_accounts))
+        return len(analytic_accounts)
+
+    def _get_missing_items_domain(self):
+        """ Domain of the departments still missing some of their related items. """
+        return [
+            ('name', '!=', False),
+            ('code', '!=', False),
+            '|', '|', '|',
+            ('ths_sequence_id', '=', False),
+            ('ths_inv_location_id', '=', False),
+            ('ths_transfer_operation_id', '=', False),
+            ('ths_analytic_acc_id', '=', False),
+        ]
+
     # -- Action for Retroactive Creation --
     def action_create_missing_items(self):
         """Single method to handle all missing item creation"""
@@ -413,19 +639,4 @@ class HrDepartment(models.Model):
             self = self.filtered(lambda d: d.name and d.code)  # Manual calls require both fields
 
         _logger.info(f"Starting creation process for {len(self)} departments")
-
-        for dept in self:
-            try:
-                # Sequence depends on code
-                if dept.code or self.env.context.get('force_create_missing'):
-                    dept._create_department_sequence_if_needed()
-
-                # Location/Operation/Analytic depend on name
-                if dept.name or self.env.context.get('force_create_missing'):
-                    dept._create_department_location_if_needed()
-                    dept._create_department_transfer_operation_if_needed()
-                    dept._create_department_analytic_account_if_needed()
-
-            except Exception as e:
-                _logger.error(f"Failed to process department {dept.id}: {e}")
-                continue
+        provision_in_batches(self, lambda batch: batch._provision_missing_items())
@@ -5,6 +5,8 @@ from odoo.exceptions import UserError, ValidationError
 import logging
 import re
 
+from .hr_department import provision_in_batches, search_existing
+
 # Import the external translate library with error handling
 try:
     from translate import Translator
@@ -16,6 +18,12 @@ except ImportError:
 
 _logger = logging.getLogger(__name__)
 
+# Key of the employees queued for related records sync in the cursor precommit data
+RELATED_SYNC_KEY = 'ths_hr.employee_related_sync'
+# Outcomes of the work partner sync, see ``HrEmployee._sync_work_partner_details``
+PARTNER_SYNC_WRITTEN = 'written'
+PARTNER_SYNC_UNCHANGED = 'unchanged'
+
 
 class HrEmployee(models.Model):
     _inherit = ['hr.employee']
@@ -78,12 +86,8 @@ class HrEmployee(models.Model):
     def create(self, vals_list):
         """Override create to trigger related record creation after employee is created."""
         employees = super(HrEmployee, self.with_context(in_employee_create=True)).create(vals_list)
-        for employee in employees:
-            try:
-                employee.sudo()._trigger_related_creation_or_update()
-            except Exception as e:
-                _logger.error(
-                    f"Error during post-creation sync for new employee {employee.name} (ID: {employee.id}): {e}")
+        # errors are logged and don't block employee creation
+        provision_in_batches(employees.sudo(), lambda batch: batch._provision_related_records())
         return employees
 
     def write(self, vals):
@@ -116,6 +120,7 @@ class HrEmployee(models.Model):
 
         res = super(HrEmployee, self).write(vals)
 
+        to_sync = {}
         for employee in self:
             original = originals.get(employee.id)
             if original and not self.env.context.get('in_employee_create'):
@@ -141,39 +146,89 @@ class HrEmployee(models.Model):
                         needs_trigger = True
 
                 if needs_trigger:
-                    try:
-                        employee.sudo()._trigger_related_creation_or_update(original_values=original)
-                    except Exception as e:
-                        _logger.error(
-                            f"Error during post-update sync for employee {employee.name} (ID: {employee.id}): {e}")
+                    to_sync[employee.id] = original
+        if to_sync:
+            self.browse(to_sync)._queue_related_sync(to_sync)
         return res
 
+    # -- Deferred Sync --
+    def _queue_related_sync(self, originals):
+        """ Queue the sync of the related records of the employees in ``self``
+        until the cursor is flushed (at the latest on commit), see
+        :meth:`_flush_related_sync`. An employee written several times in the
+        transaction is synced once, against its values before the first write.
+
+        :param originals: dict ``{employee id: original values}``
+        """
+        data = self.env.cr.precommit.data
+        if RELATED_SYNC_KEY not in data:
+            data[RELATED_SYNC_KEY] = {'originals': {}, 'requested': 0}
+            self.env.cr.precommit.add(self.env['hr.employee'].sudo()._flush_related_sync)
+        queue = data[RELATED_SYNC_KEY]
+        queue['requested'] += len(self)
+        for employee in self:
+            queue['originals'].setdefault(employee.id, originals[employee.id])
+
+    def _flush_related_sync(self):
+        """ Sync the related records of the employees queued by
+        :meth:`_queue_related_sync`, once per employee, and log the writes saved:
+        syncs merged into an earlier one of the same employee, and partner writes
+        skipped as nothing changed (each partner write is broadcast to the POS). """
+        queue = self.env.cr.precommit.data.pop(RELATED_SYNC_KEY, None)
+        if not queue:
+            return
+        employees = self.browse(queue['originals']).exists()
+        partners_unchanged = 0
+        for employee in employees:
+            try:
+                partner_sync = employee._trigger_related_creation_or_update(
+                    original_values=queue['originals'][employee.id])
+                partners_unchanged += partner_sync == PARTNER_SYNC_UNCHANGED
+            except Exception as e:
+                _logger.error(
+                    f"Error during post-update sync for employee {employee.name} (ID: {employee.id}): {e}")
+        self.env.flush_all()
+        merged = queue['requested'] - len(employees)
+        _logger.info(
+            "Synced related records of %s employees for %s queued updates, writes saved: %s "
+            "(%s merged syncs, %s unchanged partners)", len(employees), queue['requested'],
+            merged + partners_unchanged, merged, partners_unchanged)
+
     # -- Trigger Method --
     def _trigger_related_creation_or_update(self, original_values=None):
-        """Central function to orchestrate related record logic."""
+        """Central function to orchestrate related record logic.
+
+        :return: outcome of the work partner sync, see :meth:`_sync_work_partner_details`
+        """
         self.ensure_one()
         original_values = original_values or {}
 
         # Sync Partner Type, Ref, and Common Fields
-        self._sync_work_partner_details()
+        partner_sync = self._sync_work_partner_details()
 
         # Location (depends on name, department)
         self._create_or_update_employee_location(original_values)
 
         # Analytic Account (depends on name, department code)
         self._create_or_update_employee_analytic_account(original_values)
+        return partner_sync
 
     # -- Partner Sync Method --
     def _sync_work_partner_details(self):
         """ Set Partner Type, Ref, and common fields on the work_contact_id partner.
         FIXED: Employee ALWAYS overrides partner values.
+
+        :return: ``PARTNER_SYNC_WRITTEN`` if the partner was written,
+            ``PARTNER_SYNC_UNCHANGED`` if the write was skipped as the partner
+            already had the employee values, False if there is no work partner
+            or the write failed
         """
         self.ensure_one()
         work_partner = self.work_contact_id
 
         if not work_partner:
             _logger.debug(f"Emp {self.id} ({self.name}): No work contact partner. Skipping partner sync.")
-            return
+            return False
 
         partner_vals_to_write = {}
         target_partner_type = None
@@ -251,14 +306,30 @@ class HrEmployee(models.Model):
                 _logger.warning("Sequence 'ths_hr.seq_partner_ref_employee' not found. Cannot set partner ref.")
 
         # --- 6. Write changes to Partner ---
+        # Only the values that differ: partner writes are broadcast to the POS
+        partner_vals_to_write = {
+            fname: value for fname, value in partner_vals_to_write.items()
+            if self._partner_value_differs(work_partner, fname, value)
+        }
         if partner_vals_to_write:
             try:
                 work_partner.sudo().write(partner_vals_to_write)
                 _logger.debug(
                     f"Emp {self.id}: Synced work partner '{work_partner.name}' (ID: {work_partner.id}) with values: {partner_vals_to_write}")
+                return PARTNER_SYNC_WRITTEN
             except Exception as e:
                 _logger.error(
                     f"Emp {self.id}: Failed to sync work partner {work_partner.name} (ID: {work_partner.id}): {e}")
+                return False
+        return PARTNER_SYNC_UNCHANGED
+
+    @staticmethod
+    def _partner_value_differs(partner, fname, value):
+        """ Whether writing ``value`` (as in a write dict) on ``partner`` would change ``fname``. """
+        current = partner[fname]
+        if isinstance(current, models.BaseModel):
+            current = current.id
+        return (current or False) != (value or False)
 
     # -- Location Methods --
     def _create_or_update_employee_location(self, original_values=None):
@@ -397,6 +468,131 @@ class HrEmployee(models.Model):
             _("The 'Employees' Analytic Plan (ths_hr.ths_analytic_plan_employees) is missing. Please ensure the ths_hr module data is loaded correctly."))
         return analytic_plan
 
+    # -- Bulk Provisioning --
+    def _provision_related_records(self):
+        """ Bulk version of :meth:`_trigger_related_creation_or_update` without original values.
+
+        The work partners are synced, then the loss locations and analytic
+        accounts of all the employees are looked up with one search per model,
+        linked when found and created with one ``create`` otherwise, and the
+        already linked ones are realigned with the employee name and department.
+
+        :return: dict of the number of items created or linked by kind
+        """
+        for employee in self:
+            employee._sync_work_partner_details()
+        employees = self.filtered('name')
+        return {
+            'locations': employees._provision_locations(),
+            'analytic_accounts': employees._provision_analytic_accounts(),
+        }
+
+    def _provision_locations(self):
+        """ Bulk version of :meth:`_create_or_update_employee_location`. """
+        Location = self.env['stock.location'].sudo()
+        self.department_id.filtered(lambda d: not d.ths_inv_location_id).sudo()._provision_locations()
+        fallback_parent = self.sudo().env.ref('ths_hr.ths_stock_location_departments_view', raise_if_not_found=False)
+
+        keys = {}
+        for employee in self:
+            parent_location = employee.department_id.ths_inv_location_id if employee.department_id else fallback_parent
+            if not parent_location:
+                if employee.department_id:
+                    raise UserError(
+                        _("Could not determine the parent location for department '%s'. Please check the department configuration.",
+                          employee.department_id.display_name))
+                _logger.error("Fallback parent location 'ths_hr.ths_stock_location_departments_view' not found.")
+                continue
+            keys[employee] = (
+                f"{self._sanitize_name(employee.name)} - Location",
+                parent_location.id,
+                employee.company_id.id or self.env.company.id,
+            )
+
+        to_link = {employee: key for employee, key in keys.items() if not employee.ths_inv_loss_loc_id}
+        if to_link:
+            names, parent_ids, company_ids = (list(set(values)) for values in zip(*to_link.values()))
+            locations = search_existing(Location, [
+                ('name', 'in', names),
+                ('location_id', 'in', parent_ids),
+                ('usage', '=', 'inventory'),
+                ('company_id', 'in', company_ids),
+            ], lambda location: (location.name, location.location_id.id, location.company_id.id))
+            missing = [key for key in dict.fromkeys(to_link.values()) if key not in locations]
+            if missing:
+                locations.update(zip(missing, Location.create([
+                    {'name': name, 'usage': 'inventory', 'location_id': parent_id, 'company_id': company_id}
+                    for name, parent_id, company_id in missing
+                ])))
+                _logger.info("Created %s employee locations.", len(missing))
+            for employee, key in to_link.items():
+                employee.ths_inv_loss_loc_id = locations[key]
+
+        for employee, (loc_name, parent_id, company_id) in keys.items():
+            if employee in to_link:
+                continue
+            current_loc = employee.ths_inv_loss_loc_id
+            vals_to_write = {}
+            if current_loc.name != loc_name:
+                vals_to_write['name'] = loc_name
+            if employee.department_id and current_loc.location_id.id != parent_id:
+                vals_to_write['location_id'] = parent_id
+            if vals_to_write:
+                current_loc.sudo().write(vals_to_write)
+        return len(to_link)
+
+    def _provision_analytic_accounts(self):
+        """ Bulk version of :meth:`_create_or_update_employee_analytic_account`. """
+        AnalyticAccount = self.env['account.analytic.account'].sudo()
+        analytic_plan = self and self._get_employee_analytic_plan()
+        if not analytic_plan:
+            return 0
+
+        keys = {
+            employee: (
+                f"{employee.department_id.code if employee.department_id else 'NODEP'} - {self._sanitize_name(employee.name)}",
+                employee.company_id.id or self.env.company.id,
+            )
+            for employee in self
+        }
+        to_link = {employee: key for employee, key in keys.items() if not employee.ths_analytic_acc_id}
+        if to_link:
+            names, company_ids = (list(set(values)) for values in zip(*to_link.values()))
+            accounts = search_existing(AnalyticAccount, [
+                ('name', 'in', names),
+                ('plan_id', '=', analytic_plan.id),
+                ('company_id', 'in', company_ids),
+            ], lambda account: (account.name, account.company_id.id))
+            missing = [key for key in dict.fromkeys(to_link.values()) if key not in accounts]
+            if missing:
+                accounts.update(zip(missing, AnalyticAccount.create([
+                    {'name': acc_name, 'plan_id': analytic_plan.id, 'company_id': company_id}
+                    for acc_name, company_id in missing
+                ])))
+                _logger.info("Created %s employee analytic accounts.", len(missing))
+            for employee, key in to_link.items():
+                employee.ths_analytic_acc_id = accounts[key]
+
+        for employee, (acc_name, company_id) in keys.items():
+            if employee not in to_link and employee.ths_analytic_acc_id.name != acc_name:
+                employee.ths_analytic_acc_id.sudo().write({'name': acc_name})
+        return len(to_link)
+
+    def _get_missing_items_domain(self):
+        """ Domain of the employees still missing some of their related items. """
+        return [('name', '!=', False), '|', ('ths_inv_loss_loc_id', '=', False), ('ths_analytic_acc_id', '=', False)]
+
+    @api.model
+    def _cron_provision_missing_items(self):
+        """ Provision the departments, then the employees, still missing related
+        items. Each batch is committed, so an interrupted run (e.g. on timeout)
+        resumes with the records left on the next run. """
+        Department = self.env['hr.department'].sudo()
+        departments = Department.search(Department._get_missing_items_domain())
+        provision_in_batches(departments, lambda batch: batch._provision_missing_items(), commit=True)
+        employees = self.sudo().search(self._get_missing_items_domain())
+        provision_in_batches(employees, lambda batch: batch._provision_related_records(), commit=True)
+
     # -- Action for Retroactive Creation --
     def action_create_missing_emp_locations_accounts(self):
         employees_to_process = self.sudo()
@@ -406,26 +602,14 @@ class HrEmployee(models.Model):
             employees_to_process = self.sudo().search([])
         _logger.info(
             f"Starting retroactive creation/linking for {len(employees_to_process)} employees.")
-        count_loc = 0
-        count_acc = 0
-        processed_ids = set()
-        errors = []
-        for employee in employees_to_process:
-            if employee.id in processed_ids: continue
-            processed_ids.add(employee.id)
-            try:
-                employee._trigger_related_creation_or_update()
-                if employee.ths_inv_loss_loc_id: count_loc += 1
-                if employee.ths_analytic_acc_id: count_acc += 1
-            except Exception as e:
-                _logger.error(
-                    f"Retroactive: Error processing employee {employee.name} (ID: {employee.id}): {e}")
-                errors.append(
-                    f"Employee {employee.name}: {e}")
+        counts, errors = provision_in_batches(
+            employees_to_process, lambda batch: batch._provision_related_records())
+        count_loc = counts['locations']
+        count_acc = counts['analytic_accounts']
         _logger.info(
-            f"Retroactive processing finished. Employees checked: {len(processed_ids)}. Locations linked: {count_loc}. Accounts linked: {count_acc}.")
+            f"Retroactive processing finished. Employees checked: {len(employees_to_process)}. Locations linked: {count_loc}. Accounts linked: {count_acc}.")
         message = _("Checked %s employees. Loss Locations created/linked: %s. Analytic Accounts created/linked: %s.",
-                    len(processed_ids), count_loc, count_acc)
+                    len(employees_to_process), count_loc, count_acc)
         if errors: message += _("\nErrors encountered:\n%s", "\n".join(errors))
         if self.env.context.get('active_model') == 'hr.employee': return {'type': 'ir.actions.client',
                                                                           'tag': 'display_notification',
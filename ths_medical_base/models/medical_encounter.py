@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+from collections import Counter, defaultdict
 from datetime import timedelta
 
 from odoo import models, fields, api, _, Command
@@ -11,6 +12,9 @@ from odoo.tools import format_date
 
 _logger = logging.getLogger(__name__)
 
+# Payment status recomputes per database in this process, see ``_get_payment_status_stats``
+_PAYMENT_STATUS_STATS = defaultdict(Counter)
+
 
 class ThsMedicalEncounter(models.Model):
 	""" Represents a single clinical encounter/visit. """
@@ -84,7 +88,8 @@ class ThsMedicalEncounter(models.Model):
 	state = fields.Selection([
 		('in_progress', 'In Progress'),
 		('done', 'Done')
-	], string='Status', default='in_progress', index=True, tracking=True, copy=False)
+	], string='Status', default='in_progress', index=True, tracking=True, copy=False,
+		compute='_compute_payment_status', store=True, readonly=False)
 
 	appointment_ids = fields.One2many(
 		'calendar.event',
@@ -206,21 +211,53 @@ class ThsMedicalEncounter(models.Model):
 
 	@api.depends('pending_pos_items.sub_total', 'pending_pos_items.state')
 	def _compute_payment_status(self):
-		"""  Compute payment status from Pending items  """
-		for encounter in self:
-			# Calculate from Pending Service Items
-			paid_lines = encounter.pending_pos_items.filtered(lambda o: o.state == 'processed')
-			pending_lines = encounter.pending_pos_items.filtered(lambda o: o.state == 'pending')
+		"""  Compute payment status from Pending items, aggregated in a single query for the whole batch  """
+		stored = self.filtered('id')
+		_PAYMENT_STATUS_STATS[self.env.cr.dbname]['computed'] += len(stored)
+
+		totals = defaultdict(float)
+		if stored:
+			for encounter, state, sub_total in self.env['ths.pending.pos.item']._read_group(
+					domain=[('encounter_id', 'in', stored.ids), ('state', 'in', ['pending', 'processed'])],
+					groupby=['encounter_id', 'state'], aggregates=['sub_total:sum']):
+				totals[encounter.id, state] = sub_total
+
+		for encounter in self - stored:
+			# New records (onchange) are not in the database yet, sum their lines in memory
+			for item in encounter.pending_pos_items:
+				totals[encounter.id, item.state] += item.sub_total
 
-			encounter.paid_amount = sum(paid_lines.mapped('sub_total'))
-			encounter.pending_amount = sum(pending_lines.mapped('sub_total'))
+		for encounter in self:
+			encounter.paid_amount = totals[encounter.id, 'processed']
+			encounter.pending_amount = totals[encounter.id, 'pending']
 			encounter.pending_payments = encounter.pending_amount > 0
+			# Update encounter state based on payments, this compute owns the field so no write() is involved
+			encounter.state = 'in_progress' if encounter.pending_payments else 'done'
 
-			# Update encounter state based on payments
-			if encounter.pending_payments:
-				encounter.state = 'in_progress'
-			else:
-				encounter.state = 'done'
+	def _mark_payment_status_dirty(self):
+		"""
+		Queue these encounters for payment-status recompute instead of computing them eagerly.
+		Marked encounters are recomputed once, together, when the ORM flushes or when the payment
+		fields are read, so repeated marks within a transaction collapse into a single computation.
+		"""
+		if not self:
+			return
+		already_dirty = self & self.env.records_to_compute(self._fields['pending_amount'])
+		stats = _PAYMENT_STATUS_STATS[self.env.cr.dbname]
+		stats['marked'] += len(self)
+		stats['already_marked'] += len(already_dirty)
+		for fname in ('pending_amount', 'paid_amount', 'pending_payments', 'state'):
+			self.env.add_to_compute(self._fields[fname], self - already_dirty)
+
+	@api.model
+	def _get_payment_status_stats(self):
+		"""
+		Counters of the payment status recomputes of this database in this process: encounters
+		marked by _mark_payment_status_dirty, those already marked among them, and encounters
+		actually recomputed. Recomputes avoided are the marks that did not lead to a recompute.
+		"""
+		stats = _PAYMENT_STATUS_STATS[self.env.cr.dbname]
+		return dict(stats, avoided=max(stats['marked'] - stats['computed'], 0))
 
 	@api.model
 	def _find_or_create_daily_encounter(
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+from odoo.tests.common import TransactionCase
+
+
+class TestMedicalEncounter(TransactionCase):
+
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		cls.encounter = cls.env['ths.medical.base.encounter'].create({
+			'partner_id': cls.env['res.partner'].create({'name': 'Patient'}).id,
+		})
+
+	def test_payment_status_recompute_deduplicated(self):
+		""" Encounters marked several times are recomputed once, and the marks avoided are counted. """
+		Encounter = self.env['ths.medical.base.encounter']
+		self.env.flush_all()
+		stats = Encounter._get_payment_status_stats()
+
+		for _i in range(3):
+			self.encounter._mark_payment_status_dirty()
+		self.assertEqual(self.encounter.state, 'done')
+
+		new_stats = Encounter._get_payment_status_stats()
+		self.assertEqual(new_stats['marked'] - stats.get('marked', 0), 3)
+		self.assertEqual(new_stats['already_marked'] - stats.get('already_marked', 0), 2)
+		self.assertEqual(new_stats['computed'] - stats.get('computed', 0), 1)
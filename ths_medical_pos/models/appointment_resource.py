@@ -34,4 +34,15 @@ class AppointmentResource(models.Model):
 	def _trigger_pos_sync(self, operation='update'):
 		"""Trigger POS sync for appointment resource updates - PERIODIC MODEL"""
 		# Note: This is a periodic model, sync will be handled by periodic batch sync
-		pass
\ No newline at end of file
+		pass
+
+	# --- POS Roster ---
+	@api.model
+	def _get_pos_roster(self):
+		"""Return the active (practitioners, rooms), fetched with a single search"""
+		resources = self.search([
+			('ths_resource_category', 'in', ['practitioner', 'location']),
+			('active', '=', True)
+		])
+		practitioners = resources.filtered(lambda r: r.ths_resource_category == 'practitioner')
+		return practitioners, resources - practitioners
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+from collections import defaultdict
+
 from odoo import models, api
 
 import logging
@@ -75,9 +77,7 @@ class ThsPendingPosItem(models.Model):
 		""" Override to link items to daily encounters """
 		items = super().create(vals_list)
 
-		encounters = items.mapped('encounter_id')
-		if encounters:
-			encounters._compute_payment_status()
+		items.mapped('encounter_id')._mark_payment_status_dirty()
 
 		items._trigger_pos_sync('create')
 		return items
@@ -85,16 +85,40 @@ class ThsPendingPosItem(models.Model):
 	def write(self, vals):
 		""" Track state changes to update encounter status """
 		result = super().write(vals)
+		if self.env.context.get('ths_defer_pending_item_sync'):
+			# Bulk operations recompute encounters and sync once for the whole batch
+			return result
 
 		# If state changed, update encounter payment status
 		if 'state' in vals:
-			encounters = self.mapped('encounter_id')
-			if encounters:
-				encounters._compute_payment_status()
+			self.mapped('encounter_id')._mark_payment_status_dirty()
 
 		self._trigger_pos_sync('update')
 		return result
 
+	def _link_pos_order_lines(self, line_by_item):
+		"""
+		Bulk link pending items to POS order lines ({item_id: line_id}).
+		Items are grouped per target line and written with the per-write side effects deferred, so the
+		ORM flushes them in a single UPDATE; encounter payment status is then queued once per
+		encounter and a single sync message is sent for the whole batch.
+		"""
+		if not self:
+			return True
+
+		items_by_line = defaultdict(list)
+		for item in self:
+			items_by_line[line_by_item[item.id]].append(item.id)
+
+		deferred_items = self.with_context(ths_defer_pending_item_sync=True)
+		for line_id, item_ids in items_by_line.items():
+			deferred_items.browse(item_ids).write({'pos_order_line_id': line_id})
+		self.flush_recordset(['pos_order_line_id'])
+
+		self.mapped('encounter_id')._mark_payment_status_dirty()
+		self._trigger_pos_sync('update')
+		return True
+
 	def unlink(self):
 		"""Override unlink to trigger sync"""
 		self._trigger_pos_sync('delete')
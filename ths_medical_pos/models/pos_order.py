@@ -88,17 +88,23 @@ class PosOrder(models.Model):
 		encounter_was_new = False
 
 		if partner_id:
-			# Use existing unified method from medical_encounter
-			encounter = self.env['ths.medical.base.encounter']._find_or_create_daily_encounter(partner_id)
+			# Resolve today's encounter with an indexed lookup, only falling back to the
+			# unified find-or-create method from medical_encounter when there is none
+			encounter_date = fields.Date.context_today(self)
+			encounter = self._get_daily_encounter(partner_id, encounter_date)
+			if encounter:
+				# Check if this encounter was newly created (for cleanup tracking)
+				existing_orders_count = self.env['pos.order'].search_count([
+					('encounter_id', '=', encounter.id),
+					('state', 'in', ['paid', 'done', 'invoiced'])
+				])
+				encounter_was_new = existing_orders_count == 0
+			else:
+				encounter = self.env['ths.medical.base.encounter']._find_or_create_daily_encounter(
+					partner_id, [], encounter_date)
+				encounter_was_new = True
 			encounter_id = encounter.id
 
-			# Check if this encounter was newly created (for cleanup tracking)
-			existing_orders_count = self.env['pos.order'].search_count([
-				('encounter_id', '=', encounter.id),
-				('state', 'in', ['paid', 'done', 'invoiced'])
-			])
-			encounter_was_new = existing_orders_count == 0
-
 			# Add encounter_id to order data for processing
 			order['encounter_id'] = encounter_id
 			order['encounter_created_by_pos'] = encounter_was_new
@@ -205,20 +211,30 @@ class PosOrder(models.Model):
 			PendingItem = self.env['ths.pending.pos.item']
 			pending_items = PendingItem.sudo().search([('id', 'in', pending_item_ids)])
 
-			for item in pending_items:
-				if item.state == 'pending':
-					try:
-						item.write({
-							'pos_order_line_id': pending_items_to_link[item.id]['line_id'],
-						})
-						_logger.info(
-							f"Linked pending item {item.id} to POS line {pending_items_to_link[item.id]['line_id']}")
-					except Exception as e:
-						_logger.error(f"Failed to link Pending Item {item.id} to POS Order {pos_order.name}: {e}")
-						pos_order.note = (pos_order.note or '') + f"\nError linking pending item {item.id}: {e}"
-				else:
+			items_to_link = pending_items.filtered(lambda i: i.state == 'pending')
+			for item in pending_items - items_to_link:
+				_logger.warning(
+					f"Pending Item {item.id} state is '{item.state}', expected 'pending'. Skipping linking.")
+
+			if items_to_link:
+				line_by_item = {item_id: link['line_id'] for item_id, link in pending_items_to_link.items()}
+				try:
+					with self.env.cr.savepoint():
+						items_to_link._link_pos_order_lines(line_by_item)
+					_logger.info(
+						f"Linked pending items {items_to_link.ids} to POS Order {pos_order.name} lines")
+				except Exception as e:
+					# Retry item by item, so that a faulty item only skips itself
 					_logger.warning(
-						f"Pending Item {item.id} state is '{item.state}', expected 'pending'. Skipping linking.")
+						f"Failed to link Pending Items {items_to_link.ids} to POS Order {pos_order.name}, retrying item by item: {e}")
+					for item in items_to_link:
+						try:
+							with self.env.cr.savepoint():
+								item._link_pos_order_lines(line_by_item)
+							_logger.info(f"Linked pending item {item.id} to POS line {line_by_item[item.id]}")
+						except Exception as e:
+							_logger.error(f"Failed to link Pending Item {item.id} to POS Order {pos_order.name}: {e}")
+							pos_order.note = (pos_order.note or '') + f"\nError linking pending item {item.id}: {e}"
 
 		return order_id
 
@@ -297,6 +313,16 @@ class PosOrder(models.Model):
 			'patient_ids': [(6, 0, [partner_id])],  # In base medical, partner is the patient
 		}
 
+	@api.model
+	def _get_daily_encounter(self, partner_id, encounter_date=None):
+		"""
+		Return the encounter of the owner for the given date (today by default), or an empty recordset.
+		Shared by order sync and the new-order popup, the lookup is an indexed search on (owner, date).
+		"""
+		encounter_date = encounter_date or fields.Date.context_today(self)
+		return self.env['ths.medical.base.encounter'].sudo().search(
+			self._get_encounter_domain(partner_id, encounter_date), limit=1)
+
 # TODO: Add encounter status synchronization with order states
 # TODO: Add encounter analytics for POS integration
 # TODO: Add encounter-based commission calculations
\ No newline at end of file
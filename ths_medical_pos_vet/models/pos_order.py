@@ -1,6 +1,4 @@
 # -*- coding: utf-8 -*-
-from datetime import date
-
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError, ValidationError
 import logging
@@ -96,11 +94,7 @@ class PosOrder(models.Model):
 				return False  # Not a pet owner, use standard flow
 
 			# Check for existing encounter today
-			today = date.today()
-			existing_encounter = self.env['ths.medical.base.encounter'].search([
-				('ths_pet_owner_id', '=', partner_id),
-				('encounter_date', '=', today)
-			], limit=1)
+			existing_encounter = self._get_daily_encounter(partner_id)
 
 			# Get pet owner's pets
 			pets = self.env['res.partner'].search([
@@ -110,17 +104,8 @@ class PosOrder(models.Model):
 				('ths_deceased', '=', False)
 			])
 
-			# Get available practitioners
-			practitioners = self.env['appointment.resource'].search([
-				('ths_resource_category', '=', 'practitioner'),
-				('active', '=', True)
-			])
-
-			# Get available rooms
-			rooms = self.env['appointment.resource'].search([
-				('ths_resource_category', '=', 'location'),
-				('active', '=', True)
-			])
+			# Get available practitioners and rooms, fetched with a single search
+			practitioners, rooms = self.env['appointment.resource']._get_pos_roster()
 
 			# Format pets with species information
 			pets_data = []
@@ -178,11 +163,8 @@ class PosOrder(models.Model):
 				raise UserError(_("Partner ID is required"))
 
 			# Find or create today's encounter
-			today = date.today()
-			encounter = self.env['ths.medical.base.encounter'].search([
-				('ths_pet_owner_id', '=', partner_id),
-				('encounter_date', '=', today)
-			], limit=1)
+			today = fields.Date.context_today(self)
+			encounter = self._get_daily_encounter(partner_id, today)
 
 			encounter_vals = {
 				'patient_ids': [(6, 0, selected_pets)] if selected_pets else [(5,)],
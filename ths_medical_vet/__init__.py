@@ -1,3 +1,18 @@
 # -*- coding: utf-8 -*-
 from . import models, wizard
 # from . import data # Data is loaded via manifest
+
+
+def uninstall_hook(env):
+	""" Drop the database functions maintaining the medical history summary and
+	the pet membership coverage, with the triggers using them: they would
+	outlive the tables of the module. """
+	env.cr.execute("""
+		SELECT oid::regprocedure::text
+		  FROM pg_proc
+		 WHERE pronamespace = current_schema()::regnamespace
+		   AND (proname LIKE 'vet\\_medical\\_history\\_summary\\_%'
+				OR proname LIKE 'vet\\_pet\\_membership\\_coverage\\_%')
+	""")
+	for (function,) in env.cr.fetchall():
+		env.cr.execute(f"DROP FUNCTION IF EXISTS {function} CASCADE")
@@ -21,6 +21,7 @@
 		'data/ir_sequence.xml',
 		'data/partner_type_data.xml',
 		'data/product_sub_type_data.xml',
+		'data/vaccination_cron.xml',
 		'views/boarding.xml',
 		'views/pending_pos_items.xml',
 		'views/calendar_event.xml',
@@ -43,6 +44,7 @@
 			'ths_medical_vet/static/src/style.scss',
 		],
 	},
+	'uninstall_hook': 'uninstall_hook',
 	'installable': True,
 	'application': False,
 	'auto_install': False,
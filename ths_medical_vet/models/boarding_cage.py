@@ -54,3 +54,9 @@ class VetBoardingCage(models.Model):
             stay = stays_by_cage.get(cage.id)
             cage.current_stay_id = stay.id if stay else False
             cage.current_occupant_display = f"{stay.pet_id.name} ({stay.name})" if stay and stay.pet_id else ""
+
+    @api.model
+    def get_free_cages(self, start, end):
+        """ Active cages, not under maintenance, with no scheduled or checked-in stay overlapping [start, end) """
+        busy_cage_ids = self.env['vet.boarding.stay']._get_cage_occupancy(start, end).keys()
+        return self.search([('id', 'not in', list(busy_cage_ids)), ('state', '!=', 'maintenance')])
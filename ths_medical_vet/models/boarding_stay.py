@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+from collections import defaultdict
 
 from odoo import models, fields, api, _, Command
 from odoo.exceptions import UserError, ValidationError
@@ -7,6 +8,11 @@ import logging
 
 _logger = logging.getLogger(__name__)
 
+# Stay states that hold a cage for their check-in/expected check-out period
+CAGE_BLOCKING_STATES = ('scheduled', 'checked_in')
+# Period of a stay as a half-open range, matching the GiST index created in init()
+_STAY_PERIOD = "tsrange({table}.check_in_datetime, {table}.expected_check_out_datetime, '[)')"
+
 
 class VetBoardingStay(models.Model):
 	_name = 'vet.boarding.stay'
@@ -202,33 +208,63 @@ class VetBoardingStay(models.Model):
 
 	@api.constrains('cage_id', 'state', 'check_in_datetime', 'expected_check_out_datetime')
 	def _check_cage_availability_overlap(self):
-		"""Ensure no overlapping stays in the same cage"""
-		for stay in self.filtered(lambda s: s.state in ('scheduled', 'checked_in')):
-			if not stay.cage_id:
-				continue
-
-			# Check for overlapping stays
-			domain = [
-				('cage_id', '=', stay.cage_id.id),
-				('state', 'in', ['scheduled', 'checked_in']),
-				('id', '!=', stay.id),
-			]
-
-			# Add date overlap conditions
-			if stay.check_in_datetime and stay.expected_check_out_datetime:
-				domain.extend([
-					'|',
-					'&', ('check_in_datetime', '<=', stay.check_in_datetime),
-					('expected_check_out_datetime', '>', stay.check_in_datetime),
-					'&', ('check_in_datetime', '<', stay.expected_check_out_datetime),
-					('expected_check_out_datetime', '>=', stay.expected_check_out_datetime),
-				])
+		"""Ensure no overlapping stays in the same cage, checked for the whole batch in one range-indexed query"""
+		stays = self.filtered(lambda s: s.state in CAGE_BLOCKING_STATES and s.cage_id)
+		if not stays:
+			return
+
+		# Ranges are built on check-in/check-out, so make sure they are valid before querying them
+		stays._check_dates()
+		self.flush_model(['cage_id', 'state', 'check_in_datetime', 'expected_check_out_datetime'])
+		self.env.cr.execute(f"""
+			SELECT stay.id
+			  FROM vet_boarding_stay stay
+			  JOIN vet_boarding_stay other
+			    ON other.cage_id = stay.cage_id
+			   AND other.id != stay.id
+			   AND other.state IN %s
+			   AND {_STAY_PERIOD.format(table='other')} && {_STAY_PERIOD.format(table='stay')}
+			 WHERE stay.id IN %s
+			 LIMIT 1
+		""", [CAGE_BLOCKING_STATES, tuple(stays.ids)])
+		row = self.env.cr.fetchone()
+		if row:
+			raise ValidationError(
+				_("Cage %s is already booked during this period.", self.browse(row[0]).cage_id.name)
+			)
 
-			overlapping = self.search_count(domain)
-			if overlapping:
-				raise ValidationError(
-					_("Cage %s is already booked during this period.", stay.cage_id.name)
-				)
+	@api.model
+	def _get_cage_occupancy(self, start, end, cage_ids=None):
+		"""
+		Occupancy timeline of [start, end) read from the range index:
+		{cage_id: [(check_in, expected_check_out, stay_id), ...]} sorted by check-in.
+		"""
+		self.flush_model(['cage_id', 'state', 'check_in_datetime', 'expected_check_out_datetime'])
+		query = f"""
+			SELECT cage_id, check_in_datetime, expected_check_out_datetime, id
+			  FROM vet_boarding_stay
+			 WHERE state IN %s
+			   AND {_STAY_PERIOD.format(table='vet_boarding_stay')} && tsrange(%s, %s, '[)')
+		"""
+		params = [CAGE_BLOCKING_STATES, fields.Datetime.to_datetime(start), fields.Datetime.to_datetime(end)]
+		if cage_ids is not None:
+			query += " AND cage_id IN %s"
+			params.append(tuple(cage_ids) or (None,))
+		self.env.cr.execute(query + " ORDER BY cage_id, check_in_datetime NULLS FIRST", params)
+
+		occupancy = defaultdict(list)
+		for cage_id, check_in, check_out, stay_id in self.env.cr.fetchall():
+			occupancy[cage_id].append((check_in, check_out, stay_id))
+		return dict(occupancy)
+
+	def init(self):
+		super().init()
+		# Range index backing the cage overlap check and the occupancy timeline
+		self.env.cr.execute("""
+			CREATE INDEX IF NOT EXISTS vet_boarding_stay_cage_period_idx
+			    ON vet_boarding_stay USING gist (tsrange(check_in_datetime, expected_check_out_datetime, '[)'))
+			 WHERE state IN ('scheduled', 'checked_in')
+		""")
 
 	# CRUD methods
 	@api.model_create_multi
@@ -268,6 +304,7 @@ class VetBoardingStay(models.Model):
 		res = super(VetBoardingStay, self).write(vals)
 
 		# Handle state/cage changes
+		cages_to_free = self.env['vet.boarding.cage']
 		for stay in self:
 			old_cage = old_data[stay.id]['cage_id']
 			old_state = old_data[stay.id]['state']
@@ -288,16 +325,7 @@ class VetBoardingStay(models.Model):
 
 			# State changed FROM checked_in
 			elif old_state == 'checked_in' and stay.state != 'checked_in':
-				cage_to_free = old_cage or stay.cage_id
-				if cage_to_free:
-					# Check no other stays are using this cage
-					other_stays = self.search_count([
-						('cage_id', '=', cage_to_free.id),
-						('state', '=', 'checked_in'),
-						('id', '!=', stay.id)
-					])
-					if not other_stays:
-						cage_to_free.sudo().write({'state': 'available'})
+				cages_to_free |= old_cage or stay.cage_id
 
 				# Set checkout time if checking out
 				if stay.state == 'checked_out' and not stay.actual_check_out_datetime:
@@ -316,6 +344,14 @@ class VetBoardingStay(models.Model):
 				if old_cage:
 					old_cage.sudo().write({'state': 'available'})
 
+		if cages_to_free:
+			# Free the cages no other stay is still checked into, with one grouped lookup
+			occupied_cages = self.env['vet.boarding.stay'].sudo()._read_group(
+				[('cage_id', 'in', cages_to_free.ids), ('state', '=', 'checked_in')], ['cage_id'])
+			for cage, in occupied_cages:
+				cages_to_free -= cage
+			cages_to_free.sudo().write({'state': 'available'})
+
 		return res
 
 	# Actions
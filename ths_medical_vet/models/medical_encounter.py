@@ -111,6 +111,26 @@ class ThsMedicalBaseEncounter(models.Model):
 	# 	store=True,
 	# )
 
+	# --- MEDICAL HISTORY SUMMARY ---
+	# Encounter count and last visit of the pets are summarized in the medical history
+	@api.model_create_multi
+	def create(self, vals_list):
+		encounters = super().create(vals_list)
+		self.env['vet.medical.history.summary']._mark_pets_dirty(encounters.patient_ids.ids)
+		return encounters
+
+	def write(self, vals):
+		summarized = {'encounter_date', 'patient_ids'} & set(vals)
+		pet_ids = set(self.patient_ids.ids) if summarized else set()
+		res = super().write(vals)
+		if summarized:
+			self.env['vet.medical.history.summary']._mark_pets_dirty(pet_ids | set(self.patient_ids.ids))
+		return res
+
+	def unlink(self):
+		self.env['vet.medical.history.summary']._mark_pets_dirty(self.patient_ids.ids)
+		return super().unlink()
+
 	@api.depends('partner_id')
 	def _compute_patient_domain(self):
 		"""Compute domain for pets based on selected owner"""
@@ -1,33 +1,88 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields
+from odoo import api, models, fields
+from odoo.tools import SQL
+from odoo.tools.sql import table_kind, TableKind
+
+# Tables of this module whose changes alter the summary of some pets, with the
+# query giving these pets out of the changed rows and the columns whose update
+# matters. Changes to partners and encounters are tracked by the ORM instead,
+# see ``_mark_pets_dirty``.
+SUMMARY_TRIGGERS = {
+    'vaccination': (
+        'vet_vaccination', ('INSERT', 'UPDATE', 'DELETE'),
+        "SELECT changed.pet_id FROM {rows} changed",
+        ('pet_id', 'is_expired'),
+    ),
+    'boarding_stay': (
+        'vet_boarding_stay', ('INSERT', 'UPDATE', 'DELETE'),
+        "SELECT changed.pet_id FROM {rows} changed",
+        ('pet_id', 'state'),
+    ),
+}
+
+# Former triggers on tables of other modules, dropped with their function
+LEGACY_SUMMARY_TRIGGERS = ('partner', 'partner_type', 'encounter', 'encounter_patient')
+
+# Key of the pets whose summary is outdated in the cursor precommit data
+DIRTY_PETS_KEY = 'ths_medical_vet.medical_history_summary_dirty'
 
 
 class MedicalHistorySummary(models.Model):
+    """ Per-pet summary of encounters, vaccinations and boarding stays.
+
+    Rows are identified by their pet: ``browse(pet.id)`` reads the summary of
+    a pet. Vaccinations and boarding stays refresh the rows of the pets they
+    touch through database triggers, so that raw SQL updates like the
+    vaccination expiry cron are covered. Changes to pets, partner types and
+    encounters mark the rows of their pets outdated, and these rows are
+    refreshed before the summary is searched or read, and on commit.
+    """
     _name = 'vet.medical.history.summary'
     _description = 'Pet Medical History Summary'
-    _auto = False  # This is a database view
+    _log_access = False
 
-    pet_id = fields.Many2one('res.partner', string='Pet', readonly=True)
-    owner_id = fields.Many2one('res.partner', string='Owner', readonly=True)
+    pet_id = fields.Many2one('res.partner', string='Pet', readonly=True, index=True, ondelete='cascade')
+    owner_id = fields.Many2one('res.partner', string='Owner', readonly=True, index=True, ondelete='set null')
     encounter_count = fields.Integer(string='Total Encounters', readonly=True)
     last_visit_date = fields.Datetime(string='Last Visit', readonly=True)
     vaccination_count = fields.Integer(string='Vaccinations', readonly=True)
     expired_vaccinations = fields.Integer(string='Expired Vaccinations', readonly=True)
     boarding_count = fields.Integer(string='Boarding Stays', readonly=True)
 
+    def _auto_init(self):
+        # the summary used to be a view, recomputed on each read
+        if table_kind(self.env.cr, self._table) == TableKind.View:
+            self.env.cr.execute(SQL("DROP VIEW %s", SQL.identifier(self._table)))
+        return super()._auto_init()
+
     def init(self):
         self.env.cr.execute("""
-            CREATE OR REPLACE VIEW vet_medical_history_summary AS (
+            CREATE OR REPLACE FUNCTION vet_medical_history_summary_refresh(pet_ids integer[]) RETURNS void AS $$
+            BEGIN
+                DELETE FROM vet_medical_history_summary summary
+                 WHERE summary.id = ANY(pet_ids)
+                   AND NOT EXISTS (
+                        SELECT 1
+                          FROM res_partner pet
+                          JOIN ths_partner_type tpt ON pet.ths_partner_type_id = tpt.id
+                         WHERE pet.id = summary.id AND tpt.name = 'Pet'
+                   );
+
+                INSERT INTO vet_medical_history_summary (
+                    id, pet_id, owner_id, encounter_count, last_visit_date,
+                    vaccination_count, expired_vaccinations, boarding_count
+                )
                 SELECT
-                    row_number() OVER () AS id,
-                    pet.id AS pet_id,
-                    pet.ths_pet_owner_id AS owner_id,
-                    COALESCE(enc.encounter_count, 0) AS encounter_count,
+                    pet.id,
+                    pet.id,
+                    pet.ths_pet_owner_id,
+                    COALESCE(enc.encounter_count, 0),
                     enc.last_visit_date,
-                    COALESCE(vac.vaccination_count, 0) AS vaccination_count,
-                    COALESCE(vac.expired_count, 0) AS expired_vaccinations,
-                    COALESCE(brd.boarding_count, 0) AS boarding_count
+                    COALESCE(vac.vaccination_count, 0),
+                    COALESCE(vac.expired_count, 0),
+                    COALESCE(brd.boarding_count, 0)
                 FROM res_partner pet
+                JOIN ths_partner_type tpt ON pet.ths_partner_type_id = tpt.id
                 LEFT JOIN (
                     SELECT
                         rel.patient_id AS pet_id,
@@ -35,29 +90,145 @@ class MedicalHistorySummary(models.Model):
                         MAX(e.encounter_date) AS last_visit_date
                     FROM ths_medical_base_encounter e
                     JOIN ths_medical_encounter_patient_rel rel ON e.id = rel.encounter_id
-                    WHERE e.state != 'cancelled'
+                    WHERE e.state != 'cancelled' AND rel.patient_id = ANY(pet_ids)
                     GROUP BY rel.patient_id
                 ) enc ON enc.pet_id = pet.id
-
                 LEFT JOIN (
                     SELECT
                         pet_id,
                         COUNT(*) AS vaccination_count,
                         SUM(CASE WHEN is_expired THEN 1 ELSE 0 END) AS expired_count
                     FROM vet_vaccination
+                    WHERE pet_id = ANY(pet_ids)
                     GROUP BY pet_id
                 ) vac ON vac.pet_id = pet.id
-
                 LEFT JOIN (
                     SELECT
                         pet_id,
                         COUNT(*) AS boarding_count
                     FROM vet_boarding_stay
-                    WHERE state != 'cancelled'
+                    WHERE state != 'cancelled' AND pet_id = ANY(pet_ids)
                     GROUP BY pet_id
                 ) brd ON brd.pet_id = pet.id
+                WHERE pet.id = ANY(pet_ids) AND tpt.name = 'Pet'
+                ON CONFLICT (id) DO UPDATE SET
+                    owner_id = EXCLUDED.owner_id,
+                    encounter_count = EXCLUDED.encounter_count,
+                    last_visit_date = EXCLUDED.last_visit_date,
+                    vaccination_count = EXCLUDED.vaccination_count,
+                    expired_vaccinations = EXCLUDED.expired_vaccinations,
+                    boarding_count = EXCLUDED.boarding_count;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+
+        for name in LEGACY_SUMMARY_TRIGGERS:
+            self.env.cr.execute(f"DROP FUNCTION IF EXISTS vet_medical_history_summary_on_{name}() CASCADE")
+        for name, (table, operations, pets_query, columns) in SUMMARY_TRIGGERS.items():
+            self._init_summary_trigger(name, table, operations, pets_query, columns)
+
+        # full rebuild on install and update, kept in sync afterwards
+        self.env.cr.execute("""
+            TRUNCATE vet_medical_history_summary;
+            SELECT vet_medical_history_summary_refresh(ARRAY(SELECT id FROM res_partner));
+        """)
+
+    @api.model
+    def _mark_pets_dirty(self, pet_ids):
+        """ Queue the refresh of the summary of the given pets until it is
+        searched or read, or until commit, see :meth:`_refresh_dirty_pets`. """
+        pet_ids = set(pet_ids)
+        if not pet_ids:
+            return
+        data = self.env.cr.precommit.data
+        if DIRTY_PETS_KEY not in data:
+            data[DIRTY_PETS_KEY] = set()
+            self.env.cr.precommit.add(self.sudo()._refresh_dirty_pets)
+        data[DIRTY_PETS_KEY].update(pet_ids)
+        self.browse(pet_ids).invalidate_recordset()
+
+    @api.model
+    def _refresh_dirty_pets(self):
+        """ Refresh the summary of the pets queued by :meth:`_mark_pets_dirty`. """
+        if not self.env.cr.precommit.data.get(DIRTY_PETS_KEY):
+            return
+        # the refresh reads these from the database, flushing may mark more pets
+        self.env['res.partner'].flush_model(['ths_pet_owner_id', 'ths_partner_type_id'])
+        self.env['ths.partner.type'].flush_model(['name'])
+        self.env['ths.medical.base.encounter'].flush_model(['encounter_date', 'state', 'patient_ids'])
+        dirty_pets = self.env.cr.precommit.data[DIRTY_PETS_KEY]
+        pet_ids = list(dirty_pets)
+        dirty_pets.clear()
+        self.env.cr.execute(SQL("SELECT vet_medical_history_summary_refresh(%s::integer[])", pet_ids))
+        self.browse(pet_ids).invalidate_recordset()
+
+    def _search(self, domain, offset=0, limit=None, order=None):
+        self._refresh_dirty_pets()
+        return super()._search(domain, offset=offset, limit=limit, order=order)
+
+    def _read_group(self, domain, groupby=(), aggregates=(), having=(), offset=0, limit=None, order=None):
+        self._refresh_dirty_pets()
+        return super()._read_group(domain, groupby, aggregates, having=having, offset=offset, limit=limit, order=order)
+
+    def fetch(self, field_names=None):
+        self._refresh_dirty_pets()
+        return super().fetch(field_names)
+
+    def _init_summary_trigger(self, name, table, operations, pets_query, columns):
+        """ Refresh the summary of the pets touched by each statement on ``table``.
 
-                LEFT JOIN ths_partner_type tpt ON pet.ths_partner_type_id = tpt.id
-                WHERE tpt.name = 'Pet'
+        The triggers run once per statement and read the changed rows from
+        transition tables, so that batch writes refresh each pet once.
+        """
+        if columns:
+            # NEW and OLD are trigger variables in plpgsql, they can't alias the rows
+            changed = (
+                "(SELECT {side}_row.* FROM new_rows new_row JOIN old_rows old_row ON old_row.id = new_row.id"
+                " WHERE ({old}) IS DISTINCT FROM ({new}))"
             )
+            old_columns = ", ".join(f"old_row.{column}" for column in columns)
+            new_columns = ", ".join(f"new_row.{column}" for column in columns)
+            updated_rows = {
+                side: changed.format(side=side, old=old_columns, new=new_columns)
+                for side in ('old', 'new')
+            }
+        else:
+            updated_rows = {'old': 'old_rows', 'new': 'new_rows'}
+        pets = {
+            'INSERT': pets_query.format(rows='new_rows'),
+            'DELETE': pets_query.format(rows='old_rows'),
+            'UPDATE': "%s UNION %s" % (
+                pets_query.format(rows=updated_rows['new']),
+                pets_query.format(rows=updated_rows['old']),
+            ),
+        }
+        function = f"vet_medical_history_summary_on_{name}"
+        self.env.cr.execute(f"""
+            CREATE OR REPLACE FUNCTION {function}() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'INSERT' THEN
+                    PERFORM vet_medical_history_summary_refresh(ARRAY({pets['INSERT']}));
+                ELSIF TG_OP = 'DELETE' THEN
+                    PERFORM vet_medical_history_summary_refresh(ARRAY({pets['DELETE']}));
+                ELSE
+                    PERFORM vet_medical_history_summary_refresh(ARRAY({pets['UPDATE']}));
+                END IF;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
         """)
+        for operation in operations:
+            # transition tables can't be shared by several events of a trigger
+            transitions = {
+                'INSERT': "NEW TABLE AS new_rows",
+                'UPDATE': "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+                'DELETE': "OLD TABLE AS old_rows",
+            }[operation]
+            trigger = f"vet_medical_history_summary_{operation.lower()}"
+            self.env.cr.execute(f"""
+                DROP TRIGGER IF EXISTS {trigger} ON {table};
+                CREATE TRIGGER {trigger}
+                    AFTER {operation} ON {table}
+                    REFERENCING {transitions}
+                    FOR EACH STATEMENT EXECUTE FUNCTION {function}()
+            """)
@@ -106,14 +106,14 @@ class ParkCheckin(models.Model):
 
 	@api.depends('partner_id', 'patient_ids')
 	def _compute_membership_valid(self):
-		"""Check if pets have valid membership using new membership model"""
+		"""Check if pets have valid membership using new membership model, all check-ins at once"""
+		today = fields.Date.today()
+		valid_pet_dates = self.env['vet.pet.membership']._get_pets_membership_validity(
+			(pet_id, today) for pet_id in self.patient_ids._origin.ids
+		)
+		valid_pet_ids = {pet_id for pet_id, _date in valid_pet_dates}
 		for record in self:
-			if record.patient_ids:
-				record.membership_valid = self.env['vet.pet.membership'].check_pet_membership_validity(
-					record.patient_ids.ids
-				)
-			else:
-				record.membership_valid = False
+			record.membership_valid = any(pet_id in valid_pet_ids for pet_id in record.patient_ids._origin.ids)
 
 	# --- Constraints ---
 	@api.constrains('partner_id')
@@ -17,4 +17,12 @@ class ThsPartnerType(models.Model):
 		string="Pet Owner",
 		default=False,
 		help="Check if this partner type specifically represents Pet Owners."
-	)
\ No newline at end of file
+	)
+
+	def write(self, vals):
+		res = super().write(vals)
+		# Pets are summarized in the medical history by the name of their type
+		if 'name' in vals:
+			pets = self.env['res.partner'].with_context(active_test=False).search([('ths_partner_type_id', 'in', self.ids)])
+			self.env['vet.medical.history.summary']._mark_pets_dirty(pets.ids)
+		return res
\ No newline at end of file
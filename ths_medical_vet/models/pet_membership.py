@@ -2,6 +2,7 @@
 from dateutil.relativedelta import relativedelta
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
+from odoo.tools.sql import create_index
 
 
 class VetPetMembership(models.Model):
@@ -115,14 +116,122 @@ class VetPetMembership(models.Model):
 	def check_pet_membership_validity(self, pet_ids):
 		"""Helper method to check if pets have valid membership"""
 		today = fields.Date.today()
-		valid_memberships = self.search([
-			('patient_ids', 'in', pet_ids),
-			('state', '=', 'running'),
-			('is_paid', '=', True),
-			('valid_from', '<=', today),
-			('valid_to', '>=', today)
-		])
-		return len(valid_memberships) > 0
+		return bool(self._get_pets_membership_validity([(pet_id, today) for pet_id in pet_ids]))
+
+	@api.model
+	def _get_pets_membership_validity(self, pet_dates):
+		"""
+		Batch validity check, in a single query on the membership coverage index.
+		:param pet_dates: iterable of (pet id, date) pairs to check
+		:return: set of the (pet id, date) pairs covered by a running, paid membership
+		"""
+		pet_dates = list(pet_dates)
+		if not pet_dates:
+			return set()
+		# the coverage is maintained by the database from the flushed memberships
+		self.flush_model(['patient_ids', 'state', 'is_paid', 'valid_from', 'valid_to'])
+		pet_ids, dates = zip(*pet_dates)
+		self.env.cr.execute("""
+			SELECT DISTINCT asked.pet_id, asked.date
+			  FROM unnest(%s::integer[], %s::date[]) AS asked(pet_id, date)
+			  JOIN vet_pet_membership_coverage coverage
+			    ON coverage.pet_id = asked.pet_id
+			   AND coverage.valid_from <= asked.date
+			   AND coverage.valid_to >= asked.date
+		""", [list(pet_ids), list(dates)])
+		return set(self.env.cr.fetchall())
+
+
+class VetPetMembershipCoverage(models.Model):
+	"""
+	Valid membership coverage index: the date ranges during which each pet is covered by a running, paid membership.
+	Rows are maintained by database triggers on memberships and their pets, so that validity checks of many pets
+	and dates are a single indexed query, see VetPetMembership._get_pets_membership_validity().
+	"""
+	_name = 'vet.pet.membership.coverage'
+	_description = 'Pet Membership Coverage'
+	_log_access = False
+
+	pet_id = fields.Many2one('res.partner', string='Pet', required=True, readonly=True, ondelete='cascade')
+	membership_id = fields.Many2one(
+		'vet.pet.membership', string='Membership', required=True, readonly=True, index=True, ondelete='cascade')
+	valid_from = fields.Date(string='Valid From', required=True, readonly=True)
+	valid_to = fields.Date(string='Valid To', required=True, readonly=True)
+
+	def init(self):
+		create_index(self.env.cr, 'vet_pet_membership_coverage_pet_dates_index', self._table,
+		             ['pet_id', 'valid_from', 'valid_to'])
+		self.env.cr.execute("""
+			CREATE OR REPLACE FUNCTION vet_pet_membership_coverage_refresh(membership_ids integer[]) RETURNS void AS $$
+			BEGIN
+				DELETE FROM vet_pet_membership_coverage WHERE membership_id = ANY(membership_ids);
+				INSERT INTO vet_pet_membership_coverage (pet_id, membership_id, valid_from, valid_to)
+				SELECT rel.pet_id, membership.id, membership.valid_from, membership.valid_to
+				  FROM vet_pet_membership membership
+				  JOIN vet_membership_pet_rel rel ON rel.membership_id = membership.id
+				 WHERE membership.id = ANY(membership_ids)
+				   AND membership.state = 'running'
+				   AND membership.is_paid
+				   AND membership.valid_from IS NOT NULL
+				   AND membership.valid_to IS NOT NULL;
+			END
+			$$ LANGUAGE plpgsql;
+
+			CREATE OR REPLACE FUNCTION vet_pet_membership_coverage_on_membership() RETURNS trigger AS $$
+			BEGIN
+				IF TG_OP = 'INSERT' THEN
+					PERFORM vet_pet_membership_coverage_refresh(ARRAY(SELECT id FROM new_rows));
+				ELSE
+					PERFORM vet_pet_membership_coverage_refresh(ARRAY(
+						SELECT new_row.id
+						  FROM new_rows new_row
+						  JOIN old_rows old_row ON old_row.id = new_row.id
+						 WHERE (old_row.state, old_row.is_paid, old_row.valid_from, old_row.valid_to)
+						       IS DISTINCT FROM (new_row.state, new_row.is_paid, new_row.valid_from, new_row.valid_to)
+					));
+				END IF;
+				RETURN NULL;
+			END
+			$$ LANGUAGE plpgsql;
+
+			CREATE OR REPLACE FUNCTION vet_pet_membership_coverage_on_pet() RETURNS trigger AS $$
+			BEGIN
+				IF TG_OP = 'INSERT' THEN
+					PERFORM vet_pet_membership_coverage_refresh(ARRAY(SELECT DISTINCT membership_id FROM new_rows));
+				ELSE
+					PERFORM vet_pet_membership_coverage_refresh(ARRAY(SELECT DISTINCT membership_id FROM old_rows));
+				END IF;
+				RETURN NULL;
+			END
+			$$ LANGUAGE plpgsql;
+
+			DROP TRIGGER IF EXISTS vet_pet_membership_coverage_insert ON vet_pet_membership;
+			CREATE TRIGGER vet_pet_membership_coverage_insert
+				AFTER INSERT ON vet_pet_membership
+				REFERENCING NEW TABLE AS new_rows
+				FOR EACH STATEMENT EXECUTE FUNCTION vet_pet_membership_coverage_on_membership();
+			DROP TRIGGER IF EXISTS vet_pet_membership_coverage_update ON vet_pet_membership;
+			CREATE TRIGGER vet_pet_membership_coverage_update
+				AFTER UPDATE ON vet_pet_membership
+				REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+				FOR EACH STATEMENT EXECUTE FUNCTION vet_pet_membership_coverage_on_membership();
+
+			DROP TRIGGER IF EXISTS vet_pet_membership_coverage_insert ON vet_membership_pet_rel;
+			CREATE TRIGGER vet_pet_membership_coverage_insert
+				AFTER INSERT ON vet_membership_pet_rel
+				REFERENCING NEW TABLE AS new_rows
+				FOR EACH STATEMENT EXECUTE FUNCTION vet_pet_membership_coverage_on_pet();
+			DROP TRIGGER IF EXISTS vet_pet_membership_coverage_delete ON vet_membership_pet_rel;
+			CREATE TRIGGER vet_pet_membership_coverage_delete
+				AFTER DELETE ON vet_membership_pet_rel
+				REFERENCING OLD TABLE AS old_rows
+				FOR EACH STATEMENT EXECUTE FUNCTION vet_pet_membership_coverage_on_pet();
+
+			-- full rebuild on install and update, triggers keep it in sync afterwards
+			TRUNCATE vet_pet_membership_coverage;
+			SELECT vet_pet_membership_coverage_refresh(ARRAY(SELECT id FROM vet_pet_membership));
+		""")
+
 
 # TODO: Add automatic expiration cron job
 # TODO: Add membership renewal functionality
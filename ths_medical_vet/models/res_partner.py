@@ -229,39 +229,46 @@ class ResPartner(models.Model):
 				pet.ths_owner_mobile = False
 				pet.ths_owner_phone = False
 
+	def _get_grouped_counts(self, model_name, group_field, ids, domain=None):
+		"""
+		Count the records of model_name per value of group_field among ids, in a single _read_group for the batch.
+		:return: dict {id: count}, ids without record counting 0
+		"""
+		counts = dict.fromkeys(ids, 0)
+		if counts:
+			groups = self.env[model_name]._read_group(
+				(domain or []) + [(group_field, 'in', list(counts))], [group_field], ['__count'])
+			for record, count in groups:
+				if record.id in counts:
+					counts[record.id] = count
+		return counts
+
 	@api.depends('ths_pet_ids')
 	def _compute_ths_pet_count(self):
 		"""Count active pets for each owner"""
+		owners = self.filtered('is_pet_owner')
+		counts = self._get_grouped_counts('res.partner', 'ths_pet_owner_id', owners._origin.ids, [('active', '=', True)])
 		for partner in self:
-			if partner.is_pet_owner:
-				partner.ths_pet_count = len(partner.ths_pet_ids.filtered('active'))
-			else:
-				partner.ths_pet_count = 0
+			partner.ths_pet_count = counts.get(partner._origin.id, 0) if partner.is_pet_owner else 0
 
 	@api.depends('is_pet')
 	def _compute_pet_membership_count(self):
+		pets = self.filtered('is_pet')
+		counts = self._get_grouped_counts('vet.pet.membership', 'partner_id', pets.parent_id.ids)
 		for partner in self:
-			if partner.is_pet:
-				partner.pet_membership_count = self.env['vet.pet.membership'].search_count([
-					('partner_id', '=', partner.parent_id.id),
-				])
-			else:
-				partner.pet_membership_count = 0
+			partner.pet_membership_count = counts.get(partner.parent_id.id, 0) if partner.is_pet else 0
 
 	@api.depends('is_pet','is_pet_owner')
 	def _compute_appointment_count(self):
+		pets = self.filtered('is_pet')
+		owners = self.filtered('is_pet_owner')
+		pet_counts = self._get_grouped_counts('calendar.event', 'ths_patient_ids', pets._origin.ids)
+		owner_counts = self._get_grouped_counts('calendar.event', 'ths_pet_owner_id', owners._origin.ids)
 		for rec in self:
-			appointment_domain = []
-
 			if rec.is_pet:
-				appointment_domain = [('ths_patient_ids', 'in', rec.id)]
+				rec.appointment_count = pet_counts.get(rec._origin.id, 0)
 			elif rec.is_pet_owner:
-				appointment_domain = [('ths_pet_owner_id', '=', rec.id)]
-			else:
-				pass
-
-			if appointment_domain:
-				rec.appointment_count = self.env['calendar.event'].search_count(appointment_domain)
+				rec.appointment_count = owner_counts.get(rec._origin.id, 0)
 			else:
 				rec.appointment_count = 0
 
@@ -404,7 +411,10 @@ class ResPartner(models.Model):
 			elif 'ths_deceased' in vals and not vals['ths_deceased']:
 				vals['ths_deceased_date'] = False
 
-		return super().create(vals_list)
+		partners = super().create(vals_list)
+		self.env['vet.medical.history.summary']._mark_pets_dirty(
+			partners.filtered(lambda p: p.ths_partner_type_id.name == 'Pet').ids)
+		return partners
 
 	def write(self, vals):
 		pet_type = self.env.ref('ths_medical_vet.partner_type_pet', raise_if_not_found=False)
@@ -436,6 +446,9 @@ class ResPartner(models.Model):
 		# Recompute display name if any of the key pet-related fields changed
 		if {'name', 'ths_pet_owner_id', 'ths_partner_type_id'} & set(vals.keys()):
 			self.invalidate_recordset(['display_name'])
+		# Owner and partner type are summarized in the medical history
+		if {'ths_pet_owner_id', 'ths_partner_type_id'} & set(vals.keys()):
+			self.env['vet.medical.history.summary']._mark_pets_dirty(self.ids)
 
 		return res
 
@@ -1,12 +1,18 @@
 # -*- coding: utf-8 -*-
 
+from markupsafe import Markup
+
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+from odoo.tools import format_date, groupby
 from dateutil.relativedelta import relativedelta
 import logging
 
 _logger = logging.getLogger(__name__)
 
+# Days before expiry from which a vaccination is "expiring soon" and its owner gets a renewal reminder
+EXPIRY_REMINDER_DAYS = 30
+
 
 class VetVaccination(models.Model):
 	_name = 'vet.vaccination'
@@ -49,6 +55,7 @@ class VetVaccination(models.Model):
 		compute='_compute_expiry_date',
 		store=True,
 		readonly=False,
+		index=True,
 		tracking=True,
 	)
 	batch_number = fields.Char(
@@ -89,6 +96,14 @@ class VetVaccination(models.Model):
 		store=True,
 		compute='_compute_days_until_expiry',
 	)
+	reminder_sent_date = fields.Date(
+		string='Renewal Reminder Sent',
+		compute='_compute_reminder_sent_date',
+		store=True,
+		readonly=False,
+		copy=False,
+		help="Date the owner was reminded about this vaccination's renewal",
+	)
 
 	company_id = fields.Many2one(
 		'res.company',
@@ -123,6 +138,12 @@ class VetVaccination(models.Model):
 			else:
 				record.days_until_expiry = 0
 
+	@api.depends('expiry_date')
+	def _compute_reminder_sent_date(self):
+		"""A new expiry date needs a new renewal reminder, however it changed: written, re-dated
+		or after a new vaccine type validity"""
+		self.reminder_sent_date = False
+
 	@api.constrains('date', 'expiry_date')
 	def _check_dates(self):
 		"""Ensure expiry date is after vaccination date"""
@@ -130,6 +151,77 @@ class VetVaccination(models.Model):
 			if record.date and record.expiry_date and record.expiry_date <= record.date:
 				raise ValidationError(_("Expiry date must be after vaccination date."))
 
+	@api.model
+	def _cron_refresh_expiry_status(self):
+		"""
+		Daily incremental refresh of is_expired/days_until_expiry, which are computed against today.
+		Only rows whose expiry date falls between the previous run and the reminder horizon are touched,
+		through the expiry_date index: farther rows keep a stale day count that stays on the same side
+		of the expired and expiring-soon thresholds until they enter the window.
+		"""
+		ICP = self.env['ir.config_parameter'].sudo()
+		today = fields.Date.context_today(self)
+		last_refresh = fields.Date.to_date(ICP.get_param('ths_medical_vet.vaccination_expiry_refresh_date'))
+
+		self.flush_model(['expiry_date', 'is_expired', 'days_until_expiry'])
+		query = """
+			UPDATE vet_vaccination
+			   SET is_expired = expiry_date < %(today)s,
+			       days_until_expiry = expiry_date - %(today)s
+			 WHERE expiry_date IS NOT NULL
+			   AND (is_expired IS DISTINCT FROM (expiry_date < %(today)s)
+			        OR days_until_expiry IS DISTINCT FROM (expiry_date - %(today)s))
+		"""
+		if last_refresh:
+			# First run refreshes everything, later runs only the window that moved since
+			query += " AND expiry_date >= %(since)s AND expiry_date <= %(horizon)s"
+		self.env.cr.execute(query + " RETURNING id", {
+			'today': today,
+			'since': min(last_refresh, today) if last_refresh else today,
+			'horizon': today + relativedelta(days=EXPIRY_REMINDER_DAYS),
+		})
+		refreshed_ids = [row[0] for row in self.env.cr.fetchall()]
+		self.invalidate_model(['is_expired', 'days_until_expiry'])
+
+		ICP.set_param('ths_medical_vet.vaccination_expiry_refresh_date', fields.Date.to_string(today))
+		_logger.info("Vaccination expiry refresh: %s rows updated", len(refreshed_ids))
+		return refreshed_ids
+
+	@api.model
+	def _cron_send_renewal_reminders(self):
+		"""  Remind owners of vaccinations expiring within the reminder horizon, one message per owner  """
+		today = fields.Date.context_today(self)
+		due_vaccinations = self.search([
+			('expiry_date', '>=', today),
+			('expiry_date', '<=', today + relativedelta(days=EXPIRY_REMINDER_DAYS)),
+			('reminder_sent_date', '=', False),
+			('owner_id', '!=', False),
+		], order='owner_id, expiry_date')
+
+		reminded_ids = []
+		for owner, vaccinations in groupby(due_vaccinations, key=lambda v: v.owner_id):
+			lines = Markup('').join(
+				Markup('<li>%s - %s: %s</li>') % (
+					vaccination.pet_id.name, vaccination.vaccine_type_id.name,
+					format_date(self.env, vaccination.expiry_date))
+				for vaccination in vaccinations
+			)
+			try:
+				owner.message_post(
+					body=Markup('<p>%s</p><ul>%s</ul>') % (
+						_('The following vaccinations are due for renewal. Please schedule an appointment.'), lines),
+					subject=_('Vaccination Renewal Reminder'),
+					partner_ids=owner.ids,
+					message_type='notification',
+				)
+				reminded_ids.extend(vaccination.id for vaccination in vaccinations)
+			except Exception as e:
+				_logger.error("Failed to send vaccination reminder to owner %s: %s", owner.id, e)
+
+		reminded = self.browse(reminded_ids)
+		reminded.write({'reminder_sent_date': today})
+		return reminded
+
 	@api.model_create_multi
 	def create(self, vals_list):
 		"""Override to link vaccinations to daily encounters"""
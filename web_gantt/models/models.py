@@ -6,7 +6,8 @@ from lxml.builder import E
 
 from odoo import api, fields, models
 from odoo.exceptions import UserError
-from odoo.tools import _, unique, OrderedSet
+from odoo.osv import expression
+from odoo.tools import _, unique, OrderedSet, SQL
 
 
 class Base(models.AbstractModel):
@@ -83,13 +84,20 @@ class Base(models.AbstractModel):
             }
         }
         """
-        # TODO: group_expand doesn't currently respect the limit/offset
-        lazy = not limit and not offset and len(groupby) == 1
-        # Because there is no limit by group, we can fetch record_ids as aggregate
-        final_result = self.web_read_group(
-            domain, ['__record_ids:array_agg(id)'], groupby,
-            limit=limit, offset=offset, lazy=lazy,
-        )
+        paginated = bool(limit or offset)
+        if paginated and len(groupby) == 1 and self._fields[groupby[0].split(':')[0]].group_expand:
+            # group_expand is only applied to lazy read_groups, and doesn't respect
+            # their limit/offset: count all rows, then only fetch the records of
+            # the rows in the requested window
+            lazy = True
+            final_result = self._gantt_read_group_window(domain, groupby, limit, offset)
+        else:
+            lazy = not paginated and len(groupby) == 1
+            # Because there is no limit by group, we can fetch record_ids as aggregate
+            final_result = self.web_read_group(
+                domain, ['__record_ids:array_agg(id)'], groupby,
+                limit=limit, offset=offset, lazy=lazy,
+            )
 
         all_record_ids = tuple(unique(
             record_id
@@ -140,6 +148,36 @@ class Base(models.AbstractModel):
 
         return final_result
 
+    @api.model
+    def _gantt_read_group_window(self, domain, groupby, limit=None, offset=0):
+        """ Lazy ``web_read_group`` on a single groupby, including the rows added
+        by its ``group_expand``, restricted to the rows between offset and
+        offset + limit. Only the records of those rows are aggregated, in their
+        ``__record_ids``.
+
+        :return: same as ``web_read_group``, 'length' being the total number of rows
+        """
+        result = self.web_read_group(domain, ['__count'], groupby, lazy=True)
+        groups = result['groups'][offset:offset + limit if limit else None]
+        result['groups'] = groups
+        if not groups:
+            return result
+
+        def group_key(value):
+            return tuple(value) if isinstance(value, list) else value
+
+        window_groups = self.web_read_group(
+            expression.AND([domain, expression.OR([group['__domain'] for group in groups])]),
+            ['__record_ids:array_agg(id)'], groupby, lazy=False,
+        )['groups']
+        record_ids_per_key = {
+            group_key(group[groupby[0]]): group['__record_ids']
+            for group in window_groups
+        }
+        for group in groups:
+            group['__record_ids'] = record_ids_per_key.get(group_key(group[groupby[0]]), [])
+        return result
+
     @api.model
     def web_gantt_reschedule(
         self,
@@ -210,8 +248,10 @@ class Base(models.AbstractModel):
                 ),
             }
 
+        graph = (master_record | slave_record)._web_gantt_get_dependency_graph(
+            [dependency_field_name, dependency_inverted_field_name], start_date_field_name, stop_date_field_name)
         with self.env.cr.savepoint() as sp:
-            log_messages, old_vals_per_pill_id = trigger_record._web_gantt_action_reschedule_candidates(dependency_field_name, dependency_inverted_field_name, start_date_field_name, stop_date_field_name, direction, related_record)
+            log_messages, old_vals_per_pill_id = trigger_record._web_gantt_action_reschedule_candidates(dependency_field_name, dependency_inverted_field_name, start_date_field_name, stop_date_field_name, direction, related_record, graph=graph)
             has_errors = bool(log_messages.get("errors"))
             sp.close(rollback=has_errors)
         notification_type = "success"
@@ -309,8 +349,11 @@ class Base(models.AbstractModel):
     def _web_gantt_get_candidates(self,
         dependency_field_name, dependency_inverted_field_name,
         start_date_field_name, stop_date_field_name,
-        related_record, move_forward_without_conflicts,
+        related_record, move_forward_without_conflicts, graph=None,
     ):
+        if graph is None:
+            graph = (self | related_record)._web_gantt_get_dependency_graph(
+                [dependency_field_name, dependency_inverted_field_name], start_date_field_name, stop_date_field_name)
         result = {
             'warnings': [],
             'errors': [],
@@ -323,12 +366,12 @@ class Base(models.AbstractModel):
         if move_forward_without_conflicts:
             candidates_to_exclude = {related_record.id}
         else:
-            candidates_to_exclude = {self.id} | set(related_record[dependency_inverted_field_name].ids)
+            candidates_to_exclude = {self.id} | set(graph[dependency_inverted_field_name].get(related_record.id, ()))
 
         if self._web_gantt_check_cycle_existance_and_get_rescheduling_candidates(
             self_children_ids, dependency_inverted_field_name,
             start_date_field_name, stop_date_field_name,
-            candidates_to_exclude,
+            candidates_to_exclude, graph=graph,
         ):
             result['errors'].append(self._WEB_GANTT_LOOP_ERROR)
             return (result, pills_to_plan_before, pills_to_plan_after, [])
@@ -337,14 +380,14 @@ class Base(models.AbstractModel):
         related_record_ancestors_ids = []
 
         if move_forward_without_conflicts:
-            candidates_to_exclude = {related_record.id} | set(self[dependency_field_name].ids)
+            candidates_to_exclude = {related_record.id} | set(graph[dependency_field_name].get(self.id, ()))
         else:
             candidates_to_exclude = {self.id}
 
         if related_record._web_gantt_check_cycle_existance_and_get_rescheduling_candidates(
             related_record_ancestors_ids, dependency_field_name,
             start_date_field_name, stop_date_field_name,
-            candidates_to_exclude,
+            candidates_to_exclude, graph=graph,
         ):
             result['errors'].append(self._WEB_GANTT_LOOP_ERROR)
             return (result, pills_to_plan_before, pills_to_plan_after, [])
@@ -398,7 +441,7 @@ class Base(models.AbstractModel):
         self,
         dependency_field_name, dependency_inverted_field_name,
         start_date_field_name, stop_date_field_name,
-        direction, related_record,
+        direction, related_record, graph=None,
     ):
         """ Prepare the candidates according to the provided parameters and move them.
 
@@ -409,16 +452,20 @@ class Base(models.AbstractModel):
             :param stop_date_field_name: The stop date field used in the gantt view.
             :param direction: The direction of the rescheduling 'forward' or 'backward'
             :param related_record: The record that self will be moving to
+            :param graph: dependencies of both records, see ``_web_gantt_get_dependency_graph``
             :return: tuple(valid, message) (valid = True if Successful, message = None or contains the notification text if
                     text if valid = True or the error text if valid = False.
         """
+        if graph is None:
+            graph = (self | related_record)._web_gantt_get_dependency_graph(
+                [dependency_field_name, dependency_inverted_field_name], start_date_field_name, stop_date_field_name)
         search_forward = direction == self._WEB_GANTT_RESCHEDULE_FORWARD
         # moving forward without conflicts
-        if search_forward and self[stop_date_field_name] <= related_record[start_date_field_name] and related_record in self[dependency_inverted_field_name]:
+        if search_forward and self[stop_date_field_name] <= related_record[start_date_field_name] and related_record.id in graph[dependency_inverted_field_name].get(self.id, ()):
             log_messages, pills_to_plan_before_related_record, pills_to_plan_after_related_record, all_candidates_ids = self._web_gantt_get_candidates(
                 dependency_field_name, dependency_inverted_field_name,
                 start_date_field_name, stop_date_field_name,
-                related_record, True,
+                related_record, True, graph=graph,
             )
 
             if log_messages.get("errors") or not pills_to_plan_before_related_record:
@@ -431,7 +478,7 @@ class Base(models.AbstractModel):
                 dependency_field_name, dependency_inverted_field_name,
                 False, pills_to_plan_before_related_record,
                 related_record[start_date_field_name],
-                all_candidates_ids, True,
+                all_candidates_ids, True, graph=graph,
             )
 
             if log_messages.get("errors") or not pills_to_plan_after_related_record:
@@ -442,7 +489,7 @@ class Base(models.AbstractModel):
                 start_date_field_name, stop_date_field_name,
                 dependency_field_name, dependency_inverted_field_name,
                 True, pills_to_plan_after_related_record,
-                self[stop_date_field_name]
+                self[stop_date_field_name], graph=graph,
             )
 
             log_messages.setdefault("errors", []).extend(new_log_messages.get("errors", []))
@@ -450,11 +497,11 @@ class Base(models.AbstractModel):
 
             return log_messages, old_vals_per_pill_id | second_old_vals_per_pill_id
         # moving backward without conflicts
-        elif related_record[stop_date_field_name] <= self[start_date_field_name] and related_record in self[dependency_field_name]:
+        elif related_record[stop_date_field_name] <= self[start_date_field_name] and related_record.id in graph[dependency_field_name].get(self.id, ()):
             log_messages, pills_to_plan_before_related_record, pills_to_plan_after_related_record, all_candidates_ids = related_record._web_gantt_get_candidates(
                 dependency_field_name, dependency_inverted_field_name,
                 start_date_field_name, stop_date_field_name,
-                self, False,
+                self, False, graph=graph,
             )
 
             if log_messages.get("errors") or not pills_to_plan_after_related_record:
@@ -466,7 +513,7 @@ class Base(models.AbstractModel):
                 dependency_field_name, dependency_inverted_field_name,
                 True, pills_to_plan_after_related_record,
                 related_record[stop_date_field_name],
-                all_candidates_ids, True,
+                all_candidates_ids, True, graph=graph,
             )
 
             if log_messages.get("errors") or not pills_to_plan_before_related_record:
@@ -478,7 +525,7 @@ class Base(models.AbstractModel):
                 start_date_field_name, stop_date_field_name,
                 dependency_field_name, dependency_inverted_field_name,
                 False, pills_to_plan_before_related_record,
-                self[start_date_field_name]
+                self[start_date_field_name], graph=graph,
             )
 
             log_messages.setdefault("errors", []).extend(new_log_messages.get("errors", []))
@@ -492,8 +539,8 @@ class Base(models.AbstractModel):
             if self._web_gantt_check_cycle_existance_and_get_rescheduling_candidates(
                 candidates_ids, dependency,
                 start_date_field_name, stop_date_field_name,
+                graph=graph,
             ):
-                log_messages['errors'].append(self._WEB_GANTT_LOOP_ERROR)
                 return {
                     "errors": [self._WEB_GANTT_LOOP_ERROR],
                 }, {}
@@ -507,18 +554,29 @@ class Base(models.AbstractModel):
                 start_date_field_name, stop_date_field_name,
                 dependency_field_name, dependency_inverted_field_name,
                 search_forward, candidates_ids,
-                related_record[stop_date_field_name if search_forward else start_date_field_name]
+                related_record[stop_date_field_name if search_forward else start_date_field_name],
+                graph=graph,
             )
 
-    def _web_gantt_is_candidate_in_conflict(self, start_date_field_name, stop_date_field_name, dependency_field_name, dependency_inverted_field_name):
+    def _web_gantt_is_candidate_in_conflict(self, start_date_field_name, stop_date_field_name, dependency_field_name, dependency_inverted_field_name, graph=None):
+        if graph is not None:
+            dates = graph['dates']
+            start_date, stop_date = dates[self.id]
+            return (
+                any(dates[r_id][0] and dates[r_id][1] and start_date < dates[r_id][1] for r_id in graph[dependency_field_name].get(self.id, ()))
+                or any(dates[r_id][0] and dates[r_id][1] and stop_date > dates[r_id][0] for r_id in graph[dependency_inverted_field_name].get(self.id, ()))
+            )
         return (
             any(r[start_date_field_name] and r[stop_date_field_name] and self[start_date_field_name] < r[stop_date_field_name] for r in self[dependency_field_name])
             or any(r[start_date_field_name] and r[stop_date_field_name] and self[stop_date_field_name] > r[start_date_field_name] for r in self[dependency_inverted_field_name])
         )
 
-    def _web_gantt_move_candidates(self, start_date_field_name, stop_date_field_name, dependency_field_name, dependency_inverted_field_name, search_forward, candidates_ids, date_candidate=None, all_candidates_ids=None, move_not_in_conflicts_candidates=False):
+    def _web_gantt_move_candidates(self, start_date_field_name, stop_date_field_name, dependency_field_name, dependency_inverted_field_name, search_forward, candidates_ids, date_candidate=None, all_candidates_ids=None, move_not_in_conflicts_candidates=False, graph=None):
         """ Move candidates according to the provided parameters.
 
+            New dates are propagated from one candidate to the next in memory, then written
+            once all of them are known.
+
             :param start_date_field_name: The start date field used in the gantt view.
             :param stop_date_field_name: The stop date field used in the gantt view.
             :param dependency_field_name: The field name of the relation between the master and slave records.
@@ -530,6 +588,7 @@ class Base(models.AbstractModel):
             :param date_candidate: The first possible date for the rescheduling
             :param all_candidates_ids: moving without conflicts is done in 2 steps, candidates_ids contains the candidates
                    to schedule during the step, and all_candidates_ids contains the candidates to schedule in the 2 steps
+            :param graph: dependencies of the candidates, see ``_web_gantt_get_dependency_graph``
             :return: dict of list containing 2 keys, errors and warnings
         """
         result = {
@@ -538,9 +597,14 @@ class Base(models.AbstractModel):
         }
         old_vals_per_pill_id = {}
         candidates = self.browse(candidates_ids)
+        if graph is None:
+            graph = candidates._web_gantt_get_dependency_graph(
+                [dependency_field_name, dependency_inverted_field_name], start_date_field_name, stop_date_field_name)
+        dates = graph['dates']
 
+        new_dates_per_candidate = []
         for i, candidate in enumerate(candidates):
-            if not move_not_in_conflicts_candidates and not candidate._web_gantt_is_candidate_in_conflict(start_date_field_name, stop_date_field_name, dependency_field_name, dependency_inverted_field_name):
+            if not move_not_in_conflicts_candidates and not candidate._web_gantt_is_candidate_in_conflict(start_date_field_name, stop_date_field_name, dependency_field_name, dependency_inverted_field_name, graph=graph):
                 continue
 
             start_date, end_date = candidate._web_gantt_reschedule_compute_dates(
@@ -549,6 +613,25 @@ class Base(models.AbstractModel):
                 start_date_field_name, stop_date_field_name
             )
             start_date, end_date = start_date.astimezone(timezone.utc), end_date.astimezone(timezone.utc)
+            new_dates_per_candidate.append((candidate, start_date, end_date))
+            dates[candidate.id] = (start_date.replace(tzinfo=None), end_date.replace(tzinfo=None))
+
+            if i + 1 < len(candidates):
+                next_candidate = candidates[i + 1]
+                if search_forward:
+                    ancestors_ids = graph[dependency_field_name].get(next_candidate.id)
+                    if ancestors_ids:
+                        date_candidate = max(dates[ancestor_id][1] for ancestor_id in ancestors_ids)
+                    else:
+                        date_candidate = end_date
+                else:
+                    children_ids = graph[dependency_inverted_field_name].get(next_candidate.id)
+                    if children_ids:
+                        date_candidate = min(dates[child_id][0] for child_id in children_ids)
+                    else:
+                        date_candidate = start_date
+
+        for candidate, start_date, end_date in new_dates_per_candidate:
             old_start_date, old_end_date = candidate[start_date_field_name], candidate[stop_date_field_name]
             if not candidate._web_gantt_reschedule_write_new_dates(
                 start_date, end_date,
@@ -563,27 +646,12 @@ class Base(models.AbstractModel):
                     stop_date_field_name: old_end_date,
                 }
 
-            if i + 1 < len(candidates):
-                next_candidate = candidates[i + 1]
-                if search_forward:
-                    ancestors = next_candidate[dependency_field_name]
-                    if ancestors:
-                        date_candidate = max(ancestors.mapped(stop_date_field_name))
-                    else:
-                        date_candidate = end_date
-                else:
-                    children = next_candidate[dependency_inverted_field_name]
-                    if children:
-                        date_candidate = min(children.mapped(start_date_field_name))
-                    else:
-                        date_candidate = start_date
-
         return result, old_vals_per_pill_id
 
     def _web_gantt_check_cycle_existance_and_get_rescheduling_candidates(self,
         candidates_ids, dependency_field_name,
         start_date_field_name, stop_date_field_name,
-        candidates_to_exclude=None, visited=None, ancestors=None,
+        candidates_to_exclude=None, visited=None, ancestors=None, graph=None,
     ):
         """ Get the current records' related records rescheduling candidates (explained in details
             in case 1 and case 2 in the below example)
@@ -637,29 +705,127 @@ class Base(models.AbstractModel):
             :param candidates_to_exclude: candidates to exclude
             :param visited: set containing all the visited pills
             :param ancestors: set containing the visited ancestors for the current pill
+            :param graph: dependencies of self, see ``_web_gantt_get_dependency_graph``
             :return: bool, True if there is a cycle, else False.
                 candidates_id will also contain the pills to plan in a valid topological order
         """
-        if candidates_to_exclude is None:
-            candidates_to_exclude = []
+        if graph is None:
+            graph = self._web_gantt_get_dependency_graph([dependency_field_name], start_date_field_name, stop_date_field_name)
+        candidates_to_exclude = set(candidates_to_exclude or ())
         if visited is None:
             visited = set()
-        if ancestors is None:
-            ancestors = []
+        ancestors = set(ancestors or ())
+        dependencies = graph[dependency_field_name]
+
+        # iterative depth first search, each pill being visited once
+        reversed_candidates_ids = []
         visited.add(self.id)
-        ancestors.append(self.id)
-        for child in self[dependency_field_name]:
-            if child.id in ancestors:
-                return True
+        ancestors.add(self.id)
+        stack = [(self.id, iter(dependencies.get(self.id, ())))]
+        while stack:
+            pill_id, children_ids = stack[-1]
+            for child_id in children_ids:
+                if child_id in ancestors:
+                    return True
+                if child_id not in visited and child_id not in candidates_to_exclude:
+                    visited.add(child_id)
+                    ancestors.add(child_id)
+                    stack.append((child_id, iter(dependencies.get(child_id, ()))))
+                    break
+            else:
+                stack.pop()
+                ancestors.discard(pill_id)
+                pill = self.browse(pill_id).with_prefetch(graph['ids'])
+                if pill._web_gantt_reschedule_is_record_candidate(start_date_field_name, stop_date_field_name) and pill_id not in candidates_to_exclude:
+                    reversed_candidates_ids.append(pill_id)
 
-            if child.id not in visited and child.id not in candidates_to_exclude and child._web_gantt_check_cycle_existance_and_get_rescheduling_candidates(candidates_ids, dependency_field_name, start_date_field_name, stop_date_field_name, candidates_to_exclude, visited, ancestors):
-                return True
+        candidates_ids[:0] = reversed(reversed_candidates_ids)
+        return False
 
-        ancestors.pop()
-        if self._web_gantt_reschedule_is_record_candidate(start_date_field_name, stop_date_field_name) and self.id not in candidates_to_exclude:
-            candidates_ids.insert(0, self.id)
+    def _web_gantt_get_dependency_graph(self, dependency_field_names, start_date_field_name, stop_date_field_name):
+        """ Load in memory the dependencies of self, and of the records they depend on
+            in any direction, with the current dates of all those records.
 
-        return False
+            Dependencies stored in a many2many relation are fetched at once; others are
+            read level by level.
+
+            :param dependency_field_names: names of the fields relating records to the ones they depend on
+                   and/or to the ones depending on them.
+            :param start_date_field_name: The start date field used in the gantt view.
+            :param stop_date_field_name: The stop date field used in the gantt view.
+            :return: dict = {
+                'ids': ids of all the records of the graph,
+                dependency_field_name: {record id: ids of the records in that field, in their order},
+                'dates': {record id: (start date, stop date)},
+            }
+        """
+        graph = {field_name: {} for field_name in dependency_field_names}
+        dependency_fields = [self._fields[field_name] for field_name in dependency_field_names]
+        relation_field = dependency_fields[0]
+        if all(
+            field.type == 'many2many' and field.store and field.comodel_name == self._name
+            and field.relation == relation_field.relation
+            for field in dependency_fields
+        ):
+            self.flush_model(dependency_field_names)
+            self.env.cr.execute(SQL(
+                """
+                WITH RECURSIVE component(id) AS (
+                    SELECT unnest(%(ids)s::int[])
+                     UNION
+                    SELECT CASE WHEN rel.%(column1)s = component.id THEN rel.%(column2)s ELSE rel.%(column1)s END
+                      FROM %(relation)s rel
+                      JOIN component ON component.id IN (rel.%(column1)s, rel.%(column2)s)
+                )
+                SELECT rel.%(column1)s, rel.%(column2)s
+                  FROM %(relation)s rel
+                 WHERE rel.%(column1)s IN (SELECT id FROM component)
+                """,
+                ids=list(self.ids),
+                relation=SQL.identifier(relation_field.relation),
+                column1=SQL.identifier(relation_field.column1),
+                column2=SQL.identifier(relation_field.column2),
+            ))
+            edges = self.env.cr.fetchall()
+            all_ids = OrderedSet(self.ids)
+            for id1, id2 in edges:
+                all_ids.add(id1)
+                all_ids.add(id2)
+            graph_ids = OrderedSet(self.ids)
+            for field in dependency_fields:
+                # same records and order as when reading the field
+                visible_ids = self.with_context(**field.context).search(
+                    expression.AND([[('id', 'in', list(all_ids))], field.get_domain_list(self)])
+                ).ids
+                graph_ids.update(visible_ids)
+                rank = {record_id: index for index, record_id in enumerate(visible_ids)}
+                field_graph = defaultdict(list)
+                for id1, id2 in edges:
+                    record_id, value_id = (id1, id2) if field.column1 == relation_field.column1 else (id2, id1)
+                    if value_id in rank:
+                        field_graph[record_id].append(value_id)
+                for value_ids in field_graph.values():
+                    value_ids.sort(key=rank.get)
+                graph[field.name] = dict(field_graph)
+        else:
+            graph_ids = OrderedSet(self.ids)
+            records = self
+            while records:
+                new_ids = OrderedSet()
+                for record in records:
+                    for field_name in dependency_field_names:
+                        value_ids = record[field_name].ids
+                        graph[field_name][record.id] = value_ids
+                        new_ids.update(value_id for value_id in value_ids if value_id not in graph_ids)
+                graph_ids.update(new_ids)
+                records = self.browse(new_ids)
+
+        graph['ids'] = tuple(graph_ids)
+        graph['dates'] = {
+            record.id: (record[start_date_field_name], record[stop_date_field_name])
+            for record in self.browse(graph['ids'])
+        }
+        return graph
 
     def _web_gantt_reschedule_compute_dates(
         self, date_candidate, search_forward, start_date_field_name, stop_date_field_name
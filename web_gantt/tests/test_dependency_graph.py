@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo.tests.common import TransactionCase
+
+
+class TestDependencyGraph(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.addClassCleanup(cls.registry.reset_changes)
+        cls.addClassCleanup(cls.registry.clear_all_caches)
+        # many2many dependencies of partners, which can be archived
+        cls.env['ir.model.fields'].create({
+            'model_id': cls.env['ir.model']._get_id('res.partner'),
+            'name': 'x_depend_on_ids',
+            'field_description': 'Depend On',
+            'ttype': 'many2many',
+            'relation': 'res.partner',
+            'relation_table': 'x_res_partner_depend_on_rel',
+            'column1': 'x_partner_id',
+            'column2': 'x_depend_on_id',
+        })
+        cls.partner_1, cls.partner_2, cls.partner_3 = cls.env['res.partner'].create([
+            {'name': 'Pill 1'},
+            {'name': 'Pill 2'},
+            {'name': 'Pill 3'},
+        ])
+        cls.partner_1.x_depend_on_ids = cls.partner_2 | cls.partner_3
+        cls.partner_3.action_archive()
+
+    def test_archived_dependency(self):
+        """ Archived dependencies are left out of the graph, as when reading the field. """
+        graph = self.partner_1._web_gantt_get_dependency_graph(['x_depend_on_ids'], 'date', 'date')
+        self.assertEqual(graph['x_depend_on_ids'][self.partner_1.id], self.partner_1.x_depend_on_ids.ids)
+        self.assertEqual(graph['x_depend_on_ids'][self.partner_1.id], self.partner_2.ids)
+        self.assertNotIn(self.partner_3.id, graph['ids'])
+
+        graph = self.partner_1.with_context(active_test=False)._web_gantt_get_dependency_graph(['x_depend_on_ids'], 'date', 'date')
+        self.assertEqual(graph['x_depend_on_ids'][self.partner_1.id], (self.partner_2 | self.partner_3).ids)
+        self.assertIn(self.partner_3.id, graph['ids'])